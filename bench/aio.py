@@ -0,0 +1,81 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for compressing and decompressing many buffers from asyncio code,
+with the blocking blosc2.compress2() / decompress2() called inline, through
+loop.run_in_executor() and with blosc2.aio.  The time the event loop is kept
+busy (so it cannot serve anything else) is reported too.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import blosc2
+import blosc2.aio
+
+blosc2.print_versions()
+rng = np.random.default_rng(0)
+cparams = {"typesize": 8, "codec": blosc2.Codec.LZ4, "clevel": 5, "nthreads": 1}
+
+
+async def inline(bufs):
+    chunks = [blosc2.compress2(buf, **cparams) for buf in bufs]
+    return [blosc2.decompress2(chunk) for chunk in chunks]
+
+
+async def executor(bufs):
+    loop = asyncio.get_running_loop()
+    chunks = await asyncio.gather(*[
+        loop.run_in_executor(pool, lambda buf=buf: blosc2.compress2(buf, **cparams)) for buf in bufs
+    ])
+    return await asyncio.gather(*[loop.run_in_executor(pool, blosc2.decompress2, chunk) for chunk in chunks])
+
+
+async def aio(bufs):
+    chunks = await asyncio.gather(*[blosc2.aio.compress2(buf, **cparams) for buf in bufs])
+    return await asyncio.gather(*[blosc2.aio.decompress2(chunk) for chunk in chunks])
+
+
+async def timed(func, bufs):
+    # The longest time the event loop could not run a tick is measured by a ticker task
+    max_stall = 0
+    running = True
+
+    async def ticker():
+        nonlocal max_stall
+        t = time.perf_counter()
+        while running:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            max_stall = max(max_stall, now - t)
+            t = now
+
+    task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    await func(bufs)
+    t = time.perf_counter() - t0
+    running = False
+    await task
+    return t, max_stall
+
+
+pool = ThreadPoolExecutor(blosc2.nthreads)
+for nbufs, nitems in [(20 * 1000, 512), (100, 1000 * 1000)]:
+    bufs = [rng.normal(size=nitems).round(2) for _ in range(nbufs)]
+    nbytes = nbufs * nitems * 8
+    print("Compressing and decompressing %d buffers of %d KB:" % (nbufs, nitems * 8 // 2 ** 10))
+    for label, func in [("inline", inline), ("run_in_executor", executor), ("blosc2.aio", aio)]:
+        t, max_stall = asyncio.run(timed(func, bufs))
+        print("  %-16s %.3f s (%6.0f MB/s), event loop stalled up to %.4f s"
+              % (label, t, 2 * nbytes / t / 2 ** 20, max_stall))
+pool.shutdown()
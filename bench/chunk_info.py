@@ -0,0 +1,49 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for SChunk.chunk_info(), which reads the headers of all the chunks
+at once, without copying them.  It is compared with getting every chunk with
+SChunk.get_chunk() (which copies the compressed bytes) and parsing its header,
+for SChunks in memory and on disk.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+NCHUNKS = 10 * 1000
+N = 10 * 1000  # 80 KB chunks
+URLPATH = "chunk_info.b2frame"
+
+blosc2.print_versions()
+data = np.linspace(0, 1, N)
+for urlpath in (None, URLPATH):
+    blosc2.remove_urlpath(urlpath)
+    schunk = blosc2.SChunk(chunksize=N * 8, urlpath=urlpath, cparams={"typesize": 8, "clevel": 1})
+    for _ in range(NCHUNKS):
+        schunk.append_data(data)
+    print("%s SChunk with %d chunks:" % ("On-disk" if urlpath else "In-memory", schunk.nchunks))
+
+    t0 = time.time()
+    cbytes = []
+    for i in range(schunk.nchunks):
+        cbytes.append(np.frombuffer(schunk.get_chunk(i)[12:16], dtype="<i4")[0])
+    t_loop = time.time() - t0
+    print("  get_chunk() loop: %.4f s" % t_loop)
+
+    t0 = time.time()
+    info = schunk.chunk_info()
+    t_info = time.time() - t0
+    print("  chunk_info():     %.4f s (%.1fx faster)" % (t_info, t_loop / t_info))
+    assert info["cbytes"].tolist() == cbytes
+    print("  cratio: %.2f (nbytes: %d MB, cbytes: %d MB)"
+          % (schunk.cratio, schunk.nbytes // 2 ** 20, schunk.cbytes // 2 ** 20))
+    blosc2.remove_urlpath(urlpath)
@@ -0,0 +1,69 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for compressing and decompressing many small independent buffers
+with blosc2.compress_many() / decompress_many(), compared with calling
+blosc2.compress() / decompress() and blosc2.compress2() / decompress2() for
+every buffer.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+NBUFS = 100 * 1000
+NITEMS = 256  # 2 KB buffers
+
+blosc2.print_versions()
+rng = np.random.default_rng(0)
+data = rng.normal(size=NBUFS * NITEMS).round(2)
+bufs = [data[i * NITEMS:(i + 1) * NITEMS] for i in range(NBUFS)]
+offsets = np.arange(NBUFS + 1) * NITEMS * 8
+cparams = {"typesize": 8, "codec": blosc2.Codec.LZ4, "clevel": 5}
+print("Compressing and decompressing %d buffers of %d KB:" % (NBUFS, NITEMS * 8 // 2 ** 10))
+
+
+def report(label, tc, td):
+    print("  %-28s compression %.3f s (%5.0f MB/s), decompression %.3f s (%5.0f MB/s)"
+          % (label, tc, data.nbytes / tc / 2 ** 20, td, data.nbytes / td / 2 ** 20))
+
+
+t0 = time.time()
+chunks = [blosc2.compress(buf, typesize=8, clevel=5, codec=blosc2.Codec.LZ4) for buf in bufs]
+tc = time.time() - t0
+t0 = time.time()
+for chunk in chunks:
+    blosc2.decompress(chunk)
+report("compress/decompress", tc, time.time() - t0)
+
+t0 = time.time()
+chunks = [blosc2.compress2(buf, nthreads=1, **cparams) for buf in bufs]
+tc = time.time() - t0
+t0 = time.time()
+for chunk in chunks:
+    blosc2.decompress2(chunk)
+report("compress2/decompress2", tc, time.time() - t0)
+
+for nthreads in sorted({1, blosc2.nthreads}):
+    t0 = time.time()
+    chunks = blosc2.compress_many(bufs, nthreads=nthreads, **cparams)
+    tc = time.time() - t0
+    t0 = time.time()
+    blosc2.decompress_many(chunks, nthreads=nthreads)
+    report("*_many, %d threads" % nthreads, tc, time.time() - t0)
+
+    t0 = time.time()
+    packed, coffsets = blosc2.compress_many(data, offsets, packed=True, nthreads=nthreads, **cparams)
+    tc = time.time() - t0
+    t0 = time.time()
+    out, _ = blosc2.decompress_many(packed, coffsets, packed=True, nthreads=nthreads)
+    report("*_many packed, %d threads" % nthreads, tc, time.time() - t0)
+    assert out == data.tobytes()
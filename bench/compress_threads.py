@@ -0,0 +1,61 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Stress benchmark for calling blosc2.compress()/decompress() from many
+Python threads at the same time, each of them using a different codec.
+With the GIL released, the throughput should scale with the number of
+Python threads (up to the number of cores).
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import blosc2
+
+NREP = 3
+NBUFFERS = 256
+N = 256 * 1024 // 8  # 256 KB buffers
+
+blosc2.print_versions()
+# One internal thread per call, so that the scaling comes from Python threads
+blosc2.set_nthreads(1)
+blosc2.set_releasegil(True)
+
+codecs = [blosc2.Codec.BLOSCLZ, blosc2.Codec.LZ4, blosc2.Codec.ZSTD]
+buffers = [np.linspace(i, i + 1, N) for i in range(NBUFFERS)]
+nbytes = NBUFFERS * N * 8
+
+
+def roundtrip(i):
+    codec = codecs[i % len(codecs)]
+    c = blosc2.compress(buffers[i], clevel=5, codec=codec)
+    out = np.empty_like(buffers[i])
+    blosc2.decompress(c, dst=out)
+    assert np.array_equal(buffers[i], out)
+    return len(c)
+
+
+print("Compressing/decompressing %d buffers of %d KB each:" % (NBUFFERS, N * 8 // 1024))
+tref = None
+for nthreads in (1, 2, 4, 8, 16):
+    if nthreads > blosc2.ncores:
+        break
+    with ThreadPoolExecutor(max_workers=nthreads) as executor:
+        t0 = time.time()
+        for i in range(NREP):
+            list(executor.map(roundtrip, range(NBUFFERS)))
+        t = (time.time() - t0) / NREP
+    if tref is None:
+        tref = t
+    print(
+        "  %2d Python threads: %.3f s (%.2f GB/s)\tspeedup: %.2fx"
+        % (nthreads, t, (nbytes / t) / 2 ** 30, tref / t)
+    )
@@ -0,0 +1,52 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for SChunk.decompress_range(), which decompresses many chunks
+concurrently (one chunk per thread) into a single buffer.  It is compared
+with a Python loop calling SChunk.decompress_chunk() per chunk, which only
+uses the threads inside every chunk, for different chunk sizes.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+NBYTES = 2 ** 30  # 1 GB in total
+NREPS = 3
+
+blosc2.print_versions()
+nthreads = blosc2.ncores
+print("Decompressing %d MB with %d threads:" % (NBYTES // 2 ** 20, nthreads))
+data = np.linspace(0, 1, NBYTES // 8)
+out = np.empty_like(data)
+for chunksize in (2 ** 16, 2 ** 18, 2 ** 20, 2 ** 23):
+    cparams = {"codec": blosc2.Codec.LZ4, "typesize": 8, "nthreads": nthreads}
+    schunk = blosc2.SChunk(chunksize=chunksize, data=data, cparams=cparams, dparams={"nthreads": nthreads})
+    nchunks = NBYTES // chunksize
+    chunk_nitems = chunksize // 8
+
+    t0 = time.time()
+    for _ in range(NREPS):
+        for i in range(nchunks):
+            schunk.decompress_chunk(i, out[i * chunk_nitems:(i + 1) * chunk_nitems])
+    t_loop = (time.time() - t0) / NREPS
+    assert np.array_equal(out, data)
+
+    out[:] = 0
+    t0 = time.time()
+    for _ in range(NREPS):
+        schunk.decompress_range(0, nchunks, out)
+    t_range = (time.time() - t0) / NREPS
+    assert np.array_equal(out, data)
+
+    print("  chunksize %5d KB: loop %.3f s (%.2f GB/s), decompress_range %.3f s (%.2f GB/s), %.1fx"
+          % (chunksize // 2 ** 10, t_loop, NBYTES / t_loop / 2 ** 30,
+             t_range, NBYTES / t_range / 2 ** 30, t_loop / t_range))
@@ -0,0 +1,73 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for compressing many small buffers (JSON messages of a few KB)
+with ZSTD dictionaries trained with blosc2.train_dict().  Every codec and
+clevel is compared with and without a dictionary, in compression ratio and in
+compression and decompression speed.
+"""
+
+import json
+import random
+import time
+
+import blosc2
+
+NMSGS = 10 * 1000
+DICT_SIZE = 2 ** 16
+
+rng = random.Random(0)
+
+
+def message(i):
+    nitems = rng.randint(20, 150)
+    return json.dumps({
+        "request_id": i,
+        "method": rng.choice(["GetUser", "PutItem", "DeleteItem", "ListOrders"]),
+        "user": {"name": "user%d" % rng.randint(0, 1000), "country": rng.choice(["ES", "FR", "DE", "US"])},
+        "items": [{"sku": "SKU-%05d" % rng.randint(0, 99999), "quantity": rng.randint(1, 9),
+                   "price": round(rng.uniform(1, 100), 2)} for _ in range(nitems)],
+    }).encode()
+
+
+blosc2.print_versions()
+train = [message(i) for i in range(NMSGS)]
+msgs = [message(i) for i in range(NMSGS)]
+nbytes = sum(len(msg) for msg in msgs)
+t0 = time.time()
+dict_ = blosc2.train_dict(train, DICT_SIZE)
+print("Dictionary of %d KB trained in %.3f s" % (len(dict_) // 2 ** 10, time.time() - t0))
+print("Compressing %d messages of %d bytes on average:" % (NMSGS, nbytes // NMSGS))
+
+for codec, clevel, use_dict in [
+    (blosc2.Codec.LZ4, 5, False),
+    (blosc2.Codec.ZSTD, 1, False),
+    (blosc2.Codec.ZSTD, 1, True),
+    (blosc2.Codec.ZSTD, 5, False),
+    (blosc2.Codec.ZSTD, 5, True),
+    (blosc2.Codec.ZSTD, 9, False),
+    (blosc2.Codec.ZSTD, 9, True),
+]:
+    cparams = {"codec": codec, "clevel": clevel, "typesize": 1}
+    if use_dict:
+        cparams["dict"] = dict_
+    cctx = blosc2.CompressionContext(**cparams)
+    dctx = blosc2.DecompressionContext(dict=dict_ if use_dict else None)
+
+    t0 = time.time()
+    chunks = [cctx.compress(msg) for msg in msgs]
+    tc = time.time() - t0
+    t0 = time.time()
+    for chunk in chunks:
+        dctx.decompress(chunk)
+    td = time.time() - t0
+    cbytes = sum(len(chunk) for chunk in chunks)
+    label = "%s, clevel %d%s:" % (codec.name, clevel, ", dict" if use_dict else "")
+    print("  %-22s cratio %5.2f, compression %6.0f MB/s, decompression %6.0f MB/s"
+          % (label, nbytes / cbytes, nbytes / tc / 2 ** 20, nbytes / td / 2 ** 20))
@@ -0,0 +1,54 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for estimating the compression ratio and speed of every codec,
+clevel and filter with blosc2.estimate(), compared with compressing the whole
+data with each of them.  The choice of blosc2.compress2(codec="auto") is
+reported too.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+N = 2 * 1000 * 1000  # 16 MB
+
+blosc2.print_versions()
+rng = np.random.default_rng(0)
+kinds = {
+    "linspace": np.linspace(0, 1, N),
+    "integers": rng.integers(0, 100, N).astype(np.float64),
+    "normal": rng.normal(size=N).round(2),
+}
+candidates = [
+    {"codec": codec, "clevel": clevel, "filters": [filter_]}
+    for codec in [blosc2.Codec.BLOSCLZ, blosc2.Codec.LZ4, blosc2.Codec.ZSTD]
+    for clevel in [1, 5]
+    for filter_ in [blosc2.Filter.NOFILTER, blosc2.Filter.SHUFFLE, blosc2.Filter.BITSHUFFLE]
+]
+
+for kind, data in kinds.items():
+    print("%s data, %d MB, %d candidates:" % (kind, data.nbytes // 10 ** 6, len(candidates)))
+    t0 = time.time()
+    estimates = blosc2.estimate(data, typesize=8, candidates=candidates)
+    te = time.time() - t0
+    t0 = time.time()
+    cratios = [data.nbytes / len(blosc2.compress2(data, typesize=8, nthreads=1, **cparams))
+               for cparams in candidates]
+    tc = time.time() - t0
+    print("  estimate: %.3f s, full compression: %.3f s (%.0fx faster)" % (te, tc, tc / te))
+    for cparams, estimate, cratio in zip(candidates, estimates, cratios):
+        print("    %-7s clevel %d, %-10s cratio %6.2f (real %6.2f), compression %6.0f MB/s"
+              % (cparams["codec"].name, cparams["clevel"], cparams["filters"][0].name,
+                 estimate["cratio"], cratio, estimate["cspeed"]))
+    t0 = time.time()
+    c = blosc2.compress2(data, typesize=8, codec="auto")
+    print("  codec='auto': %.3f s, cratio %.2f" % (time.time() - t0, data.nbytes / len(c)))
@@ -0,0 +1,46 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for SChunk.extend() (also used by the SChunk constructor), which
+compresses many chunks concurrently (one chunk per thread) and appends them
+in order.  It is compared with a Python loop calling SChunk.append_data()
+per chunk, which only uses the threads inside every chunk.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+NBYTES = 2 ** 30  # 1 GB in total
+
+blosc2.print_versions()
+nthreads = blosc2.ncores
+print("Compressing %d MB with %d threads:" % (NBYTES // 2 ** 20, nthreads))
+data = np.linspace(0, 1, NBYTES // 8)
+for chunksize in (2 ** 16, 2 ** 20, 2 ** 23):
+    cparams = {"codec": blosc2.Codec.ZSTD, "clevel": 1, "typesize": 8, "nthreads": nthreads}
+    chunk_nitems = chunksize // 8
+
+    schunk = blosc2.SChunk(chunksize=chunksize, cparams=cparams)
+    t0 = time.time()
+    for i in range(NBYTES // chunksize):
+        schunk.append_data(data[i * chunk_nitems:(i + 1) * chunk_nitems])
+    t_loop = time.time() - t0
+
+    schunk = blosc2.SChunk(chunksize=chunksize, cparams=cparams)
+    t0 = time.time()
+    schunk.extend(data)
+    t_extend = time.time() - t0
+    assert schunk.get_slice(0, 1000) == data[:1000].tobytes()
+
+    print("  chunksize %5d KB: loop %.3f s (%.2f GB/s), extend %.3f s (%.2f GB/s), %.1fx"
+          % (chunksize // 2 ** 10, t_loop, NBYTES / t_loop / 2 ** 30,
+             t_extend, NBYTES / t_extend / 2 ** 30, t_loop / t_extend))
@@ -0,0 +1,55 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for the I/O backends of SChunk.  The native C-Blosc2 backend for
+local files is compared with Python backends: local files through Python file
+objects, and frames kept in memory (MemoryIO).
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+NCHUNKS = 100
+N = 100 * 1000  # 800 KB chunks
+urlpath = "io_backends.b2frame"
+
+blosc2.print_versions()
+data = np.arange(N * NCHUNKS, dtype=np.int64)
+nbytes = data.nbytes
+
+
+def report(label, t):
+    print("  %-30s %.3f s (%.2f GB/s)" % (label, t, (nbytes / t) / 2 ** 30))
+
+
+backends = {"C-Blosc2 (native)": None, "Python files": blosc2.IOBackend(), "MemoryIO": blosc2.MemoryIO()}
+for label, backend in backends.items():
+    print("%s:" % label)
+    storage = {"contiguous": True, "urlpath": urlpath, "io": backend, "cparams": {"typesize": 8}}
+    schunk = blosc2.SChunk(chunksize=N * 8, mode="w", **storage)
+    t0 = time.time()
+    for i in range(NCHUNKS):
+        schunk.append_data(data[i * N:(i + 1) * N])
+    report("append_data():", time.time() - t0)
+
+    out = np.empty(N, dtype=np.int64)
+    t0 = time.time()
+    for i in range(NCHUNKS):
+        schunk.decompress_chunk(i, out)
+    report("decompress_chunk():", time.time() - t0)
+
+    t0 = time.time()
+    for i in range(0, N * NCHUNKS, N // 10):
+        schunk[i]
+    t = time.time() - t0
+    print("  %-30s %.3f s (%.1f us/item)" % ("__getitem__():", t, t / (10 * NCHUNKS) * 1e6))
+    blosc2.remove_urlpath(urlpath)
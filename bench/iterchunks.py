@@ -0,0 +1,61 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for SChunk.iterchunks(), which decompresses the next chunks in
+background threads while the current one is being processed, for a streaming
+computation over all the chunks.  It is compared with a loop calling
+SChunk.decompress_chunk() per chunk, which alternates decompression and
+computation.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+NCHUNKS = 200
+N = 500 * 1000  # 4 MB chunks
+
+blosc2.print_versions()
+nthreads = blosc2.ncores
+data = np.linspace(0, 1, N)
+schunk = blosc2.SChunk(
+    chunksize=N * 8,
+    cparams={"codec": blosc2.Codec.ZSTD, "clevel": 1, "typesize": 8, "nthreads": nthreads},
+    dparams={"nthreads": nthreads},
+)
+schunk.extend(np.tile(data, NCHUNKS))
+nbytes = NCHUNKS * N * 8
+
+
+def compute(chunk):
+    return np.sqrt(chunk).sum()
+
+
+print("Computing over %d chunks of %d MB each, %d threads:" % (NCHUNKS, N * 8 // 10 ** 6, nthreads))
+out = np.empty(N)
+t0 = time.time()
+res_loop = 0
+for i in range(schunk.nchunks):
+    schunk.decompress_chunk(i, out)
+    res_loop += compute(out)
+t = time.time() - t0
+print("  %-44s %.3f s (%.2f GB/s)" % ("decompress_chunk() loop:", t, nbytes / t / 2 ** 30))
+
+for prefetch in (0, 1, 2, 4):
+    for reuse_buffer in (True, False):
+        t0 = time.time()
+        res = 0
+        for chunk in schunk.iterchunks(np.float64, prefetch=prefetch, reuse_buffer=reuse_buffer):
+            res += compute(chunk)
+        t = time.time() - t0
+        assert res == res_loop
+        label = "iterchunks(prefetch=%d, reuse_buffer=%s):" % (prefetch, reuse_buffer)
+        print("  %-44s %.3f s (%.2f GB/s)" % (label, t, nbytes / t / 2 ** 30))
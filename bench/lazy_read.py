@@ -0,0 +1,70 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for reading small slices out of an on-disk SChunk.  Chunks are
+fetched lazily, so only the chunk header, the block offsets and the blocks
+actually needed are read from disk.  The bytes read are taken from
+/proc/self/io, so this needs Linux for reporting them.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+NREP = 10
+NCHUNKS = 16
+N = 1000 * 1000  # 8 MB chunks
+URLPATH = "lazy_read.b2frame"
+
+
+def bytes_read():
+    # Bytes passed through read() calls by this process (Linux only)
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("rchar"):
+                    return int(line.split()[1])
+    except OSError:
+        return 0
+
+
+blosc2.print_versions()
+rng = np.random.default_rng(0)
+cparams = {"typesize": 8, "blocksize": 2 ** 16}
+# Decompress just one of every 8 blocks
+mask = np.ones(-(-N * 8 // cparams["blocksize"]), dtype=bool)
+mask[::8] = False
+for contiguous in (True, False):
+    blosc2.remove_urlpath(URLPATH)
+    storage = {"urlpath": URLPATH, "contiguous": contiguous, "cparams": cparams}
+    schunk = blosc2.SChunk(chunksize=N * 8, **storage)
+    for i in range(NCHUNKS):
+        schunk.append_data(rng.integers(0, 1000, N))
+    schunk = blosc2.open(URLPATH)
+    print("%s frame with %d chunks of %d MB each:" % (
+        "Contiguous" if contiguous else "Sparse", NCHUNKS, N * 8 // 10 ** 6))
+
+    for name, read in (
+        ("get_chunk", lambda i: schunk.get_chunk(i)),
+        ("decompress_chunk", lambda i: schunk.decompress_chunk(i)),
+        ("decompress_chunk (1/8)", lambda i: schunk.decompress_chunk(i, block_mask=mask)),
+        ("get_slice (10 items)", lambda i: schunk.get_slice(i * N + N // 2, i * N + N // 2 + 10)),
+    ):
+        r0 = bytes_read()
+        t0 = time.time()
+        for rep in range(NREP):
+            for i in range(NCHUNKS):
+                read(i)
+        t = (time.time() - t0) / (NREP * NCHUNKS)
+        rbytes = (bytes_read() - r0) / (NREP * NCHUNKS)
+        print("  %-22s %.5f s per chunk\t%10d bytes read per chunk" % (name, t, rbytes))
+
+blosc2.remove_urlpath(URLPATH)
@@ -0,0 +1,58 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for decompressing only a subset of the blocks of a chunk
+(e.g. every Nth block for a downsampled preview) via a block mask,
+compared with decompressing the whole chunk.  Masked-out blocks are
+neither read nor decompressed, so they should come almost for free.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+NREP = 10
+N = 10 * 1000 * 1000  # 80 MB chunk
+BLOCKSIZE = 2 ** 18
+
+blosc2.print_versions()
+cparams = {"typesize": 8, "blocksize": BLOCKSIZE}
+data = np.linspace(0, 1, N)
+nblocks = -(-data.nbytes // BLOCKSIZE)
+c = blosc2.compress2(data, **cparams)
+schunk = blosc2.SChunk(chunksize=data.nbytes, data=data, cparams=cparams)
+out = np.empty_like(data)
+
+print("Decompressing a chunk of %d MB with %d blocks:" % (data.nbytes // 10 ** 6, nblocks))
+tref = None
+for every in (1, 2, 4, 8, 16, 32):
+    mask = np.ones(nblocks, dtype=bool)
+    mask[::every] = False
+    if every == 1:
+        mask = None
+
+    t0 = time.time()
+    for i in range(NREP):
+        blosc2.decompress2(c, out, maskout=mask)
+    t = (time.time() - t0) / NREP
+    if tref is None:
+        tref = t
+
+    t0 = time.time()
+    for i in range(NREP):
+        schunk.decompress_chunk(0, out, block_mask=mask)
+    tschunk = (time.time() - t0) / NREP
+
+    label = "full" if every == 1 else "1 of %d blocks" % every
+    print(
+        "  %-15s decompress2: %.4f s (speedup: %.2fx)\tSChunk.decompress_chunk: %.4f s"
+        % (label, t, tref / t, tschunk)
+    )
@@ -0,0 +1,56 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for decompressing the chunks of a contiguous frame file opened
+with regular file I/O and with a memory mapping (mmap=True).  The file is
+read once before timing, so that it is in the page cache in both cases.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+NREP = 5
+NCHUNKS = 64
+N = 1000 * 1000  # 8 MB chunks
+URLPATH = "mmap_read.b2frame"
+
+blosc2.print_versions()
+blosc2.remove_urlpath(URLPATH)
+storage = {"urlpath": URLPATH, "contiguous": True, "cparams": {"typesize": 8}}
+schunk = blosc2.SChunk(chunksize=N * 8, **storage)
+for i in range(NCHUNKS):
+    schunk.append_data(np.linspace(i, i + 1, N))
+del schunk
+nbytes = NCHUNKS * N * 8
+out = np.empty(N)
+
+print("Decompressing %d chunks of %d MB each:" % (NCHUNKS, N * 8 // 10 ** 6))
+for mmap in (False, True):
+    schunk = blosc2.open(URLPATH, mode="r", mmap=mmap)
+    for i in range(NCHUNKS):
+        schunk.decompress_chunk(i, out)
+    t0 = time.time()
+    for rep in range(NREP):
+        for i in range(NCHUNKS):
+            schunk.decompress_chunk(i, out)
+    t = (time.time() - t0) / NREP
+    print("  %-12s %.3f s (%.2f GB/s)" % ("mmap:" if mmap else "file I/O:", t, (nbytes / t) / 2 ** 30))
+
+    t0 = time.time()
+    for rep in range(NREP):
+        for i in range(NCHUNKS):
+            schunk.get_slice(i * N + N // 2, i * N + N // 2 + 10)
+    t = (time.time() - t0) / (NREP * NCHUNKS)
+    print("  %-12s %.1f us per 10-item slice" % ("", t * 1e6))
+    del schunk
+
+blosc2.remove_urlpath(URLPATH)
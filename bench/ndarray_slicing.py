@@ -0,0 +1,53 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for slicing an NDArray.  Only the chunks intersecting a slice are
+read, and only their blocks intersecting it are decompressed, so small slices
+are much faster than decompressing the whole array and slicing it with NumPy.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+SHAPE = (2000, 2000, 50)
+CHUNKS = (200, 200, 50)
+BLOCKS = (20, 20, 50)
+NREPS = 10
+
+blosc2.print_versions()
+array = np.linspace(0, 1, np.prod(SHAPE)).reshape(SHAPE)
+t0 = time.time()
+ndarray = blosc2.asarray(array, chunks=CHUNKS, blocks=BLOCKS, cparams={"codec": blosc2.Codec.LZ4})
+t = time.time() - t0
+print("Creating the NDArray (%d MB): %.3f s (%.2f GB/s)"
+      % (array.nbytes // 2 ** 20, t, array.nbytes / t / 2 ** 30))
+
+t0 = time.time()
+for _ in range(NREPS):
+    full = np.frombuffer(ndarray.schunk.get_slice(), dtype=array.dtype)
+t_full = (time.time() - t0) / NREPS
+print("Decompressing the whole array: %.4f s" % t_full)
+
+slices = {
+    "single item": (1000, 1000, 25),
+    "row (along dim 1)": (1000, slice(None), 25),
+    "10x10x50 box": (slice(995, 1005), slice(995, 1005)),
+    "plane (dim 0 fixed)": (1500,),
+    "plane (dim 2 fixed)": (..., 10),
+}
+for label, key in slices.items():
+    t0 = time.time()
+    for _ in range(NREPS):
+        res = ndarray[key]
+    t = (time.time() - t0) / NREPS
+    assert np.array_equal(res, array[key])
+    print("  %-22s %.4f s (%.1fx faster than decompressing all)" % (label + ":", t, t_full / t))
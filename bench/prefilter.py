@@ -0,0 +1,77 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for the Python prefilters and postfilters of SChunk.  A transform
+run as a filter is fused into the compression (or decompression) pass, so it
+works on blocks that are still in cache.  This is compared with the two-pass
+pipelines doing the transform on the whole chunk before compressing (or after
+decompressing) it.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+NCHUNKS = 32
+N = 1000 * 1000  # 8 MB chunks
+
+blosc2.print_versions()
+nthreads = blosc2.ncores
+cparams = {"codec": blosc2.Codec.LZ4, "typesize": 8, "nthreads": nthreads}
+dparams = {"nthreads": nthreads}
+data = np.linspace(0, 1, N)
+nbytes = NCHUNKS * N * 8
+
+
+def report(label, t):
+    print("  %-36s %.3f s (%.2f GB/s)" % (label, t, (nbytes / t) / 2 ** 30))
+
+
+print("Compressing %d chunks of %d MB each, %d threads:" % (NCHUNKS, N * 8 // 10 ** 6, nthreads))
+schunk = blosc2.SChunk(chunksize=N * 8, cparams=cparams, dparams=dparams)
+t0 = time.time()
+for i in range(NCHUNKS):
+    schunk.append_data(np.sin(data + i))
+report("two-pass (sin, then compress):", time.time() - t0)
+
+for parallel in (False, True):
+    schunk_fused = blosc2.SChunk(chunksize=N * 8, cparams=cparams, dparams=dparams)
+
+    @schunk_fused.prefilter(np.float64, parallel=parallel)
+    def sin(input, output, nchunk, nblock, tid):
+        np.sin(input, out=output)
+
+    t0 = time.time()
+    for i in range(NCHUNKS):
+        schunk_fused.append_data(data + i)
+    report("fused (prefilter, parallel=%s):" % parallel, time.time() - t0)
+    schunk_fused.remove_prefilter()
+    assert schunk_fused.get_slice(0, N) == schunk.get_slice(0, N)
+
+print("Decompressing:")
+out = np.empty(N)
+t0 = time.time()
+for i in range(NCHUNKS):
+    schunk.decompress_chunk(i, out)
+    np.multiply(out, 2, out=out)
+report("two-pass (decompress, then * 2):", time.time() - t0)
+
+for parallel in (False, True):
+
+    @schunk.postfilter(np.float64, parallel=parallel)
+    def double(input, output, nchunk, nblock, tid):
+        np.multiply(input, 2, out=output)
+
+    t0 = time.time()
+    for i in range(NCHUNKS):
+        schunk.decompress_chunk(i, out)
+    report("fused (postfilter, parallel=%s):" % parallel, time.time() - t0)
+schunk.remove_postfilter()
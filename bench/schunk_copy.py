@@ -0,0 +1,49 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for SChunk.copy().  Chunks are copied in compressed form when the
+compression params do not change, and they are recompressed in parallel
+(one chunk per Python thread) otherwise.
+"""
+
+import time
+
+import numpy as np
+
+import blosc2
+
+NCHUNKS = 64
+N = 1000 * 1000  # 8 MB chunks
+
+blosc2.print_versions()
+storage = {"cparams": {"codec": blosc2.Codec.LZ4, "typesize": 8}}
+schunk = blosc2.SChunk(chunksize=N * 8, **storage)
+for i in range(NCHUNKS):
+    schunk.append_data(np.linspace(i, i + 1, N))
+nbytes = NCHUNKS * N * 8
+
+print("Copying %d chunks of %d MB each:" % (NCHUNKS, N * 8 // 10 ** 6))
+t0 = time.time()
+schunk.copy(contiguous=True)
+t = time.time() - t0
+print("  same cparams:           %.3f s (%.2f GB/s)" % (t, (nbytes / t) / 2 ** 30))
+
+tref = None
+for nthreads in (1, 2, 4, 8, 16):
+    if nthreads > blosc2.ncores:
+        break
+    t0 = time.time()
+    schunk.copy(cparams={"codec": blosc2.Codec.ZSTD, "clevel": 1, "nthreads": nthreads})
+    t = time.time() - t0
+    if tref is None:
+        tref = t
+    print(
+        "  LZ4 -> ZSTD, %2d threads: %.3f s (%.2f GB/s)\tspeedup: %.2fx"
+        % (nthreads, t, (nbytes / t) / 2 ** 30, tref / t)
+    )
@@ -0,0 +1,55 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for reading the chunks of a single SChunk from several Python
+threads.  As SChunk.decompress_chunk() releases the GIL, the throughput
+should scale with the number of Python threads (up to the number of cores).
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import blosc2
+
+NREP = 3
+NCHUNKS = 256
+N = 1000 * 1000  # 8 MB chunks
+
+blosc2.print_versions()
+# One internal thread per chunk, so that the scaling comes from Python threads
+storage = {"cparams": {"typesize": 8, "nthreads": 1}, "dparams": {"nthreads": 1}}
+schunk = blosc2.SChunk(chunksize=N * 8, **storage)
+for i in range(NCHUNKS):
+    schunk.append_data(np.linspace(i, i + 1, N))
+nbytes = NCHUNKS * N * 8
+
+
+def read(i):
+    out = np.empty(N)
+    schunk.decompress_chunk(i, out)
+
+
+print("Decompressing %d chunks of %d MB each:" % (NCHUNKS, N * 8 // 10 ** 6))
+tref = None
+for nthreads in (1, 2, 4, 8, 16):
+    if nthreads > blosc2.ncores:
+        break
+    with ThreadPoolExecutor(max_workers=nthreads) as executor:
+        t0 = time.time()
+        for i in range(NREP):
+            list(executor.map(read, range(NCHUNKS)))
+        t = (time.time() - t0) / NREP
+    if tref is None:
+        tref = t
+    print(
+        "  %2d Python threads: %.3f s (%.2f GB/s)\tspeedup: %.2fx"
+        % (nthreads, t, (nbytes / t) / 2 ** 30, tref / t)
+    )
@@ -0,0 +1,59 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for the automatic tuning of the compression params (blosc2.Tuner)
+of the chunks appended to a SChunk, for data whose kind changes along the
+SChunk.  Every tuning mode is compared with the default and a few fixed
+cparams, in compression time and ratio.
+"""
+
+import collections
+import time
+
+import numpy as np
+
+import blosc2
+
+NCHUNKS = 30
+N = 250 * 1000  # 2 MB chunks
+RETUNE_EVERY = 5
+
+blosc2.print_versions()
+rng = np.random.default_rng(0)
+kinds = [
+    np.linspace(0, 1, N),
+    rng.integers(0, 100, N).astype(np.float64),
+    rng.normal(size=N).round(2),
+]
+# A third of the chunks of every kind, one run after the other
+data = np.concatenate([kind for kind in kinds for _ in range(NCHUNKS // len(kinds))])
+
+candidates = [
+    ("default", {}),
+    ("LZ4, clevel 1", {"codec": blosc2.Codec.LZ4, "clevel": 1}),
+    ("ZSTD, clevel 5", {"codec": blosc2.Codec.ZSTD, "clevel": 5}),
+]
+for mode in blosc2.TuneMode:
+    candidates.append(("tuner %s" % mode.name, {"tuner": blosc2.Tuner(mode, retune_every=RETUNE_EVERY)}))
+
+print("Compressing %d chunks of %d MB each:" % (NCHUNKS, N * 8 // 10 ** 6))
+for label, cparams in candidates:
+    schunk = blosc2.SChunk(chunksize=N * 8, cparams=dict(cparams, typesize=8, nthreads=1))
+    t0 = time.time()
+    for i in range(NCHUNKS):
+        schunk.append_data(data[i * N:(i + 1) * N])
+    t = time.time() - t0
+    print("  %-16s %.3f s (%.0f MB/s), cratio %.2f" % (label, t, data.nbytes / t / 2 ** 20, schunk.cratio))
+    if schunk.tuner is not None:
+        choices = collections.Counter(
+            (cparams["codec"].name, cparams["clevel"], cparams["filters"][-1].name)
+            for cparams in schunk.tuner.history
+        )
+        for (codec, clevel, filter_), nchunks in choices.most_common():
+            print("    %3d chunks with %s, clevel %d, %s" % (nchunks, codec, clevel, filter_))
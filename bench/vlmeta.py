@@ -0,0 +1,53 @@
+########################################################################
+#
+#       Created: October 18, 2026
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+"""
+Benchmark for the variable length metalayers (vlmeta) of an on-disk SChunk.
+Setting several vlmetalayers one by one rewrites the frame for each of them,
+while `vlmeta.update()` rewrites it just once.  Reading a vlmetalayer again
+is served from the cache of decoded values.
+"""
+
+import time
+
+import blosc2
+
+NLAYERS = 16
+NITER = 100
+urlpath = "vlmeta.b2frame"
+
+blosc2.remove_urlpath(urlpath)
+schunk = blosc2.SChunk(chunksize=1000, data=b"x" * 1000, contiguous=True, urlpath=urlpath)
+values = {"vlmeta%d" % i: {"nchunk": i, "stats": [i, 2 * i, 3 * i]} for i in range(NLAYERS)}
+
+t0 = time.time()
+for _ in range(NITER):
+    for name, content in values.items():
+        schunk.vlmeta[name] = content
+t = time.time() - t0
+print("Setting %d vlmetalayers one by one: %.1f us per set" % (NLAYERS, t / (NITER * NLAYERS) * 1e6))
+
+t0 = time.time()
+for _ in range(NITER):
+    schunk.vlmeta.update(values)
+t = time.time() - t0
+print("Setting %d vlmetalayers with update(): %.1f us per set" % (NLAYERS, t / (NITER * NLAYERS) * 1e6))
+
+sc_open = blosc2.open(urlpath)
+t0 = time.time()
+for name in values:
+    sc_open.vlmeta[name]
+t = time.time() - t0
+print("First read (decompress and unpack): %.1f us per get" % (t / NLAYERS * 1e6))
+t0 = time.time()
+for _ in range(NITER):
+    for name in values:
+        sc_open.vlmeta[name]
+t = time.time() - t0
+print("Cached read: %.1f us per get" % (t / (NITER * NLAYERS) * 1e6))
+blosc2.remove_urlpath(urlpath)
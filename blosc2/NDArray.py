@@ -0,0 +1,405 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import ast
+import math
+
+import numpy
+
+import blosc2
+from blosc2 import blosc2_ext
+
+# The name of the metalayer with the layout of the NDArray, and the version of its format
+LAYOUT_META = "b2nd"
+LAYOUT_VERSION = 0
+
+# The (uncompressed) sizes aimed at by the default chunks and blocks
+CHUNK_NBYTES = 2 ** 22
+BLOCK_NBYTES = 2 ** 16
+
+
+class NDArray:
+    def __init__(self, schunk):
+        """Wrap an :class:`~blosc2.SChunk` containing an N-dimensional array.
+
+        NDArrays are usually created with :func:`~blosc2.empty`, :func:`~blosc2.zeros`,
+        :func:`~blosc2.full` or :func:`~blosc2.asarray`, or opened with :func:`~blosc2.open`.
+
+        The array is split into chunks of :attr:`chunks` shape, which are stored in the
+        SChunk in C order, and every chunk is split into blocks of :attr:`blocks` shape
+        (the blocks of the compressor), which are stored in C order too.  The edge
+        chunks and blocks are padded.  The layout is kept in the `b2nd` metalayer of
+        the SChunk.
+
+        Parameters
+        ----------
+        schunk: :class:`~blosc2.SChunk`
+            The super-chunk with the data of the array.
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`schunk` does not contain an N-dimensional array.
+        """
+        if LAYOUT_META not in schunk.meta:
+            raise ValueError("The SChunk does not contain an NDArray")
+        version, ndim, shape, chunks, blocks, _, descr = schunk.meta[LAYOUT_META]
+        if version > LAYOUT_VERSION:
+            raise ValueError("Unsupported NDArray format version %d" % version)
+        self.schunk = schunk
+        self._shape = tuple(shape)
+        self._chunks = tuple(chunks)
+        self._blocks = tuple(blocks)
+        self._dtype = numpy.lib.format.descr_to_dtype(ast.literal_eval(descr))
+        # The shape of the chunks with padded blocks, and their number of blocks per dimension
+        self._nblocks = tuple(-(-c // b) for c, b in zip(self._chunks, self._blocks))
+        self._extchunks = tuple(n * b for n, b in zip(self._nblocks, self._blocks))
+        # The number of chunks per dimension
+        self._chunk_grid = tuple(-(-s // c) for s, c in zip(self._shape, self._chunks))
+
+    @property
+    def shape(self):
+        """The shape of the array."""
+        return self._shape
+
+    @property
+    def ndim(self):
+        """The number of dimensions of the array."""
+        return len(self._shape)
+
+    @property
+    def size(self):
+        """The number of items in the array."""
+        return math.prod(self._shape)
+
+    @property
+    def dtype(self):
+        """The NumPy dtype of the items."""
+        return self._dtype
+
+    @property
+    def chunks(self):
+        """The shape of the chunks."""
+        return self._chunks
+
+    @property
+    def blocks(self):
+        """The shape of the blocks inside the chunks."""
+        return self._blocks
+
+    def __getitem__(self, key):
+        """Get a (multidimensional) slice of the array as a NumPy array.
+
+        Only the chunks intersecting the slice are read, and only their blocks
+        intersecting the slice are decompressed.
+
+        Parameters
+        ----------
+        key: int, slice, Ellipsis or tuple of them
+            The selection, like in NumPy basic indexing.  Only positive steps are supported.
+
+        Returns
+        -------
+        out: NumPy array
+            The items selected.
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> import numpy
+        >>> array = numpy.arange(100 * 100, dtype="int32").reshape(100, 100)
+        >>> ndarray = blosc2.asarray(array, chunks=(50, 50), blocks=(10, 10))
+        >>> ndarray[48:52, 10].tolist()
+        [4810, 4910, 5010, 5110]
+        >>> ndarray[-1, ::40].tolist()
+        [9900, 9940, 9980]
+        """
+        start, stop, step, squeeze = self._process_key(key)
+        out = numpy.empty(tuple(stop - start), dtype=self._dtype)
+        if out.size > 0:
+            chunk = numpy.empty(math.prod(self._extchunks), dtype=self._dtype)
+            for nchunk, origin, lo, hi in self._intersecting_chunks(start, stop):
+                lo_block = (lo - origin) // self._blocks
+                hi_block = (hi - origin - 1) // self._blocks + 1
+                mask = numpy.ones(self._nblocks, dtype=bool)
+                mask[tuple(slice(i, j) for i, j in zip(lo_block, hi_block))] = False
+                self.schunk.decompress_chunk(nchunk, chunk, block_mask=mask.ravel() if mask.any() else None)
+                # Just the blocks decompressed are laid out as a (sub)chunk
+                blocks = self._from_blocks(chunk, lo_block, hi_block)
+                offset = origin + lo_block * self._blocks
+                sel = tuple(slice(i, j) for i, j in zip(lo - offset, hi - offset))
+                out[tuple(slice(i, j) for i, j in zip(lo - start, hi - start))] = blocks[sel]
+        return out[tuple(0 if sq else slice(None, None, st) for sq, st in zip(squeeze, step))]
+
+    def __setitem__(self, key, value):
+        """Set a (multidimensional) slice of the array.
+
+        Only the chunks intersecting the slice are updated, and the chunks fully
+        covered by the slice are not read.
+
+        Parameters
+        ----------
+        key: int, slice, Ellipsis or tuple of them
+            The selection, like in NumPy basic indexing.  Only positive steps are supported.
+        value: scalar or array-like
+            The items to set, which are broadcast to the shape of the selection.
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> ndarray = blosc2.zeros((100, 100), dtype="float64", chunks=(50, 50))
+        >>> ndarray[45:55, 45:55] = 1
+        >>> ndarray[43:47, 50].tolist()
+        [0.0, 0.0, 1.0, 1.0]
+        """
+        blosc2_ext._check_access_mode(self.schunk.urlpath, self.schunk.mode)
+        start, stop, step, squeeze = self._process_key(key)
+        box = tuple(stop - start)
+        if any(st != 1 for st in step):
+            # Update the box enclosing the items selected
+            sel = tuple(0 if sq else slice(None, None, st) for sq, st in zip(squeeze, step))
+            array = self[tuple(slice(i, j) for i, j in zip(start, stop))]
+            array[sel] = value
+            value = array
+        else:
+            shape = tuple(n for n, sq in zip(box, squeeze) if not sq)
+            value = numpy.broadcast_to(numpy.asarray(value, dtype=self._dtype), shape).reshape(box)
+        if math.prod(box) == 0:
+            return
+
+        chunk = numpy.empty(math.prod(self._extchunks), dtype=self._dtype)
+        all_blocks = (numpy.zeros(self.ndim, dtype=int), numpy.array(self._nblocks))
+        for nchunk, origin, lo, hi in self._intersecting_chunks(start, stop):
+            if numpy.any(lo > origin) or numpy.any(hi < numpy.minimum(origin + self._chunks, self._shape)):
+                self.schunk.decompress_chunk(nchunk, chunk)
+            array = self._from_blocks(chunk, *all_blocks)
+            array[tuple(slice(i, j) for i, j in zip(lo - origin, hi - origin))] = (
+                value[tuple(slice(i, j) for i, j in zip(lo - start, hi - start))]
+            )
+            self.schunk.update_data(nchunk, self._to_blocks(array), copy=True)
+
+    def _process_key(self, key):
+        # Return the start, stop and step of the selection per dimension, and the dimensions to squeeze
+        key = key if isinstance(key, tuple) else (key,)
+        if any(k is Ellipsis for k in key):
+            i = key.index(Ellipsis)
+            key = key[:i] + (slice(None),) * (self.ndim - len(key) + 1) + key[i + 1:]
+        if len(key) > self.ndim:
+            raise IndexError("Too many indices for an array of %d dimensions" % self.ndim)
+        key = key + (slice(None),) * (self.ndim - len(key))
+        start, stop, step, squeeze = [], [], [], []
+        for k, n in zip(key, self._shape):
+            if isinstance(k, slice):
+                i, j, st = k.indices(n)
+                if st <= 0:
+                    raise ValueError("Only positive steps are supported")
+                start.append(i)
+                stop.append(max(i, j))
+                step.append(st)
+                squeeze.append(False)
+            elif isinstance(k, (int, numpy.integer)):
+                i = int(k) + n if k < 0 else int(k)
+                if not 0 <= i < n:
+                    raise IndexError("Index %d is out of bounds for a dimension of size %d" % (k, n))
+                start.append(i)
+                stop.append(i + 1)
+                step.append(1)
+                squeeze.append(True)
+            else:
+                raise IndexError("Only integers, slices and Ellipsis are supported as indices")
+        return numpy.array(start, dtype=int), numpy.array(stop, dtype=int), step, squeeze
+
+    def _intersecting_chunks(self, start, stop):
+        # Yield the index and origin of the chunks intersecting the selection, and the intersection
+        chunks = numpy.array(self._chunks)
+        lo_chunk = start // chunks
+        hi_chunk = (stop - 1) // chunks + 1
+        for index in numpy.ndindex(*(hi_chunk - lo_chunk)):
+            coords = lo_chunk + index
+            origin = coords * chunks
+            nchunk = int(numpy.ravel_multi_index(tuple(coords), self._chunk_grid))
+            yield nchunk, origin, numpy.maximum(start, origin), numpy.minimum(stop, origin + chunks)
+
+    def _from_blocks(self, chunk, lo_block, hi_block):
+        # A view (or copy) of the chunk buffer with the blocks from lo_block to hi_block laid out as an array
+        ndim = self.ndim
+        blocks = chunk.reshape(self._nblocks + self._blocks)
+        blocks = blocks[tuple(slice(i, j) for i, j in zip(lo_block, hi_block))]
+        interleaved = [axis for i in range(ndim) for axis in (i, ndim + i)]
+        shape = tuple((j - i) * b for i, j, b in zip(lo_block, hi_block, self._blocks))
+        return blocks.transpose(interleaved).reshape(shape)
+
+    def _to_blocks(self, array):
+        # The chunk buffer for an array with the (padded) shape of the chunks
+        ndim = self.ndim
+        blocks = array.reshape([n for pair in zip(self._nblocks, self._blocks) for n in pair])
+        axes = list(range(0, 2 * ndim, 2)) + list(range(1, 2 * ndim, 2))
+        return numpy.ascontiguousarray(blocks.transpose(axes))
+
+
+def _default_partition(shape, itemsize, nbytes, within=None):
+    # Halve the largest dimension of shape (or within) until the partition has at most nbytes
+    partition = list(within if within is not None else shape)
+    partition = [max(1, n) for n in partition]
+    while math.prod(partition) * itemsize > nbytes and max(partition) > 1:
+        i = partition.index(max(partition))
+        partition[i] = -(-partition[i] // 2)
+    return tuple(partition)
+
+
+def _create(shape, dtype, chunks, blocks, kwargs):
+    # Create an NDArray with no chunks yet
+    shape = (shape,) if isinstance(shape, (int, numpy.integer)) else tuple(shape)
+    dtype = numpy.dtype(dtype)
+    if any(n < 0 for n in shape):
+        raise ValueError("The shape cannot have negative dimensions")
+    if chunks is None:
+        chunks = _default_partition(shape, dtype.itemsize, CHUNK_NBYTES)
+    if blocks is None:
+        blocks = _default_partition(shape, dtype.itemsize, BLOCK_NBYTES, within=chunks)
+    chunks, blocks = tuple(chunks), tuple(blocks)
+    if not len(shape) == len(chunks) == len(blocks):
+        raise ValueError("The shape, chunks and blocks must have the same number of dimensions")
+    if any(c <= 0 or b <= 0 or b > c for c, b in zip(chunks, blocks)):
+        raise ValueError("The chunks and blocks must be positive, and the blocks cannot exceed the chunks")
+    nblocks = [-(-c // b) for c, b in zip(chunks, blocks)]
+    chunksize = math.prod(n * b for n, b in zip(nblocks, blocks)) * dtype.itemsize
+    if chunksize > blosc2.MAX_BUFFERSIZE:
+        raise ValueError("The chunks cannot be larger than %d bytes" % blosc2.MAX_BUFFERSIZE)
+
+    cparams = dict(kwargs.pop("cparams", None) or {})
+    cparams["typesize"] = dtype.itemsize if dtype.itemsize <= blosc2.MAX_TYPESIZE else 1
+    cparams["blocksize"] = math.prod(blocks) * dtype.itemsize
+    descr = repr(numpy.lib.format.dtype_to_descr(dtype))
+    meta = dict(kwargs.pop("meta", None) or {})
+    meta[LAYOUT_META] = [LAYOUT_VERSION, len(shape), list(shape), list(chunks), list(blocks), 0, descr]
+    kwargs.setdefault("mode", "w")
+    schunk = blosc2.SChunk(chunksize=chunksize, meta=meta, cparams=cparams, **kwargs)
+    return NDArray(schunk)
+
+
+def _fill(array, fill_value):
+    # Append the chunks of an NDArray created by _create(), all with fill_value
+    nchunks = math.prod(array._chunk_grid)
+    if nchunks == 0:
+        return array
+    array.schunk.append_data(numpy.full(math.prod(array._extchunks), fill_value, dtype=array.dtype))
+    # The chunk is compressed just once
+    chunk = array.schunk.get_chunk(0)
+    for nchunk in range(1, nchunks):
+        array.schunk.insert_chunk(nchunk, chunk)
+    return array
+
+
+def empty(shape, dtype=numpy.float64, chunks=None, blocks=None, **kwargs):
+    """Create an :class:`~blosc2.NDArray` without initializing its items.
+
+    Parameters
+    ----------
+    shape: int or tuple of ints
+        The shape of the array.
+    dtype: NumPy dtype, optional
+        The dtype of the items.  Default is `float64`.
+    chunks: tuple of ints, optional
+        The shape of the chunks.  Default is computed from :paramref:`shape`,
+        aiming at chunks of 4 MB.
+    blocks: tuple of ints, optional
+        The shape of the blocks inside the chunks.  Default is computed from
+        :paramref:`chunks`, aiming at blocks of 64 KB.
+
+    Other parameters
+    ----------------
+    kwargs: dict, optional
+        The storage keyword arguments of :func:`~blosc2.SChunk.__init__` (`contiguous`,
+        `urlpath`, `cparams`, `dparams`, `io`, `meta`), plus its `mode` (default is `"w"`).
+        The `typesize` and `blocksize` of `cparams` are set from the dtype and blocks.
+
+    Returns
+    -------
+    out: :class:`~blosc2.NDArray`
+        The new array.
+
+    Examples
+    --------
+    >>> import blosc2
+    >>> ndarray = blosc2.empty((1000, 1000), dtype="int32", chunks=(100, 1000), blocks=(10, 1000))
+    >>> ndarray.shape, ndarray.chunks, ndarray.blocks
+    ((1000, 1000), (100, 1000), (10, 1000))
+    """
+    return _fill(_create(shape, dtype, chunks, blocks, kwargs), 0)
+
+
+def zeros(shape, dtype=numpy.float64, chunks=None, blocks=None, **kwargs):
+    """Create an :class:`~blosc2.NDArray` full of zeros.
+
+    The parameters are the same than in :func:`~blosc2.empty`.
+
+    Examples
+    --------
+    >>> import blosc2
+    >>> ndarray = blosc2.zeros((10, 10), dtype="int16")
+    >>> ndarray[0].tolist()
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+    """
+    return _fill(_create(shape, dtype, chunks, blocks, kwargs), 0)
+
+
+def full(shape, fill_value, dtype=None, chunks=None, blocks=None, **kwargs):
+    """Create an :class:`~blosc2.NDArray` full of :paramref:`fill_value`.
+
+    Parameters
+    ----------
+    fill_value: scalar
+        The value of all the items.
+    dtype: NumPy dtype, optional
+        The dtype of the items.  Default is the dtype of :paramref:`fill_value`.
+
+    The other parameters are the same than in :func:`~blosc2.empty`.
+
+    Examples
+    --------
+    >>> import blosc2
+    >>> ndarray = blosc2.full((10, 10), 3.5)
+    >>> ndarray[5, 5:8].tolist()
+    [3.5, 3.5, 3.5]
+    """
+    dtype = numpy.asarray(fill_value).dtype if dtype is None else dtype
+    return _fill(_create(shape, dtype, chunks, blocks, kwargs), fill_value)
+
+
+def asarray(array, chunks=None, blocks=None, **kwargs):
+    """Create an :class:`~blosc2.NDArray` with the items of a NumPy array.
+
+    Parameters
+    ----------
+    array: array-like
+        The items of the new array, with its shape and dtype.
+
+    The other parameters are the same than in :func:`~blosc2.empty`.
+
+    Examples
+    --------
+    >>> import blosc2
+    >>> import numpy
+    >>> array = numpy.linspace(0, 1, 1000 * 1000).reshape(1000, 1000)
+    >>> ndarray = blosc2.asarray(array, chunks=(200, 200), blocks=(50, 50))
+    >>> numpy.array_equal(ndarray[...], array)
+    True
+    """
+    array = numpy.asarray(array)
+    ndarray = _create(array.shape, array.dtype, chunks, blocks, kwargs)
+    if ndarray.size == 0:
+        return ndarray
+    padded = numpy.zeros(ndarray._extchunks, dtype=array.dtype)
+    chunks = numpy.array(ndarray.chunks)
+    for coords in numpy.ndindex(*ndarray._chunk_grid):
+        origin = numpy.array(coords) * chunks
+        stop = numpy.minimum(origin + chunks, array.shape)
+        padded[tuple(slice(0, j - i) for i, j in zip(origin, stop))] = (
+            array[tuple(slice(i, j) for i, j in zip(origin, stop))]
+        )
+        ndarray.schunk.append_data(ndarray._to_blocks(padded))
+    return ndarray
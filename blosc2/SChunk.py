@@ -4,29 +4,51 @@
 #
 ########################################################################
 
-from collections.abc import MutableMapping
+import builtins
+import io
+import operator
+import pickle
+import struct
+from collections.abc import Mapping, MutableMapping
 
 from msgpack import packb, unpackb
 
-from blosc2 import blosc2_ext
+from blosc2 import aio, blosc2_ext
+from blosc2.core import _as_tuner
+
+
+# The types of the decoded vlmeta values that can be returned from the cache without copying them
+_IMMUTABLE_TYPES = (bool, int, float, str, bytes, type(None))
 
 
 class vlmeta(MutableMapping, blosc2_ext.vlmeta):
     def __init__(self, schunk, urlpath, mode):
         self.urlpath = urlpath
         self.mode = mode
+        # The packed and decoded contents of the vlmetalayers read, which are dropped when written
+        self._cache = {}
         super(vlmeta, self).__init__(schunk)
 
     def __setitem__(self, name, content):
         blosc2_ext._check_access_mode(self.urlpath, self.mode)
         cparams = {"typesize": 1}
+        self._cache.pop(_vlmeta_key(name), None)
         super(vlmeta, self).set_vlmeta(name, packb(content), **cparams)
 
     def __getitem__(self, name):
-        return unpackb(super(vlmeta, self).get_vlmeta(name))
+        key = _vlmeta_key(name)
+        try:
+            packed, content = self._cache[key]
+        except KeyError:
+            packed = super(vlmeta, self).get_vlmeta(name)
+            content = unpackb(packed)
+            self._cache[key] = (packed, content)
+        # The mutable contents are decoded again, so that the cached ones cannot be modified
+        return content if isinstance(content, _IMMUTABLE_TYPES) else unpackb(packed)
 
     def __delitem__(self, name):
         blosc2_ext._check_access_mode(self.urlpath, self.mode)
+        self._cache.pop(_vlmeta_key(name), None)
         super(vlmeta, self).del_vlmeta(name)
 
     def __len__(self):
@@ -37,12 +59,85 @@ class vlmeta(MutableMapping, blosc2_ext.vlmeta):
         for name in keys:
             yield name
 
+    def update(self, *args, **kwargs):
+        """
+        Set several variable length metalayers at once, like `dict.update()`.
+
+        The frame of the super-chunk (if any) is written just once, instead of
+        once per metalayer.
+
+        """
+        blosc2_ext._check_access_mode(self.urlpath, self.mode)
+        items = dict(*args, **kwargs)
+        for name in items:
+            self._cache.pop(_vlmeta_key(name), None)
+        cparams = {"typesize": 1}
+        super(vlmeta, self).set_vlmeta_many(
+            [(name, packb(content)) for name, content in items.items()], **cparams
+        )
+
     def getall(self):
         """
         Return all the variable length metalayers as a dictionary
 
         """
-        return super(vlmeta, self).to_dict()
+        return {name: self[name] for name in self}
+
+
+def _vlmeta_key(name):
+    return name.decode("utf-8") if isinstance(name, bytes) else name
+
+
+class meta(Mapping, blosc2_ext.meta):
+    def __init__(self, schunk, urlpath, mode):
+        self.urlpath = urlpath
+        self.mode = mode
+        super(meta, self).__init__(schunk)
+
+    def __setitem__(self, name, content):
+        blosc2_ext._check_access_mode(self.urlpath, self.mode)
+        super(meta, self).set_meta(name, packb(content))
+
+    def __getitem__(self, name):
+        return unpackb(super(meta, self).get_meta(name))
+
+    def __contains__(self, name):
+        return super(meta, self).meta_exists(name)
+
+    def __len__(self):
+        return super(meta, self).nmetalayers()
+
+    def __iter__(self):
+        keys = super(meta, self).get_names()
+        for name in keys:
+            yield name
+
+    def get_raw(self, name):
+        """Return the content of the metalayer :paramref:`name` as bytes, without unpacking it."""
+        return super(meta, self).get_meta(name)
+
+    def set_raw(self, name, content):
+        """Set the content of the metalayer :paramref:`name` to the bytes of :paramref:`content`.
+
+        :paramref:`content` can be any bytes-like object (e.g. a NumPy array), and
+        it is stored as is, without packing it with msgpack.
+        """
+        blosc2_ext._check_access_mode(self.urlpath, self.mode)
+        super(meta, self).set_meta(name, content)
+
+    def get_typed(self, name, dtype):
+        """Return the content of the metalayer :paramref:`name` decoded as :paramref:`dtype`.
+
+        :paramref:`dtype` can be a NumPy dtype, and then a (read-only) NumPy array
+        is returned, or a :class:`struct.Struct`, and then the tuple of values is
+        returned.
+        """
+        content = super(meta, self).get_meta(name)
+        if isinstance(dtype, struct.Struct):
+            return dtype.unpack(content)
+        import numpy
+
+        return numpy.frombuffer(content, dtype=dtype)
 
 
 class SChunk(blosc2_ext.SChunk):
@@ -59,7 +154,8 @@ class SChunk(blosc2_ext.SChunk):
             it is set to 8MB.
 
         data: bytes-like object, optional
-            The data to be split into different chunks of size :paramref:`chunksize`.
+            The data to be split into different chunks of size :paramref:`chunksize`,
+            which are compressed concurrently (see :func:`~blosc2.SChunk.extend`).
 
         mode: str, optional
             Persistence mode: ‘r’ means read only (must exist);
@@ -79,27 +175,63 @@ class SChunk(blosc2_ext.SChunk):
                     If the storage is in-memory, then this field is `None`.
                 cparams: dict
                     A dictionary with the compression parameters, which are the same that can be
-                    used in the :func:`~blosc2.compress2` function.
+                    used in the :func:`~blosc2.compress2` function.  With a `tuner`, the
+                    `codec`, `clevel` and `filters` of every chunk compressed are chosen by it
+                    (see :attr:`~blosc2.SChunk.tuner`).  A `dict` (see :func:`~blosc2.train_dict`)
+                    is stored in the frame, so that it is used again when the SChunk is opened.
+                    Such frames can only be read by python-blosc2 (not by C-Blosc2).
                 dparams: dict
                     A dictionary with the decompression parameters, which are the same that can be
                     used in the :func:`~blosc2.decompress2` function.
+                io: :class:`~blosc2.IOBackend`
+                    The backend for reading and writing the frame.  Only contiguous
+                    super-chunks with an `urlpath` are supported.  Default is `None`,
+                    meaning the local filesystem (through C-Blosc2).
+                meta: dict
+                    The fixed-size metalayers to add (see :attr:`~blosc2.SChunk.meta`),
+                    with their names as keys.  The contents are packed with msgpack.
 
         Examples
         --------
         >>> import blosc2
+        >>> import numpy
         >>> storage = {"contiguous": True, "cparams": {}, "dparams": {}}
         >>> schunk = blosc2.SChunk(**storage)
+        >>> schunk = blosc2.SChunk(meta={"shape": [10, 10]}, **storage)
+        >>> schunk.meta["shape"]
+        [10, 10]
+        >>> cparams = {"typesize": 8, "tuner": blosc2.TuneMode.RATIO}
+        >>> schunk = blosc2.SChunk(chunksize=1000 * 8, cparams=cparams)
+        >>> nchunks = schunk.extend(numpy.arange(10 * 1000, dtype="int64"))
+        >>> [cparams["nchunk"] for cparams in schunk.tuner.history]
+        [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
         """
         if kwargs is not None:
             # This a private param to get an SChunk from a blosc2_schunk*
             sc = kwargs.pop("schunk", None)
             self.urlpath = kwargs.get("urlpath", None)
+            cparams = kwargs.get("cparams", None)
+            if sc is None and cparams is not None and cparams.get("dict", None) is not None:
+                # Stored in the frame, for decompressing the chunks when it is opened again
+                kwargs["meta"] = dict(kwargs.get("meta", None) or {})
+                kwargs["meta"][blosc2_ext._DICT_META] = bytes(cparams["dict"])
+            if kwargs.get("meta", None) is not None:
+                kwargs["meta"] = {name: packb(content) for name, content in kwargs["meta"].items()}
+            if cparams is not None and cparams.get("tuner", None) is not None:
+                kwargs["cparams"] = cparams = dict(cparams)
+                # Before the data is compressed by the constructor
+                self._set_tuner(_as_tuner(cparams.pop("tuner")))
         else:
             self.urlpath = None
             sc = None
         super(SChunk, self).__init__(schunk=sc, chunksize=chunksize, data=data, mode=mode, **kwargs)
         self.mode = mode
-        self.vlmeta = vlmeta(super(SChunk, self).c_schunk, self.urlpath, self.mode)
+        self.meta = meta(super(SChunk, self).c_schunk, self.urlpath, self.mode)
+        self.vlmeta = vlmeta(self, self.urlpath, self.mode)
+        if sc is not None and blosc2_ext._DICT_META in self.meta:
+            self._set_dict(self.meta[blosc2_ext._DICT_META])
+        # The args of the prefilter set, so that it can be restored by fill_from()
+        self._prefilter_args = None
 
     def append_data(self, data):
         """Append a data buffer to the SChunk.
@@ -134,7 +266,95 @@ class SChunk(blosc2_ext.SChunk):
         blosc2_ext._check_access_mode(self.urlpath, self.mode)
         return super(SChunk, self).append_data(data)
 
-    def decompress_chunk(self, nchunk, dst=None):
+    async def aappend_data(self, data):
+        """Append a data buffer to the SChunk like :func:`~blosc2.SChunk.append_data`,
+        without blocking the event loop.
+
+        The buffer is compressed and appended by the worker threads of
+        :mod:`blosc2.aio`.  The buffers are appended in the order of the calls,
+        even if they are awaited concurrently (e.g. with `asyncio.gather`).
+
+        Parameters
+        ----------
+        data: bytes-like object
+            The data to be compressed and added as a chunk.  It must not be
+            modified until the call is finished.
+
+        Returns
+        -------
+        out: int
+            The number of chunks in the SChunk after appending :paramref:`data`.
+
+        Raises
+        ------
+        RunTimeError
+            If :paramref:`data` could not be appended.
+
+        Examples
+        --------
+        >>> import asyncio
+        >>> import blosc2
+        >>> import numpy
+        >>> schunk = blosc2.SChunk(chunksize=200*1000*4)
+        >>> data = numpy.arange(200 * 1000, dtype='int32')
+        >>> async def append(n):
+        ...     return await asyncio.gather(*[schunk.aappend_data(data) for _ in range(n)])
+        >>> asyncio.run(append(3))
+        [1, 2, 3]
+        """
+        blosc2_ext._check_access_mode(self.urlpath, self.mode)
+        return await aio._submit(super(SChunk, self).append_data, data, key=self)
+
+    def extend(self, data, nthreads=None, max_pending=None):
+        """Append a data buffer of any size to the SChunk, split into chunks.
+
+        The data buffer is split into chunks of `chunksize` bytes (the last one
+        can be smaller), which are compressed concurrently (one chunk per thread,
+        with the GIL released) and appended in order.  This is much faster than
+        calling :func:`~blosc2.SChunk.append_data` per chunk, which only uses the
+        threads inside every chunk.  When a prefilter is set, the chunks are
+        compressed one after the other instead.
+
+        Parameters
+        ----------
+        data: bytes-like object
+            The data to be compressed and added as chunks.
+        nthreads: int
+            The number of threads. Default is `None`, meaning the `nthreads` of the
+            `cparams` of the SChunk.  When there is just one chunk to compress,
+            the threads are used inside it.
+        max_pending: int
+            The maximum number of chunks being compressed or waiting to be appended,
+            which bounds the memory used to about `max_pending` times `chunksize`.
+            Default is `None`, meaning twice :paramref:`nthreads`.
+
+        Returns
+        -------
+        out: int
+            The number of chunks in the SChunk.
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`nthreads` or :paramref:`max_pending` are not positive.
+        RunTimeError
+            If :paramref:`data` could not be appended.
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> import numpy
+        >>> schunk = blosc2.SChunk(chunksize=1000 * 4, cparams={"typesize": 4})
+        >>> data = numpy.arange(10 * 1000 + 10, dtype="int32")
+        >>> schunk.extend(data, nthreads=4)
+        11
+        >>> numpy.frombuffer(schunk.get_slice(10 * 1000), dtype="int32").tolist()
+        [10000, 10001, 10002, 10003, 10004, 10005, 10006, 10007, 10008, 10009]
+        """
+        blosc2_ext._check_access_mode(self.urlpath, self.mode)
+        return super(SChunk, self).extend(data, nthreads, max_pending)
+
+    def decompress_chunk(self, nchunk, dst=None, block_mask=None):
         """Decompress the chunk given by its index :paramref:`nchunk`.
 
         Parameters
@@ -147,6 +367,12 @@ class SChunk(blosc2_ext.SChunk):
             that it has enough capacity for hosting the decompressed
             chunk. Default is None, meaning that a new bytes object
             is created, filled and returned.
+        block_mask: NumPy bool array or sequence of bools
+            A mask with one item per block in the chunk. The blocks whose
+            item is `True` are masked out, i.e. they are neither read (for
+            SChunks on disk) nor decompressed, and their area in :paramref:`dst` is left untouched
+            (or zeroed if :paramref:`dst` is `None`). Default is `None`,
+            meaning that all the blocks are decompressed.
 
         Returns
         -------
@@ -157,6 +383,8 @@ class SChunk(blosc2_ext.SChunk):
 
         Raises
         ------
+        ValueError
+            If the length of :paramref:`block_mask` does not match the number of blocks.
         RunTimeError
             If some problem was detected.
 
@@ -175,8 +403,435 @@ class SChunk(blosc2_ext.SChunk):
         >>> schunk.decompress_chunk(0, dst=bytes_obj)
         >>> bytes_obj == buffer
         True
+
+        Decompress only the even blocks of a chunk:
+
+        >>> import numpy
+        >>> cparams = {'typesize': 4, 'blocksize': 4 * 1000}
+        >>> schunk = blosc2.SChunk(chunksize=40 * 1000, data=numpy.arange(10 * 1000, dtype="int32"),
+        ...                        cparams=cparams)
+        >>> mask = numpy.arange(10) % 2 == 1
+        >>> res = numpy.frombuffer(schunk.decompress_chunk(0, block_mask=mask), dtype="int32")
+        >>> res[[999, 1000, 2000]].tolist()
+        [999, 0, 2000]
         """
-        return super(SChunk, self).decompress_chunk(nchunk, dst)
+        return super(SChunk, self).decompress_chunk(nchunk, dst, block_mask)
+
+    def decompress_range(self, start=0, stop=None, dst=None, nthreads=None):
+        """Decompress the chunks from :paramref:`start` to :paramref:`stop` into a single buffer.
+
+        The chunks are decompressed concurrently (one chunk per thread, with the GIL
+        released), so this is much faster than calling :func:`~blosc2.SChunk.decompress_chunk`
+        for every chunk, specially for small chunks, which do not benefit much from
+        the threads of a single decompression.  The chunk `nchunk` goes at the offset
+        `(nchunk - start) * chunksize` of the destination, so all the chunks but the
+        last one of the SChunk must have `chunksize` bytes.
+
+        Parameters
+        ----------
+        start: int
+            The index of the first chunk to decompress. Negative values are interpreted
+            like in Python slices. Default is 0.
+        stop: int
+            The index of the chunk after the last one to decompress. Negative values
+            are interpreted like in Python slices. Default is `None`, meaning the end
+            of the SChunk.
+        dst: NumPy object or bytearray
+            The destination NumPy object or bytearray to fill, which must have
+            enough capacity for hosting the chunks. Default is `None`, meaning
+            that a new bytes object is created, filled and returned.
+        nthreads: int
+            The number of threads. Default is `None`, meaning the `nthreads` of the
+            `dparams` of the SChunk.  When there is just one chunk to decompress,
+            the threads are used inside it.
+
+        Returns
+        -------
+        out: str/bytes
+            The decompressed chunks in form of a Python str / bytes object if
+            :paramref:`dst` is `None`. Otherwise, it will return `None` because the result
+            will already be in :paramref:`dst`.
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`dst` is too small for the chunks, or :paramref:`nthreads` is not positive.
+        RunTimeError
+            If some problem was detected (e.g. a chunk which is not the last one is
+            smaller than `chunksize`).
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> import numpy
+        >>> chunksize = 1000 * 8
+        >>> data = numpy.arange(10 * 1000, dtype="int64")
+        >>> schunk = blosc2.SChunk(chunksize=chunksize, data=data, cparams={"typesize": 8})
+        >>> dst = numpy.empty(3 * 1000, dtype="int64")
+        >>> schunk.decompress_range(2, 5, dst, nthreads=4)
+        >>> numpy.array_equal(dst, data[2000:5000])
+        True
+        """
+        return super(SChunk, self).decompress_range(start, stop, dst, nthreads)
+
+    def iterchunks(self, dtype=None, prefetch=2, reuse_buffer=True):
+        """Iterate over the decompressed chunks of the SChunk.
+
+        While a chunk is being processed by the caller, the next :paramref:`prefetch`
+        chunks are decompressed in background threads (with the GIL released), so
+        that decompression overlaps with the computation on the chunks.
+
+        Parameters
+        ----------
+        dtype: NumPy dtype
+            The dtype of the NumPy arrays yielded. Default is `None`, meaning that
+            memoryviews of the bytes of the chunks are yielded instead.
+        prefetch: int
+            The number of chunks decompressed ahead. Default is 2.  If 0, every chunk
+            is decompressed when it is requested, with the threads of the `dparams`.
+        reuse_buffer: bool
+            Whether the buffers of the chunks are reused for the chunks after them,
+            so that only `prefetch + 1` chunks are allocated in total.  Default is
+            `True`, meaning that every chunk yielded is only valid until the next
+            one is requested (copy it to keep it).  If `False`, a new buffer is
+            allocated for every chunk.
+
+        Yields
+        ------
+        out: memoryview or NumPy array
+            Every chunk in order, decompressed.  The last one can be smaller than
+            `chunksize`.
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`prefetch` is negative.
+        RunTimeError
+            If some problem was detected.
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> import numpy
+        >>> data = numpy.arange(10 * 1000, dtype="int64")
+        >>> schunk = blosc2.SChunk(chunksize=1000 * 8, data=data, cparams={"typesize": 8})
+        >>> schunk.nchunks
+        10
+        >>> [int(chunk.sum()) for chunk in schunk.iterchunks(numpy.int64, prefetch=4)][:3]
+        [499500, 1499500, 2499500]
+        """
+        return super(SChunk, self).iterchunks(dtype, prefetch, reuse_buffer)
+
+    def get_slice(self, start=0, stop=None, dst=None):
+        """Get a slice of the items in the SChunk.
+
+        Only the blocks containing the items requested are decompressed,
+        so this is much faster than :func:`~blosc2.SChunk.decompress_chunk`
+        for getting a small amount of items.  The slice can span several chunks.
+        For SChunks on disk, only the header and block offsets of the chunks
+        involved, plus the blocks needed, are read.
+
+        Parameters
+        ----------
+        start: int
+            The index of the first item to get (in `typesize` units). Negative values
+            are interpreted like in Python slices. Default is 0.
+        stop: int
+            The index of the item after the last one to get. Negative values
+            are interpreted like in Python slices. Default is `None`, meaning
+            the end of the SChunk.
+        dst: NumPy object or bytearray
+            The destination NumPy object or bytearray to fill, which must have
+            enough capacity for hosting the items. Default is `None`, meaning
+            that a new bytes object is created, filled and returned.
+
+        Returns
+        -------
+        out: str/bytes
+            The items requested in form of a Python str / bytes object if
+            :paramref:`dst` is `None`. Otherwise, it will return `None` because the result
+            will already be in :paramref:`dst`.
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`dst` is too small for the slice.
+        RunTimeError
+            If some problem was detected.
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> import numpy
+        >>> nchunks = 4
+        >>> chunksize = 200 * 1000 * 4
+        >>> data = numpy.arange(200 * 1000 * nchunks, dtype="int32")
+        >>> schunk = blosc2.SChunk(chunksize=chunksize, data=data, cparams={"typesize": 4})
+        >>> res = schunk.get_slice(199_990, 200_010)
+        >>> numpy.array_equal(numpy.frombuffer(res, dtype="int32"), data[199_990:200_010])
+        True
+        """
+        return super(SChunk, self).get_slice(start, stop, dst)
+
+    async def aget_slice(self, start=0, stop=None, dst=None):
+        """Get a slice of the items in the SChunk like :func:`~blosc2.SChunk.get_slice`,
+        without blocking the event loop.
+
+        The slice is decompressed by the worker threads of :mod:`blosc2.aio`, so
+        several slices can be got at the same time.  It is safe to get slices
+        concurrently with :func:`~blosc2.SChunk.aappend_data` calls: a slice
+        whose `stop` is `None` includes the chunks appended before it was got.
+
+        Parameters
+        ----------
+        start: int
+            The index of the first item to get (in `typesize` units). Default is 0.
+        stop: int
+            The index of the item after the last one to get. Default is `None`,
+            meaning the end of the SChunk.
+        dst: NumPy object or bytearray
+            The destination NumPy object or bytearray to fill.  It must not be used
+            until the call is finished.  Default is `None`, meaning that a new
+            bytes object is created, filled and returned.
+
+        Returns
+        -------
+        out: str/bytes
+            The items requested in form of a Python str / bytes object if
+            :paramref:`dst` is `None`. Otherwise, it will return `None` because the result
+            will already be in :paramref:`dst`.
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`dst` is too small for the slice.
+        RunTimeError
+            If some problem was detected.
+
+        Examples
+        --------
+        >>> import asyncio
+        >>> import blosc2
+        >>> import numpy
+        >>> data = numpy.arange(200 * 1000 * 4, dtype="int32")
+        >>> schunk = blosc2.SChunk(chunksize=200 * 1000 * 4, data=data, cparams={"typesize": 4})
+        >>> res = asyncio.run(schunk.aget_slice(199_990, 200_010))
+        >>> numpy.array_equal(numpy.frombuffer(res, dtype="int32"), data[199_990:200_010])
+        True
+        """
+        return await aio._submit(super(SChunk, self).get_slice, start, stop, dst)
+
+    def __getitem__(self, item):
+        """Get a slice (or a single item) of the SChunk as a bytes object.
+
+        Parameters
+        ----------
+        item: int or slice
+            The index of the item, or the slice of items (in `typesize` units) to get.
+            Only slices with a step of 1 are supported.
+
+        Returns
+        -------
+        out: str/bytes
+            The items requested in form of a Python str / bytes object.
+
+        See Also
+        --------
+        :func:`~blosc2.SChunk.get_slice`
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> schunk = blosc2.SChunk(chunksize=4, data=b"abcdefghij", cparams={"typesize": 1})
+        >>> schunk[2:7]
+        b'cdefg'
+        >>> schunk[-1]
+        b'j'
+        """
+        if isinstance(item, slice):
+            if item.step not in (None, 1):
+                raise IndexError("Only slices with a step of 1 are supported")
+            return self.get_slice(item.start, item.stop)
+        item = operator.index(item)
+        res = self.get_slice(item, item + 1 if item != -1 else None)
+        if len(res) == 0:
+            raise IndexError("SChunk index out of range")
+        return res
+
+    def to_cframe(self, copy=False):
+        """Get a contiguous frame (cframe) with the whole SChunk serialized.
+
+        The cframe can be sent over sockets, shared memory or message queues, and
+        turned into an SChunk again with :func:`~blosc2.schunk_from_cframe`.
+        This is also what SChunks are pickled as (out-of-band with pickle
+        protocol 5), so they can be passed to other processes without being
+        decompressed.
+
+        Parameters
+        ----------
+        copy: bool
+            Whether to return a copy of the cframe in a new bytes object.
+            Default is `False`, meaning that a read-only memoryview is returned
+            without copying the data.  For an in-memory contiguous SChunk, the
+            memoryview shares the memory of the SChunk frame, so the SChunk cannot
+            be modified (a `BufferError` is raised) while the memoryview is alive.
+            For the rest of SChunks, the frame is serialized into a new buffer owned
+            by the memoryview.
+
+        Returns
+        -------
+        out: memoryview or bytes
+            The cframe.
+
+        Raises
+        ------
+        RunTimeError
+            If some problem was detected.
+
+        See Also
+        --------
+        :func:`~blosc2.schunk_from_cframe`
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> import numpy
+        >>> data = numpy.arange(200 * 1000, dtype="int32")
+        >>> schunk = blosc2.SChunk(chunksize=100 * 1000 * 4, data=data, contiguous=True)
+        >>> cframe = schunk.to_cframe()
+        >>> schunk2 = blosc2.schunk_from_cframe(cframe)
+        >>> schunk2.decompress_chunk(1) == data[100 * 1000:].tobytes()
+        True
+        """
+        return super(SChunk, self).to_cframe(copy)
+
+    def chunk_info(self):
+        """Get the information of every chunk, as read from its header.
+
+        The chunks are neither decompressed nor copied; for SChunks on disk, just
+        the headers of the chunks are read.
+
+        Returns
+        -------
+        out: NumPy structured array
+            A row per chunk, with the fields:
+
+                nbytes: int32
+                    The size of the chunk data (uncompressed).
+                cbytes: int32
+                    The size of the chunk (compressed, including its header).
+                blocksize: int32
+                    The size of the blocks of the chunk.
+                typesize: uint8
+                    The size of the items of the chunk.
+                codec: uint8
+                    The codec of the chunk, as the value of a :class:`~blosc2.Codec`.
+                codec_meta: uint8
+                    The meta information for the codec.
+                filters: 6 uint8
+                    The filter pipeline, as the values of the :class:`~blosc2.Filter` applied.
+                filters_meta: 6 uint8
+                    The meta information for the filters.
+                special: uint8
+                    The special value of the chunk, if it is made of a repeated value
+                    instead of compressed data: 0 means none, 1 zeros, 2 NaNs, 3 a
+                    generic value and 4 uninitialized values.
+                memcpyed: bool
+                    Whether the data is just copied (e.g. because it is incompressible).
+
+        Raises
+        ------
+        RunTimeError
+            If the header of some chunk could not be read.
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> import numpy
+        >>> schunk = blosc2.SChunk(chunksize=1000 * 8, cparams={"typesize": 8, "codec": blosc2.Codec.LZ4})
+        >>> schunk.append_data(numpy.arange(1000, dtype="int64"))
+        1
+        >>> schunk.append_data(numpy.random.default_rng(0).bytes(1000 * 8))
+        2
+        >>> info = schunk.chunk_info()
+        >>> info["nbytes"].tolist(), info["memcpyed"].tolist()
+        ([8000, 8000], [False, True])
+        >>> blosc2.Codec(info["codec"][0])
+        <Codec.LZ4: 1>
+        >>> int(info["cbytes"].sum()) == schunk.cbytes
+        True
+        """
+        return super(SChunk, self).chunk_info()
+
+    def copy(self, **kwargs):
+        """Create a copy of the SChunk with different storage or compression params.
+
+        When the compression params are the same (or not passed), the chunks are
+        copied in compressed form.  Otherwise, the chunks are decompressed and
+        recompressed in parallel, using as many Python threads as the `nthreads`
+        of the new `cparams`.  The metalayers and variable-length metalayers are
+        copied too.
+
+        Other parameters
+        ----------------
+        kwargs: dict, optional
+            Keyword arguments supported:
+
+                contiguous: bool
+                    If the chunks of the copy are stored contiguously or not.
+                    Default is the same as the original SChunk.
+                urlpath: String
+                    If the storage of the copy is persistent, the name of the file (when
+                    `contiguous = True`) or the directory (if `contiguous = False`).
+                    If it already exists, it is overwritten.  Default is `None`, meaning
+                    an in-memory copy.
+                cparams: dict
+                    A dictionary with the compression parameters, which are the same that can be
+                    used in the :func:`~blosc2.compress2` function.  The ones not passed are
+                    the same as in the original SChunk.
+                dparams: dict
+                    A dictionary with the decompression parameters, which are the same that can be
+                    used in the :func:`~blosc2.decompress2` function.  The ones not passed are
+                    the same as in the original SChunk.
+                io: :class:`~blosc2.IOBackend`
+                    The backend for the frame of the copy, like in :func:`~blosc2.SChunk.__init__`.
+
+        Returns
+        -------
+        out: :class:`~blosc2.SChunk`
+            The copy of the SChunk.
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`urlpath` is the one of the original SChunk.
+        RunTimeError
+            If some problem was detected.
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> import numpy
+        >>> data = numpy.arange(200 * 1000 * 4, dtype="int32")
+        >>> schunk = blosc2.SChunk(chunksize=200 * 1000 * 4, data=data, cparams={"typesize": 4})
+        >>> cparams = {"codec": blosc2.Codec.ZSTD, "clevel": 9, "nthreads": 2}
+        >>> schunk2 = schunk.copy(cparams=cparams, contiguous=True)
+        >>> schunk2.get_slice() == schunk.get_slice()
+        True
+        >>> len(schunk2.get_chunk(0)) < len(schunk.get_chunk(0))
+        True
+        """
+        return super(SChunk, self).copy(**kwargs)
+
+    def __reduce_ex__(self, protocol):
+        # The SChunk is pickled as a cframe, so the data is never decompressed.  With protocol 5
+        # the cframe is not copied when pickling and it can be transferred out-of-band.
+        # The new SChunk gets its own copy of the cframe, as it could not be modified otherwise.
+        if protocol >= 5:
+            cframe = pickle.PickleBuffer(self.to_cframe())
+        else:
+            cframe = self.to_cframe(copy=True)
+        return schunk_from_cframe, (cframe, True)
 
     def get_chunk(self, nchunk):
         """Return the compressed chunk that is in the SChunk.
@@ -195,6 +850,12 @@ class SChunk(blosc2_ext.SChunk):
         ------
         RunTimeError
             If some problem is detected.
+
+        Notes
+        -----
+        For SChunks on disk, the whole chunk is read.  Use
+        :func:`~blosc2.SChunk.get_slice` or the `block_mask` parameter of
+        :func:`~blosc2.SChunk.decompress_chunk` for reading just some blocks.
         """
         return super(SChunk, self).get_chunk(nchunk)
 
@@ -315,11 +976,259 @@ class SChunk(blosc2_ext.SChunk):
         blosc2_ext._check_access_mode(self.urlpath, self.mode)
         return super(SChunk, self).update_data(nchunk, data, copy)
 
+    def prefilter(self, input_dtype, output_dtype=None, parallel=False):
+        """Decorator setting a Python function as the prefilter of the SChunk.
+
+        The prefilter is run on every block of the data being compressed (by
+        :func:`~blosc2.SChunk.append_data`, :func:`~blosc2.SChunk.insert_data` or
+        :func:`~blosc2.SChunk.update_data`), right before the filters and the codec.
+        This way, a transformation can be fused into the compression, without an
+        extra pass over the data.  The decorated function is called as
+        ``func(input, output, nchunk, nblock, tid)``, where `input` is a read-only
+        NumPy view of the block of the data passed, `output` is a writable NumPy
+        view of the block that will be compressed instead, `nchunk` is the index
+        of the chunk in the SChunk, `nblock` is the index of the block in the chunk
+        and `tid` is the id of the (C-Blosc2) thread running it.  The views are only
+        valid during the call.
+
+        Parameters
+        ----------
+        input_dtype: numpy.dtype or str
+            The data type of the `input` view.
+        output_dtype: numpy.dtype or str, optional
+            The data type of the `output` view.  It must have the same itemsize than
+            :paramref:`input_dtype`.  Default is :paramref:`input_dtype`.
+        parallel: bool
+            Whether to keep the `nthreads` of the `cparams`.  Default is `False`,
+            meaning that blocks are compressed by a single thread while the
+            prefilter is set, as Python functions are serialized by the GIL
+            anyway.  Use `True` when the function releases the GIL for most of
+            its work (e.g. NumPy ufuncs on large blocks), so that blocks are
+            filtered and compressed in parallel.
+
+        Returns
+        -------
+        out: function
+            The decorator, which sets the prefilter and returns the decorated function
+            unchanged.
+
+        Raises
+        ------
+        ValueError
+            If the itemsizes of :paramref:`input_dtype` and :paramref:`output_dtype` differ.
+
+        Notes
+        -----
+        The prefilter is not stored along with the data, so it is not kept by
+        :func:`~blosc2.SChunk.copy`, :func:`~blosc2.SChunk.to_cframe`, pickling or
+        :func:`~blosc2.open`.  Any exception raised by the function makes the
+        compression fail, and is re-raised by the method that compressed the data.
+
+        See Also
+        --------
+        :func:`~blosc2.SChunk.remove_prefilter`
+        :func:`~blosc2.SChunk.postfilter`
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> import numpy
+        >>> schunk = blosc2.SChunk(chunksize=1000 * 4, cparams={"typesize": 4})
+        >>> @schunk.prefilter(numpy.int32)
+        ... def double(input, output, nchunk, nblock, tid):
+        ...     output[:] = input * 2
+        >>> schunk.append_data(numpy.arange(1000, dtype=numpy.int32))
+        1
+        >>> numpy.frombuffer(schunk.decompress_chunk(0), dtype=numpy.int32)[:3].tolist()
+        [0, 2, 4]
+        """
+        return _block_filter_decorator(self._set_prefilter, input_dtype, output_dtype, parallel)
+
+    def remove_prefilter(self):
+        """Remove the prefilter set with :func:`~blosc2.SChunk.prefilter`, if any."""
+        self._set_prefilter(None)
+
+    def _set_prefilter(self, func, parallel=False):
+        super(SChunk, self)._set_prefilter(func, parallel)
+        self._prefilter_args = None if func is None else (func, parallel)
+
+    def fill_from(self, func, nitems, dtype, parallel=False):
+        """Append :paramref:`nitems` items generated by :paramref:`func` to the SChunk.
+
+        The items are generated block by block, right into the buffers of the
+        compressor (via a prefilter), so that large computed datasets can be
+        stored compressed without materializing them uncompressed in memory.
+        :paramref:`func` is called as ``func(output, offset)``, where `output`
+        is a writable NumPy view of the block to be filled and `offset` is the
+        position of `output[0]` among the :paramref:`nitems` items generated.
+        The view is only valid during the call.  The items are appended in
+        chunks of `chunksize` bytes, and the last one may be smaller.
+
+        Parameters
+        ----------
+        func: function
+            The function generating the items.
+        nitems: int
+            The number of items to generate.
+        dtype: numpy.dtype or str
+            The data type of the items.  The `chunksize` of the SChunk must be a
+            multiple of its itemsize.
+        parallel: bool
+            Whether to generate and compress the blocks with the `nthreads` of
+            the `cparams`, in which case :paramref:`func` must be thread-safe.
+            See :func:`~blosc2.SChunk.prefilter`.  Default is `False`.
+
+        Returns
+        -------
+        out: int
+            The number of chunks in the SChunk.
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`nitems` is not positive, or if the `chunksize` is not a
+            multiple of the itemsize of :paramref:`dtype`.
+        RunTimeError
+            If some problem was detected.
+
+        Notes
+        -----
+        The prefilter set with :func:`~blosc2.SChunk.prefilter` (if any) is not run
+        on the generated items, and it is restored afterwards.
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> import numpy
+        >>> schunk = blosc2.SChunk(chunksize=1000 * 8, cparams={"typesize": 8})
+        >>> def squares(output, offset):
+        ...     output[:] = numpy.arange(offset, offset + len(output)) ** 2
+        >>> schunk.fill_from(squares, 2500, numpy.int64)
+        3
+        >>> numpy.frombuffer(schunk[2000:2003], dtype=numpy.int64).tolist()
+        [4000000, 4004001, 4008004]
+        """
+        blosc2_ext._check_access_mode(self.urlpath, self.mode)
+        import numpy
+
+        dtype = numpy.dtype(dtype)
+        if nitems <= 0:
+            raise ValueError("nitems must be positive")
+        if self.chunksize <= 0 or self.chunksize % dtype.itemsize != 0:
+            raise ValueError("The chunksize must be a multiple of the itemsize of dtype")
+        chunk_nitems = self.chunksize // dtype.itemsize
+        # The input of the prefilter is not used, so any buffer with the size of a chunk will do
+        src = numpy.empty(min(chunk_nitems, nitems), dtype=dtype)
+        start = 0
+
+        def fill(input, output, offset, nchunk, nblock, tid):
+            func(numpy.frombuffer(output, dtype=dtype), start + offset // dtype.itemsize)
+
+        prefilter_args = self._prefilter_args
+        self._set_prefilter(fill, parallel)
+        try:
+            for start in range(0, nitems, chunk_nitems):
+                nchunks = super(SChunk, self).append_data(src[:nitems - start])
+        finally:
+            if prefilter_args is None:
+                self._set_prefilter(None)
+            else:
+                self._set_prefilter(*prefilter_args)
+        return nchunks
+
+    def postfilter(self, input_dtype, output_dtype=None, parallel=False):
+        """Decorator setting a Python function as the postfilter of the SChunk.
+
+        The postfilter is run on every block of the data being decompressed (by
+        :func:`~blosc2.SChunk.decompress_chunk`, :func:`~blosc2.SChunk.get_slice`
+        and indexing), right after the codec and the filters, so that a
+        transformation can be fused into the decompression.  The decorated
+        function is called as ``func(input, output, nchunk, nblock, tid)``, where
+        `input` is a read-only NumPy view of the decompressed block and `output`
+        is a writable NumPy view of the block that will be returned instead.  See
+        :func:`~blosc2.SChunk.prefilter` for the rest of the arguments.
+
+        Parameters
+        ----------
+        input_dtype: numpy.dtype or str
+            The data type of the `input` view.
+        output_dtype: numpy.dtype or str, optional
+            The data type of the `output` view.  It must have the same itemsize than
+            :paramref:`input_dtype`.  Default is :paramref:`input_dtype`.
+        parallel: bool
+            Whether to keep the `nthreads` of the `dparams`.  Default is `False`,
+            meaning that blocks are decompressed by a single thread while the
+            postfilter is set.  See :func:`~blosc2.SChunk.prefilter`.
+
+        Returns
+        -------
+        out: function
+            The decorator, which sets the postfilter and returns the decorated function
+            unchanged.
+
+        Raises
+        ------
+        ValueError
+            If the itemsizes of :paramref:`input_dtype` and :paramref:`output_dtype` differ.
+
+        Notes
+        -----
+        Like the prefilter, the postfilter only applies to this SChunk object.  In
+        particular, :func:`~blosc2.SChunk.get_chunk` returns the chunks as stored.
+
+        See Also
+        --------
+        :func:`~blosc2.SChunk.remove_postfilter`
+        :func:`~blosc2.SChunk.prefilter`
+
+        Examples
+        --------
+        >>> import blosc2
+        >>> import numpy
+        >>> data = numpy.arange(1000, dtype=numpy.int32)
+        >>> schunk = blosc2.SChunk(chunksize=1000 * 4, data=data, cparams={"typesize": 4})
+        >>> @schunk.postfilter(numpy.int32, numpy.float32)
+        ... def half(input, output, nchunk, nblock, tid):
+        ...     output[:] = input / 2
+        >>> numpy.frombuffer(schunk.decompress_chunk(0), dtype=numpy.float32)[:3].tolist()
+        [0.0, 0.5, 1.0]
+        >>> schunk.remove_postfilter()
+        >>> numpy.frombuffer(schunk.decompress_chunk(0), dtype=numpy.int32)[:3].tolist()
+        [0, 1, 2]
+        """
+        set_filter = super(SChunk, self)._set_postfilter
+        return _block_filter_decorator(set_filter, input_dtype, output_dtype, parallel)
+
+    def remove_postfilter(self):
+        """Remove the postfilter set with :func:`~blosc2.SChunk.postfilter`, if any."""
+        super(SChunk, self)._set_postfilter(None)
+
     def __dealloc__(self):
         super(SChunk, self).__dealloc__()
 
 
-def open(urlpath, mode="a", **kwargs):
+def _block_filter_decorator(set_filter, input_dtype, output_dtype, parallel):
+    # Return a decorator that sets, via set_filter(), a filter calling the decorated function
+    # with NumPy views of the block buffers instead of memoryviews
+    import numpy
+
+    input_dtype = numpy.dtype(input_dtype)
+    output_dtype = input_dtype if output_dtype is None else numpy.dtype(output_dtype)
+    if input_dtype.itemsize != output_dtype.itemsize:
+        raise ValueError("The input and output dtypes must have the same itemsize")
+
+    def decorator(func):
+        def block_filter(input, output, offset, nchunk, nblock, tid):
+            func(numpy.frombuffer(input, dtype=input_dtype), numpy.frombuffer(output, dtype=output_dtype),
+                 nchunk, nblock, tid)
+
+        set_filter(block_filter, parallel)
+        return func
+
+    return decorator
+
+
+def open(urlpath, mode="a", mmap=False, **kwargs):
     """Open an already persistently stored :class:`~blosc2.SChunk`.
 
     Parameters
@@ -328,6 +1237,12 @@ def open(urlpath, mode="a", **kwargs):
         The path where the :class:`~blosc2.SChunk` is stored.
     mode: str, optional
         The open mode.
+    mmap: bool, optional
+        Whether to memory-map the frame file instead of reading it with regular
+        file I/O.  Chunks are then decompressed straight from the mapping, without
+        a system call nor a copy per chunk, and the page cache is shared by all
+        the processes mapping the same file.  Only contiguous frames (files) in
+        reading mode (`mode="r"`) can be memory-mapped.  Default is `False`.
 
     Other parameters
     ----------------
@@ -340,6 +1255,14 @@ def open(urlpath, mode="a", **kwargs):
                 dparams: dict
                     A dictionary with the decompression parameters, which are the same that can be
                     used in the :func:`~blosc2.decompress2` function.
+                io: :class:`~blosc2.IOBackend`
+                    The backend for reading and writing the frame (see
+                    :func:`~blosc2.SChunk.__init__`).  It cannot be used with :paramref:`mmap`.
+
+    Returns
+    -------
+    out: :class:`~blosc2.SChunk` or :class:`~blosc2.NDArray`
+        The super-chunk, or the N-dimensional array when the super-chunk contains one.
 
     Examples
     --------
@@ -365,5 +1288,210 @@ def open(urlpath, mode="a", **kwargs):
     True
     True
     True
+    >>> # Memory-map the SChunk
+    >>> sc_mmap = blosc2.open(urlpath=storage["urlpath"], mode="r", mmap=True)
+    >>> sc_mmap.decompress_chunk(0) == schunk.decompress_chunk(0)
+    True
+    >>> blosc2.remove_urlpath(storage["urlpath"])
     """
-    return blosc2_ext.schunk_open(urlpath, mode, **kwargs)
+    if mmap:
+        schunk = blosc2_ext.schunk_open_mmap(urlpath, mode, **kwargs)
+    else:
+        schunk = blosc2_ext.schunk_open(urlpath, mode, **kwargs)
+    from .NDArray import LAYOUT_META, NDArray
+
+    if LAYOUT_META in schunk.meta:
+        return NDArray(schunk)
+    return schunk
+
+
+def schunk_from_cframe(cframe, copy=False):
+    """Create an :class:`~blosc2.SChunk` out of a contiguous frame (cframe).
+
+    Parameters
+    ----------
+    cframe: bytes-like object
+        The cframe (as returned by e.g. :func:`~blosc2.SChunk.to_cframe`) in any
+        object supporting the Python Buffer Protocol.
+    copy: bool
+        Whether the SChunk should get its own copy of the cframe or not.
+        Default is `False`, meaning that the SChunk uses the memory of
+        :paramref:`cframe` directly.  In that case, :paramref:`cframe` is
+        kept alive by the SChunk, and the SChunk cannot be modified (a
+        `BufferError` is raised).
+
+    Returns
+    -------
+    out: :class:`~blosc2.SChunk`
+        A new SChunk containing the data of :paramref:`cframe`.
+
+    Raises
+    ------
+    RunTimeError
+        If :paramref:`cframe` does not contain a valid frame.
+
+    See Also
+    --------
+    :func:`~blosc2.SChunk.to_cframe`
+
+    Examples
+    --------
+    >>> import blosc2
+    >>> import numpy
+    >>> data = numpy.arange(200 * 1000, dtype="int32")
+    >>> schunk = blosc2.SChunk(chunksize=100 * 1000 * 4, data=data)
+    >>> cframe = bytes(schunk.to_cframe())
+    >>> schunk2 = blosc2.schunk_from_cframe(cframe, copy=True)
+    >>> schunk2.append_data(data[:100 * 1000])
+    3
+    """
+    return blosc2_ext.schunk_from_cframe(cframe, copy)
+
+
+class IOBackend:
+    """Base class for the Python I/O backends of :class:`~blosc2.SChunk`.
+
+    A backend is passed as the `io` keyword argument of :class:`~blosc2.SChunk`
+    or :func:`~blosc2.open`, and then the frame is read and written through the
+    file-like objects returned by :meth:`open`, so that it can be persisted
+    anywhere (remote stores, caches, archives...).  Only contiguous super-chunks
+    with an `urlpath` can use a backend.
+
+    This base class just works on local files, and it is meant to be subclassed.
+    When no `io` is passed, C-Blosc2 uses its own (and faster) local file backend.
+
+    Notes
+    -----
+    C-Blosc2 checks that :paramref:`urlpath` exists in the local filesystem
+    before opening a frame, so :func:`~blosc2.open` only works for backends
+    whose frames have a local counterpart (e.g. caches or wrappers of local
+    files).
+    """
+
+    def open(self, urlpath, mode):
+        """Open the frame at :paramref:`urlpath`.
+
+        Parameters
+        ----------
+        urlpath: str
+            The `urlpath` of the super-chunk.
+        mode: str
+            A binary mode of the builtin :func:`open` (`"rb"`, `"rb+"`, `"wb"` or `"ab"`).
+
+        Returns
+        -------
+        out: file-like object
+            An object with the `readinto`, `write`, `seek`, `tell`, `truncate` and
+            `close` methods of the binary files.  The `readinto` and `write`
+            methods get memoryviews that are only valid during the call.
+        """
+        return builtins.open(urlpath, mode)
+
+    def remove(self, urlpath):
+        """Remove the frame at :paramref:`urlpath`, if it exists.
+
+        This is called when creating a super-chunk with `mode="w"`.
+
+        Parameters
+        ----------
+        urlpath: str
+            The `urlpath` of the super-chunk.
+        """
+        blosc2_ext.remove_urlpath(urlpath.encode("utf-8"))
+
+
+class MemoryIO(IOBackend):
+    """An I/O backend keeping the frames in memory, as `bytearray` objects.
+
+    The frames can be loaded back with :func:`~blosc2.schunk_from_cframe`.
+
+    Attributes
+    ----------
+    files: dict
+        The frames, indexed by their `urlpath`.
+
+    Examples
+    --------
+    >>> import blosc2
+    >>> import numpy
+    >>> backend = blosc2.MemoryIO()
+    >>> data = numpy.arange(200 * 1000, dtype="int32")
+    >>> schunk = blosc2.SChunk(chunksize=100 * 1000 * 4, data=data, contiguous=True,
+    ...                        urlpath="frame.b2frame", io=backend)
+    >>> list(backend.files)
+    ['frame.b2frame']
+    >>> schunk2 = blosc2.schunk_from_cframe(backend.files["frame.b2frame"], copy=True)
+    >>> schunk2.decompress_chunk(1) == data[100 * 1000:].tobytes()
+    True
+    """
+
+    def __init__(self):
+        self.files = {}
+
+    def remove(self, urlpath):
+        self.files.pop(urlpath, None)
+
+    def open(self, urlpath, mode):
+        if "w" in mode:
+            self.files[urlpath] = bytearray()
+        elif urlpath not in self.files:
+            if "a" not in mode:
+                raise FileNotFoundError(urlpath)
+            self.files[urlpath] = bytearray()
+        stream = _MemoryFile(self.files[urlpath])
+        if "a" in mode:
+            stream.seek(0, io.SEEK_END)
+        return stream
+
+
+class _MemoryFile(io.RawIOBase):
+    # A binary file working on a bytearray of MemoryIO
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        with memoryview(buffer) as view, memoryview(self.data) as data:
+            nbytes = max(0, min(view.nbytes, len(data) - self.pos))
+            view.cast("B")[:nbytes] = data[self.pos:self.pos + nbytes]
+        self.pos += nbytes
+        return nbytes
+
+    def write(self, buffer):
+        with memoryview(buffer) as view:
+            nbytes = view.nbytes
+            if self.pos > len(self.data):
+                self.data.extend(bytes(self.pos - len(self.data)))
+            self.data[self.pos:self.pos + nbytes] = view
+        self.pos += nbytes
+        return nbytes
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += len(self.data)
+        if offset < 0:
+            raise ValueError("Negative seek position %d" % offset)
+        self.pos = offset
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+    def truncate(self, size=None):
+        size = self.pos if size is None else size
+        if size < len(self.data):
+            del self.data[size:]
+        else:
+            self.data.extend(bytes(size - len(self.data)))
+        return size
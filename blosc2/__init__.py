@@ -40,9 +40,20 @@ class SplitMode(Enum):
     FORWARD_COMPAT_SPLIT = 4
 
 
+class TuneMode(Enum):
+    """
+    Available objectives for the automatic tuning of the compression params (see :class:`Tuner`).
+    """
+
+    SPEED = 0
+    BALANCED = 1
+    RATIO = 2
+
+
 from .blosc2_ext import (
     EXTENDED_HEADER_LENGTH,
     MAX_BUFFERSIZE,
+    MAX_OVERHEAD,
     MAX_TYPESIZE,
     MIN_HEADER_LENGTH,
     VERSION_DATE,
@@ -54,17 +65,24 @@ from .blosc2_ext import (
 
 # Public API for container module
 from .core import (
+    CompressionContext,
+    DecompressionContext,
+    Tuner,
     clib_info,
     compress,
     compress2,
+    compress_many,
     compressor_list,
     decompress,
     decompress2,
+    decompress_many,
     detect_number_of_cores,
+    estimate,
     free_resources,
     get_blocksize,
     get_clib,
     get_compressor,
+    getitem,
     pack,
     pack_array,
     print_versions,
@@ -73,10 +91,12 @@ from .core import (
     set_compressor,
     set_nthreads,
     set_releasegil,
+    train_dict,
     unpack,
     unpack_array,
 )
-from .SChunk import SChunk, open
+from .SChunk import IOBackend, MemoryIO, SChunk, open, schunk_from_cframe
+from .NDArray import NDArray, asarray, empty, full, zeros
 from .version import __version__
 
 blosclib_version = "%s (%s)" % (VERSION_STRING, VERSION_DATE)
@@ -92,6 +112,7 @@ __all__ = [
     "__version__",
     "compress",
     "decompress",
+    "getitem",
     "set_compressor",
     "free_resources",
     "set_nthreads",
@@ -110,6 +131,7 @@ __all__ = [
     "get_blocksize",
     "MAX_TYPESIZE",
     "MAX_BUFFERSIZE",
+    "MAX_OVERHEAD",
     "VERSION_STRING",
     "VERSION_DATE",
     "MIN_HEADER_LENGTH",
@@ -118,8 +140,24 @@ __all__ = [
     "cparams_dflts",
     "decompress2",
     "dparams_dflts",
+    "compress_many",
+    "decompress_many",
+    "CompressionContext",
+    "DecompressionContext",
+    "Tuner",
+    "TuneMode",
+    "train_dict",
+    "estimate",
     "storage_dflts",
     "SChunk",
     "open",
+    "schunk_from_cframe",
     "remove_urlpath",
+    "IOBackend",
+    "MemoryIO",
+    "NDArray",
+    "empty",
+    "zeros",
+    "full",
+    "asarray",
 ]
@@ -0,0 +1,261 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+"""
+Asyncio front-end for compressing and decompressing without blocking the event loop.
+
+The calls are run by a pool of worker threads dedicated to Blosc2 (the GIL is
+released while compressing and decompressing, so they run in parallel), and
+the results for an event loop are all set in a single callback, however many
+calls have finished in the meantime.
+"""
+
+import asyncio
+import collections
+import queue
+import threading
+import weakref
+
+import blosc2
+
+
+class _Completions:
+    # The results of the calls awaited in an event loop, waiting to be set in its futures
+    def __init__(self, loop):
+        # Not a strong reference, so that the loop can be collected once closed
+        self.loop = weakref.ref(loop)
+        self.lock = threading.Lock()
+        self.results = []
+        self.scheduled = False
+
+    def put(self, future, result, exc):
+        with self.lock:
+            self.results.append((future, result, exc))
+            if self.scheduled:
+                # The callback has not run yet, so it will set this result too
+                return
+            self.scheduled = True
+        loop = self.loop()
+        try:
+            if loop is not None:
+                loop.call_soon_threadsafe(self.set_results)
+        except RuntimeError:
+            # The loop is closed, so nobody is awaiting the results
+            pass
+
+    def set_results(self):
+        with self.lock:
+            results, self.results = self.results, []
+            self.scheduled = False
+        for future, result, exc in results:
+            if future.cancelled():
+                continue
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+class _WorkerPool:
+    def __init__(self, nthreads):
+        self.nthreads = 0
+        self.nstarted = 0
+        self.jobs = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.completions = weakref.WeakKeyDictionary()
+        # The jobs waiting for the previous one with the same key to finish (e.g. the appends to a SChunk)
+        self.ordered = {}
+        self.resize(nthreads)
+
+    def resize(self, nthreads):
+        # The threads share the jobs, so the ones submitted are run whatever the number of threads
+        with self.lock:
+            old_nthreads, self.nthreads = self.nthreads, nthreads
+            for _ in range(old_nthreads, nthreads):
+                name = "blosc2-aio-%d" % self.nstarted
+                threading.Thread(target=self._work, name=name, daemon=True).start()
+                self.nstarted += 1
+            # A thread exits when getting None, and the remaining ones go on with the jobs after it
+            for _ in range(nthreads, old_nthreads):
+                self.jobs.put(None)
+        return old_nthreads
+
+    def submit(self, func, args, key=None):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self.lock:
+            completions = self.completions.get(loop)
+            if completions is None:
+                completions = self.completions[loop] = _Completions(loop)
+            job = (func, args, key, future, completions)
+            if key is not None:
+                if key in self.ordered:
+                    self.ordered[key].append(job)
+                    return future
+                self.ordered[key] = collections.deque()
+        self.jobs.put(job)
+        return future
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            func, args, key, future, completions = job
+            # The future is not touched here, but a cancelled call is not worth running
+            if not future.cancelled():
+                try:
+                    completions.put(future, func(*args), None)
+                except BaseException as exc:
+                    completions.put(future, None, exc)
+            if key is not None:
+                with self.lock:
+                    pending = self.ordered[key]
+                    if pending:
+                        self.jobs.put(pending.popleft())
+                    else:
+                        del self.ordered[key]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _submit(func, *args, key=None):
+    # Run func(*args) in the worker pool, returning a future for the current event loop.
+    # The calls with the same key are run one after the other, in the order they were submitted.
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _WorkerPool(blosc2.nthreads)
+    return _pool.submit(func, args, key)
+
+
+def set_nthreads(nthreads):
+    """Set the number of worker threads running the asyncio calls.
+
+    The calls already submitted are run by the new number of threads, and the
+    ones with an order (e.g. :func:`~blosc2.SChunk.aappend_data`) keep it.
+
+    Parameters
+    ----------
+    nthreads: int
+        The number of threads. Default is `blosc2.nthreads`.
+
+    Returns
+    -------
+    out: int
+        The previous number of threads.
+
+    Raises
+    ------
+    ValueError
+        If :paramref:`nthreads` is not positive.
+
+    Examples
+    --------
+    >>> import blosc2.aio
+    >>> oldn = blosc2.aio.set_nthreads(2)
+    >>> oldn = blosc2.aio.set_nthreads(oldn)
+    """
+    global _pool
+    if nthreads < 1:
+        raise ValueError("nthreads must be at least 1")
+    with _pool_lock:
+        if _pool is None:
+            _pool = _WorkerPool(nthreads)
+            return blosc2.nthreads
+        return _pool.resize(nthreads)
+
+
+async def compress2(src, **kwargs):
+    """Compress :paramref:`src` like :func:`~blosc2.compress2`, without blocking the event loop.
+
+    Parameters
+    ----------
+    src: bytes-like object (supporting the buffer interface)
+        The data to be compressed.  It must not be modified until the call is finished.
+    kwargs: dict, optional
+        The compression params, as in :func:`~blosc2.compress2`.  As the calls are
+        already run in parallel, the default `nthreads` is 1.
+
+    Returns
+    -------
+    out: bytes
+        The compressed data in form of a Python bytes object.
+
+    Raises
+    ------
+    RuntimeError
+        If the data cannot be compressed into `dst`.
+        If an internal error occurred, probably because some
+        parameter is not a valid parameter.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> import blosc2.aio
+    >>> import numpy
+    >>> data = numpy.arange(1000 * 1000, dtype="int64")
+    >>> async def roundtrip():
+    ...     chunks = await asyncio.gather(*[blosc2.aio.compress2(data, typesize=8) for _ in range(4)])
+    ...     return await asyncio.gather(*[blosc2.aio.decompress2(chunk) for chunk in chunks])
+    >>> all(out == data.tobytes() for out in asyncio.run(roundtrip()))
+    True
+    """
+    kwargs.setdefault("nthreads", 1)
+    return await _submit(_compress2, src, kwargs)
+
+
+def _compress2(src, kwargs):
+    return blosc2.compress2(src, **kwargs)
+
+
+async def decompress2(src, dst=None, **kwargs):
+    """Decompress :paramref:`src` like :func:`~blosc2.decompress2`, without blocking the event loop.
+
+    Parameters
+    ----------
+    src: bytes-like object
+        The data to be decompressed.
+    dst: NumPy object or bytearray
+        The destination NumPy object or bytearray to fill.  It must not be used
+        until the call is finished.  Default is `None`, meaning that a new
+        bytes object is created, filled and returned.
+    kwargs: dict, optional
+        The decompression params, as in :func:`~blosc2.decompress2`.  As the calls are
+        already run in parallel, the default `nthreads` is 1.
+
+    Returns
+    -------
+    out: str/bytes
+        The decompressed data in form of a Python str / bytes object if
+        :paramref:`dst` is `None`. Otherwise, it will return `None` because the result
+        will already be in :paramref:`dst`.
+
+    Raises
+    ------
+    RuntimeError
+        If an internal error occurred, probably because some
+        parameter is not a valid parameter.
+    ValueError
+        If the decompression failed, or :paramref:`dst` is empty.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> import blosc2.aio
+    >>> c = blosc2.compress2(b"1" * 1000, typesize=1)
+    >>> asyncio.run(blosc2.aio.decompress2(c)) == b"1" * 1000
+    True
+    """
+    kwargs.setdefault("nthreads", 1)
+    return await _submit(_decompress2, src, dst, kwargs)
+
+
+def _decompress2(src, dst, kwargs):
+    return blosc2.decompress2(src, dst, **kwargs)
@@ -8,18 +8,38 @@
 from cpython cimport (
     Py_buffer,
     PyBUF_SIMPLE,
+    PyBuffer_FillInfo,
     PyBuffer_Release,
     PyBytes_FromStringAndSize,
     PyObject_GetBuffer,
 )
+from cpython.exc cimport PyErr_SetObject, PyErr_WriteUnraisable
 from cpython.pycapsule cimport PyCapsule_GetPointer, PyCapsule_New
+from cpython.ref cimport Py_DECREF, Py_INCREF, Py_REFCNT
+from cpython.pythread cimport (
+    WAIT_LOCK,
+    PyThread_acquire_lock,
+    PyThread_allocate_lock,
+    PyThread_free_lock,
+    PyThread_release_lock,
+    PyThread_type_lock,
+)
 from libc.stdint cimport uintptr_t
 from libc.stdlib cimport free, malloc, realloc
+from libc.string cimport memcpy, memset
 from libcpp cimport bool
 
+cimport cython
+
+import io
+import mmap
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
-from msgpack import unpackb
+from msgpack import packb, unpackb
 
 import blosc2
 
@@ -40,6 +60,7 @@ cdef extern from "blosc2.h":
     ctypedef enum:
         BLOSC2_MAX_FILTERS
         BLOSC2_MAX_METALAYERS
+        BLOSC2_METALAYER_NAME_MAXLEN
         BLOSC2_MAX_VLMETALAYERS
         BLOSC2_PREFILTER_INPUTS_MAX
         BLOSC_MAX_CODECS
@@ -50,6 +71,28 @@ cdef extern from "blosc2.h":
         BLOSC_MAX_TYPESIZE
         BLOSC_MIN_BUFFERSIZE
 
+    ctypedef enum:
+        BLOSC_DOSHUFFLE
+        BLOSC_MEMCPYED
+        BLOSC_DOBITSHUFFLE
+
+    ctypedef enum:
+        BLOSC2_CHUNK_FLAGS
+        BLOSC2_CHUNK_TYPESIZE
+        BLOSC2_CHUNK_NBYTES
+        BLOSC2_CHUNK_BLOCKSIZE
+        BLOSC2_CHUNK_CBYTES
+        BLOSC2_CHUNK_FILTER_CODES
+        BLOSC2_CHUNK_FILTER_META
+        BLOSC2_CHUNK_BLOSC2_FLAGS
+
+    ctypedef enum:
+        BLOSC2_SPECIAL_MASK
+
+    ctypedef enum:
+        BLOSC2_USER_REGISTERED_CODECS_START
+        BLOSC_ZSTD_LIB
+
     ctypedef enum:
         BLOSC2_VERSION_STRING
         BLOSC2_VERSION_REVISION
@@ -107,6 +150,8 @@ cdef extern from "blosc2.h":
 
     void blosc2_set_threads_callback(blosc2_threads_callback callback, void *callback_data)
 
+    int16_t blosc2_get_nthreads()
+
     int16_t blosc2_set_nthreads(int16_t nthreads)
 
     const char* blosc1_get_compressor()
@@ -127,7 +172,7 @@ cdef extern from "blosc2.h":
     int blosc2_free_resources()
 
     int blosc2_cbuffer_sizes(const void* cbuffer, int32_t* nbytes,
-                             int32_t* cbytes, int32_t* blocksize)
+                             int32_t* cbytes, int32_t* blocksize) nogil
 
     int blosc1_cbuffer_validate(const void* cbuffer, size_t cbytes, size_t* nbytes)
 
@@ -143,7 +188,7 @@ cdef extern from "blosc2.h":
 
     ctypedef struct blosc2_prefilter_params:
         void* user_data
-        const uint8_t* input
+        const uint8_t* input "in"
         uint8_t* out
         int32_t out_size
         int32_t out_typesize
@@ -157,7 +202,7 @@ cdef extern from "blosc2.h":
 
     ctypedef struct blosc2_postfilter_params:
         void *user_data
-        const uint8_t *input
+        const uint8_t *input "in"
         uint8_t *out
         int32_t size
         int32_t typesize
@@ -202,11 +247,11 @@ cdef extern from "blosc2.h":
 
     blosc2_context* blosc2_create_cctx(blosc2_cparams cparams) nogil
 
-    blosc2_context* blosc2_create_dctx(blosc2_dparams dparams)
+    blosc2_context* blosc2_create_dctx(blosc2_dparams dparams) nogil
 
     void blosc2_free_ctx(blosc2_context * context) nogil
 
-    int blosc2_set_maskout(blosc2_context *ctx, bool *maskout, int nblocks)
+    int blosc2_set_maskout(blosc2_context *ctx, bool *maskout, int nblocks) nogil
 
 
     int blosc2_compress(int clevel, int doshuffle, int32_t typesize,
@@ -214,7 +259,7 @@ cdef extern from "blosc2.h":
                         int32_t destsize) nogil
 
     int blosc2_decompress(const void * src, int32_t srcsize,
-                          void * dest, int32_t destsize)
+                          void * dest, int32_t destsize) nogil
 
     int blosc2_compress_ctx(
             blosc2_context * context, const void * src, int32_t srcsize, void * dest,
@@ -225,7 +270,7 @@ cdef extern from "blosc2.h":
 
     int blosc2_getitem_ctx(blosc2_context* context, const void* src,
                            int32_t srcsize, int start, int nitems, void* dest,
-                           int32_t destsize)
+                           int32_t destsize) nogil
 
 
 
@@ -259,6 +304,27 @@ cdef extern from "blosc2.h":
         uint8_t id
         void* params
 
+    ctypedef void* (*blosc2_open_cb)(const char *urlpath, const char *mode, void *params)
+    ctypedef int (*blosc2_close_cb)(void *stream)
+    ctypedef int64_t (*blosc2_tell_cb)(void *stream)
+    ctypedef int (*blosc2_seek_cb)(void *stream, int64_t offset, int whence)
+    ctypedef int64_t (*blosc2_write_cb)(const void *ptr, int64_t size, int64_t nitems, void *stream)
+    ctypedef int64_t (*blosc2_read_cb)(void *ptr, int64_t size, int64_t nitems, void *stream)
+    ctypedef int (*blosc2_truncate_cb)(void *stream, int64_t size)
+
+    ctypedef struct blosc2_io_cb:
+        uint8_t id
+        blosc2_open_cb open
+        blosc2_close_cb close
+        blosc2_tell_cb tell
+        blosc2_seek_cb seek
+        blosc2_write_cb write
+        blosc2_read_cb read
+        blosc2_truncate_cb truncate
+
+    int blosc2_register_io_cb(const blosc2_io_cb *io_cb)
+    blosc2_io_cb *blosc2_get_io_cb(uint8_t id)
+
 
     ctypedef struct blosc2_schunk:
         uint8_t version
@@ -292,22 +358,23 @@ cdef extern from "blosc2.h":
     blosc2_schunk *blosc2_schunk_copy(blosc2_schunk *schunk, blosc2_storage *storage)
     blosc2_schunk *blosc2_schunk_from_buffer(uint8_t *cframe, int64_t len, bool copy)
     blosc2_schunk *blosc2_schunk_open(const char* urlpath)
+    blosc2_schunk *blosc2_schunk_open_udio(const char* urlpath, const blosc2_io *udio)
 
-    int64_t blosc2_schunk_to_buffer(blosc2_schunk* schunk, uint8_t** cframe, bool* needs_free)
+    int64_t blosc2_schunk_to_buffer(blosc2_schunk* schunk, uint8_t** cframe, bool* needs_free) nogil
     int64_t blosc2_schunk_to_file(blosc2_schunk* schunk, const char* urlpath)
     int64_t blosc2_schunk_free(blosc2_schunk *schunk)
-    int64_t blosc2_schunk_append_chunk(blosc2_schunk *schunk, uint8_t *chunk, bool copy)
-    int64_t blosc2_schunk_update_chunk(blosc2_schunk *schunk, int64_t nchunk, uint8_t *chunk, bool copy)
-    int64_t blosc2_schunk_insert_chunk(blosc2_schunk *schunk, int64_t nchunk, uint8_t *chunk, bool copy)
-    int64_t blosc2_schunk_delete_chunk(blosc2_schunk *schunk, int64_t nchunk)
+    int64_t blosc2_schunk_append_chunk(blosc2_schunk *schunk, uint8_t *chunk, bool copy) nogil
+    int64_t blosc2_schunk_update_chunk(blosc2_schunk *schunk, int64_t nchunk, uint8_t *chunk, bool copy) nogil
+    int64_t blosc2_schunk_insert_chunk(blosc2_schunk *schunk, int64_t nchunk, uint8_t *chunk, bool copy) nogil
+    int64_t blosc2_schunk_delete_chunk(blosc2_schunk *schunk, int64_t nchunk) nogil
 
-    int64_t blosc2_schunk_append_buffer(blosc2_schunk *schunk, void *src, int32_t nbytes)
-    int blosc2_schunk_decompress_chunk(blosc2_schunk *schunk, int64_t nchunk, void *dest, int32_t nbytes)
+    int64_t blosc2_schunk_append_buffer(blosc2_schunk *schunk, void *src, int32_t nbytes) nogil
+    int blosc2_schunk_decompress_chunk(blosc2_schunk *schunk, int64_t nchunk, void *dest, int32_t nbytes) nogil
 
     int blosc2_schunk_get_chunk(blosc2_schunk *schunk, int64_t nchunk, uint8_t ** chunk,
-                                bool *needs_free)
+                                bool *needs_free) nogil
     int blosc2_schunk_get_lazychunk(blosc2_schunk *schunk, int64_t nchunk, uint8_t ** chunk,
-                                    bool *needs_free)
+                                    bool *needs_free) nogil
     int blosc2_schunk_get_cparams(blosc2_schunk *schunk, blosc2_cparams** cparams)
     int blosc2_schunk_get_dparams(blosc2_schunk *schunk, blosc2_dparams** dparams)
     int blosc2_schunk_reorder_offsets(blosc2_schunk *schunk, int64_t *offsets_order)
@@ -338,9 +405,86 @@ cdef extern from "blosc2.h":
     int blosc2_remove_dir(const char *path)
     int blosc2_remove_urlpath(const char *path)
 
+    void blosc2_init()
+
+    ctypedef int(*blosc2_codec_encoder_cb)(const uint8_t *input, int32_t input_len, uint8_t *output,
+                                           int32_t output_len, uint8_t meta, blosc2_cparams *cparams,
+                                           const void *chunk)
+    ctypedef int(*blosc2_codec_decoder_cb)(const uint8_t *input, int32_t input_len, uint8_t *output,
+                                           int32_t output_len, uint8_t meta, blosc2_dparams *dparams,
+                                           const void *chunk)
+    ctypedef struct blosc2_codec:
+        uint8_t compcode
+        char *compname
+        uint8_t complib
+        uint8_t compver
+        blosc2_codec_encoder_cb encoder
+        blosc2_codec_decoder_cb decoder
+
+    int blosc2_register_codec(blosc2_codec *codec)
+
+
+# The ZSTD library is built into C-Blosc2, but its headers are not installed with it
+cdef extern from *:
+    """
+    typedef struct ZSTD_CCtx_s ZSTD_CCtx;
+    typedef struct ZSTD_DCtx_s ZSTD_DCtx;
+    typedef struct ZSTD_CDict_s ZSTD_CDict;
+    typedef struct ZSTD_DDict_s ZSTD_DDict;
+    ZSTD_CCtx* ZSTD_createCCtx(void);
+    size_t ZSTD_freeCCtx(ZSTD_CCtx* cctx);
+    ZSTD_DCtx* ZSTD_createDCtx(void);
+    size_t ZSTD_freeDCtx(ZSTD_DCtx* dctx);
+    ZSTD_CDict* ZSTD_createCDict(const void* dictBuffer, size_t dictSize, int compressionLevel);
+    ZSTD_DDict* ZSTD_createDDict(const void* dictBuffer, size_t dictSize);
+    size_t ZSTD_freeCDict(ZSTD_CDict* cdict);
+    size_t ZSTD_freeDDict(ZSTD_DDict* ddict);
+    size_t ZSTD_compress_usingCDict(ZSTD_CCtx* cctx, void* dst, size_t dstCapacity,
+                                    const void* src, size_t srcSize, const ZSTD_CDict* cdict);
+    size_t ZSTD_decompress_usingDDict(ZSTD_DCtx* dctx, void* dst, size_t dstCapacity,
+                                      const void* src, size_t srcSize, const ZSTD_DDict* ddict);
+    unsigned ZSTD_getDictID_fromFrame(const void* src, size_t srcSize);
+    unsigned ZSTD_isError(size_t code);
+    int ZSTD_maxCLevel(void);
+    size_t ZDICT_trainFromBuffer(void* dictBuffer, size_t dictBufferCapacity, const void* samplesBuffer,
+                                 const size_t* samplesSizes, unsigned nbSamples);
+    unsigned ZDICT_getDictID(const void* dictBuffer, size_t dictSize);
+    unsigned ZDICT_isError(size_t errorCode);
+    const char* ZDICT_getErrorName(size_t errorCode);
+    """
+    ctypedef struct ZSTD_CCtx:
+        pass
+    ctypedef struct ZSTD_DCtx:
+        pass
+    ctypedef struct ZSTD_CDict:
+        pass
+    ctypedef struct ZSTD_DDict:
+        pass
+    ZSTD_CCtx* ZSTD_createCCtx() nogil
+    size_t ZSTD_freeCCtx(ZSTD_CCtx* cctx) nogil
+    ZSTD_DCtx* ZSTD_createDCtx() nogil
+    size_t ZSTD_freeDCtx(ZSTD_DCtx* dctx) nogil
+    ZSTD_CDict* ZSTD_createCDict(const void* dictBuffer, size_t dictSize, int compressionLevel) nogil
+    ZSTD_DDict* ZSTD_createDDict(const void* dictBuffer, size_t dictSize) nogil
+    size_t ZSTD_freeCDict(ZSTD_CDict* cdict) nogil
+    size_t ZSTD_freeDDict(ZSTD_DDict* ddict) nogil
+    size_t ZSTD_compress_usingCDict(ZSTD_CCtx* cctx, void* dst, size_t dstCapacity,
+                                    const void* src, size_t srcSize, const ZSTD_CDict* cdict) nogil
+    size_t ZSTD_decompress_usingDDict(ZSTD_DCtx* dctx, void* dst, size_t dstCapacity,
+                                      const void* src, size_t srcSize, const ZSTD_DDict* ddict) nogil
+    unsigned ZSTD_getDictID_fromFrame(const void* src, size_t srcSize) nogil
+    unsigned ZSTD_isError(size_t code) nogil
+    int ZSTD_maxCLevel() nogil
+    size_t ZDICT_trainFromBuffer(void* dictBuffer, size_t dictBufferCapacity, const void* samplesBuffer,
+                                 const size_t* samplesSizes, unsigned nbSamples) nogil
+    unsigned ZDICT_getDictID(const void* dictBuffer, size_t dictSize)
+    unsigned ZDICT_isError(size_t errorCode)
+    const char* ZDICT_getErrorName(size_t errorCode)
+
 
 MAX_TYPESIZE = BLOSC_MAX_TYPESIZE
 MAX_BUFFERSIZE = BLOSC2_MAX_BUFFERSIZE
+MAX_OVERHEAD = BLOSC2_MAX_OVERHEAD
 VERSION_STRING = (<char*>BLOSC2_VERSION_STRING).decode()
 VERSION_DATE = (<char*>BLOSC2_VERSION_DATE).decode()
 MIN_HEADER_LENGTH = BLOSC_MIN_HEADER_LENGTH
@@ -351,21 +495,72 @@ def _check_comp_length(comp_name, comp_len):
     if comp_len < BLOSC_MIN_HEADER_LENGTH:
         raise ValueError("%s cannot be less than %d bytes" % (comp_name, BLOSC_MIN_HEADER_LENGTH))
 
+# Per-thread caches of contexts for the compress()/decompress() family.  Using
+# them instead of the global C-Blosc2 context makes these functions free of
+# global state (and hence, safe to call from many threads at the same time).
+_thread_contexts = threading.local()
+# Maximum number of cached contexts per thread
+MAX_CACHED_CONTEXTS = 16
+
+
+cdef _thread_context_cache(name):
+    cache = getattr(_thread_contexts, name, None)
+    if cache is None:
+        cache = {}
+        setattr(_thread_contexts, name, cache)
+    return cache
+
+
+cdef CompressionContext _get_thread_cctx(int32_t typesize, int clevel, int filter_, codec):
+    cdef int16_t nthreads = blosc2_get_nthreads()
+    cdef int blocksize = blosc1_get_blocksize()
+    key = (typesize, clevel, filter_, codec.value, nthreads, blocksize)
+    cache = _thread_context_cache("cctxs")
+    cctx = cache.get(key)
+    if cctx is None:
+        if len(cache) >= MAX_CACHED_CONTEXTS:
+            cache.clear()
+        # Mimic the filter pipeline that the global blosc2_compress() builds
+        if filter_ == blosc2.Filter.SHUFFLE.value and typesize > 1:
+            last_filter = blosc2.Filter.SHUFFLE
+        elif filter_ == blosc2.Filter.BITSHUFFLE.value:
+            last_filter = blosc2.Filter.BITSHUFFLE
+        else:
+            last_filter = blosc2.Filter.NOFILTER
+        cctx = CompressionContext(codec=codec, clevel=clevel, typesize=typesize, nthreads=nthreads,
+                                  blocksize=blocksize, filters=[0, 0, 0, 0, 0, last_filter])
+        cache[key] = cctx
+    return cctx
+
+
+cdef DecompressionContext _get_thread_dctx():
+    cdef int16_t nthreads = blosc2_get_nthreads()
+    cache = _thread_context_cache("dctxs")
+    dctx = cache.get(nthreads)
+    if dctx is None:
+        if len(cache) >= MAX_CACHED_CONTEXTS:
+            cache.clear()
+        dctx = DecompressionContext(nthreads=nthreads)
+        cache[nthreads] = dctx
+    return dctx
+
+
 cpdef compress(src, int32_t typesize=8, int clevel=9, filter=blosc2.Filter.SHUFFLE, codec=blosc2.Codec.BLOSCLZ):
-    set_compressor(codec)
-    cdef int32_t len_src = <int32_t> len(src)
+    cdef int filter_ = filter.value if isinstance(filter, Enum) else 0
+    cdef CompressionContext cctx = _get_thread_cctx(typesize, clevel, filter_, codec)
     cdef Py_buffer *buf = <Py_buffer *> malloc(sizeof(Py_buffer))
     PyObject_GetBuffer(src, buf, PyBUF_SIMPLE)
     dest = bytes(buf.len + BLOSC2_MAX_OVERHEAD)
     cdef int32_t len_dest =  <int32_t> len(dest)
     cdef int size
-    cdef int filter_ = filter.value if isinstance(filter, Enum) else 0
+    cdef void *_dest = <void*> <char *> dest
     if RELEASEGIL:
-        _dest = <void*> <char *> dest
         with nogil:
-            size = blosc2_compress(clevel, filter_, <int32_t> typesize, buf.buf, <int32_t> buf.len, _dest, len_dest)
+            size = _compress_ctx(&cctx.cctx, &cctx.cparams, &cctx.srcsize, buf.buf, <int32_t> buf.len,
+                                 _dest, len_dest)
     else:
-        size = blosc2_compress(clevel, filter_, <int32_t> typesize, buf.buf, <int32_t> buf.len, <void*> <char *> dest, len_dest)
+        size = _compress_ctx(&cctx.cctx, &cctx.cparams, &cctx.srcsize, buf.buf, <int32_t> buf.len,
+                             _dest, len_dest)
     PyBuffer_Release(buf)
     free(buf)
     if size > 0:
@@ -380,28 +575,89 @@ def decompress(src, dst=None, as_bytearray=False):
     cdef int32_t blocksize
     cdef const uint8_t[:] typed_view_src
     cdef uint8_t[:] typed_view_dst
+    cdef DecompressionContext dctx = _get_thread_dctx()
 
     mem_view_src = memoryview(src)
     typed_view_src = mem_view_src.cast('B')
     _check_comp_length('src', len(typed_view_src))
     blosc2_cbuffer_sizes(<void*>&typed_view_src[0], &nbytes, &cbytes, &blocksize)
-    if dst is not None:
+    cdef int32_t len_src = <int32_t> len(typed_view_src)
+    cdef void *_src = <void*>&typed_view_src[0]
+    cdef void *_dst
+    cdef int32_t len_dst
+    cdef int size
+    return_dst = dst is None
+    if not return_dst:
         mem_view_dst = memoryview(dst)
         typed_view_dst = mem_view_dst.cast('B')
         if len(typed_view_dst) == 0:
             raise ValueError("The dst length must be greater than 0")
-        size = blosc1_decompress(<void*>&typed_view_src[0], <void*>&typed_view_dst[0], len(typed_view_dst))
+        _dst = <void*>&typed_view_dst[0]
+        len_dst = <int32_t> len(typed_view_dst)
     else:
         dst = PyBytes_FromStringAndSize(NULL, nbytes)
         if dst is None:
             raise RuntimeError("Could not get a bytes object")
-        size = blosc1_decompress(<void*>&typed_view_src[0], <void*> <char *> dst, len(dst))
-        if as_bytearray:
-            dst = bytearray(dst)
-        if size >= 0:
-            return dst
+        _dst = <void*> <char *> dst
+        len_dst = nbytes
+    if RELEASEGIL:
+        with nogil:
+            size = blosc2_decompress_ctx(dctx.dctx, _src, len_src, _dst, len_dst)
+    else:
+        size = blosc2_decompress_ctx(dctx.dctx, _src, len_src, _dst, len_dst)
     if size < 0:
         raise RuntimeError("Cannot decompress")
+    if return_dst:
+        return bytearray(dst) if as_bytearray else dst
+
+
+def getitem(src, start, nitems, dst=None):
+    cdef int32_t nbytes
+    cdef int32_t cbytes
+    cdef int32_t blocksize
+    cdef size_t typesize
+    cdef int flags
+    cdef const uint8_t[:] typed_view_src
+    cdef uint8_t[:] typed_view_dst
+    cdef DecompressionContext dctx = _get_thread_dctx()
+
+    mem_view_src = memoryview(src)
+    typed_view_src = mem_view_src.cast('B')
+    _check_comp_length('src', len(typed_view_src))
+    cdef void *_src = <void*>&typed_view_src[0]
+    blosc2_cbuffer_sizes(_src, &nbytes, &cbytes, &blocksize)
+    blosc1_cbuffer_metainfo(_src, &typesize, &flags)
+    if start < 0 or nitems < 0 or (start + nitems) * typesize > nbytes:
+        raise ValueError("The items requested are out of the bounds of src")
+    cdef int start_ = start
+    cdef int nitems_ = nitems
+    cdef int32_t len_src = <int32_t> len(typed_view_src)
+    cdef int32_t len_dst = <int32_t> (nitems * typesize)
+    cdef void *_dst
+    cdef int size
+    return_dst = dst is None
+    if not return_dst:
+        mem_view_dst = memoryview(dst)
+        typed_view_dst = mem_view_dst.cast('B')
+        if len(typed_view_dst) < len_dst:
+            raise ValueError("The dst length must be at least %d bytes" % len_dst)
+        if len_dst == 0:
+            return None
+        _dst = <void*>&typed_view_dst[0]
+    else:
+        dst = PyBytes_FromStringAndSize(NULL, len_dst)
+        if dst is None:
+            raise RuntimeError("Could not get a bytes object")
+        _dst = <void*> <char *> dst
+    if RELEASEGIL:
+        with nogil:
+            size = blosc2_getitem_ctx(dctx.dctx, _src, len_src, start_, nitems_, _dst, len_dst)
+    else:
+        size = blosc2_getitem_ctx(dctx.dctx, _src, len_src, start_, nitems_, _dst, len_dst)
+    if size < 0:
+        raise RuntimeError("Cannot get the items")
+    if return_dst:
+        return dst
 
 
 def set_compressor(codec):
@@ -413,6 +669,8 @@ def set_compressor(codec):
         return size
 
 def free_resources():
+    # Drop the contexts cached for this thread too
+    _thread_contexts.__dict__.clear()
     rc = blosc2_free_resources()
     if rc < 0:
         raise ValueError("Could not free the resources")
@@ -468,6 +726,333 @@ def get_blocksize():
     """
     return blosc1_get_blocksize()
 
+# Dictionaries for ZSTD.  The chunks compressed with a dictionary use a codec registered on first use,
+# whose meta is the slot of the dictionary (for a given clevel) in _zstd_cdicts; the dictionary for
+# decompressing is found in _zstd_ddicts by the ID in the ZSTD frame.  The slots are counted
+# references, held by the contexts and super-chunks using them (see _ZstdDict) and by the blocks
+# being decompressed, and they are freed (and reused) when not referenced anymore.
+# As the codec is not a C-Blosc2 one, the chunks can only be read back by python-blosc2.
+cdef uint8_t _ZSTD_DICT_CODEC = BLOSC2_USER_REGISTERED_CODECS_START
+# The name of the metalayer keeping the dictionary of a SChunk
+_DICT_META = "b2dict"
+cdef enum:
+    _MAX_ZSTD_DICTS = 256
+
+cdef struct _zstd_dict:
+    # The number of references (0 for a free slot)
+    int64_t refs
+    unsigned dict_id
+    # For compressing, the clevel and the slot in _zstd_ddicts holding the dictionary contents
+    int clevel
+    int dslot
+    ZSTD_CDict *cdict
+    ZSTD_DDict *ddict
+    char *content
+    size_t size
+
+# Protects the slots of both tables
+cdef PyThread_type_lock _zstd_dicts_lock = PyThread_allocate_lock()
+cdef _zstd_dict _zstd_ddicts[_MAX_ZSTD_DICTS]
+cdef _zstd_dict _zstd_cdicts[_MAX_ZSTD_DICTS]
+
+# Pools of ZSTD contexts for the codec, so that they are not created for every block
+cdef PyThread_type_lock _zstd_ctxs_lock = PyThread_allocate_lock()
+cdef ZSTD_CCtx *_zstd_cctxs[64]
+cdef int _nzstd_cctxs = 0
+cdef ZSTD_DCtx *_zstd_dctxs[64]
+cdef int _nzstd_dctxs = 0
+
+
+cdef ZSTD_CCtx* _pop_zstd_cctx() noexcept nogil:
+    global _nzstd_cctxs
+    cdef ZSTD_CCtx *cctx = NULL
+    PyThread_acquire_lock(_zstd_ctxs_lock, WAIT_LOCK)
+    if _nzstd_cctxs > 0:
+        _nzstd_cctxs -= 1
+        cctx = _zstd_cctxs[_nzstd_cctxs]
+    PyThread_release_lock(_zstd_ctxs_lock)
+    return cctx if cctx != NULL else ZSTD_createCCtx()
+
+
+cdef void _push_zstd_cctx(ZSTD_CCtx *cctx) noexcept nogil:
+    global _nzstd_cctxs
+    PyThread_acquire_lock(_zstd_ctxs_lock, WAIT_LOCK)
+    if _nzstd_cctxs < 64:
+        _zstd_cctxs[_nzstd_cctxs] = cctx
+        _nzstd_cctxs += 1
+        cctx = NULL
+    PyThread_release_lock(_zstd_ctxs_lock)
+    if cctx != NULL:
+        ZSTD_freeCCtx(cctx)
+
+
+cdef ZSTD_DCtx* _pop_zstd_dctx() noexcept nogil:
+    global _nzstd_dctxs
+    cdef ZSTD_DCtx *dctx = NULL
+    PyThread_acquire_lock(_zstd_ctxs_lock, WAIT_LOCK)
+    if _nzstd_dctxs > 0:
+        _nzstd_dctxs -= 1
+        dctx = _zstd_dctxs[_nzstd_dctxs]
+    PyThread_release_lock(_zstd_ctxs_lock)
+    return dctx if dctx != NULL else ZSTD_createDCtx()
+
+
+cdef void _push_zstd_dctx(ZSTD_DCtx *dctx) noexcept nogil:
+    global _nzstd_dctxs
+    PyThread_acquire_lock(_zstd_ctxs_lock, WAIT_LOCK)
+    if _nzstd_dctxs < 64:
+        _zstd_dctxs[_nzstd_dctxs] = dctx
+        _nzstd_dctxs += 1
+        dctx = NULL
+    PyThread_release_lock(_zstd_ctxs_lock)
+    if dctx != NULL:
+        ZSTD_freeDCtx(dctx)
+
+
+cdef int _zstd_dict_encoder(const uint8_t *input, int32_t input_len, uint8_t *output, int32_t output_len,
+                            uint8_t meta, blosc2_cparams *cparams, const void *chunk) noexcept nogil:
+    # The slot is referenced by the context compressing, so it cannot be freed meanwhile
+    if _zstd_cdicts[meta].cdict == NULL:
+        return BLOSC2_ERROR_CODEC_DICT
+    cdef ZSTD_CCtx *cctx = _pop_zstd_cctx()
+    if cctx == NULL:
+        return BLOSC2_ERROR_MEMORY_ALLOC
+    cdef size_t size = ZSTD_compress_usingCDict(cctx, output, output_len, input, input_len,
+                                                _zstd_cdicts[meta].cdict)
+    _push_zstd_cctx(cctx)
+    if ZSTD_isError(size):
+        # The block is stored as is then
+        return 0
+    return <int> size
+
+
+cdef int _zstd_dict_decoder(const uint8_t *input, int32_t input_len, uint8_t *output, int32_t output_len,
+                            uint8_t meta, blosc2_dparams *dparams, const void *chunk) noexcept nogil:
+    cdef unsigned dict_id = ZSTD_getDictID_fromFrame(input, input_len)
+    cdef int slot = -1
+    cdef int i
+    PyThread_acquire_lock(_zstd_dicts_lock, WAIT_LOCK)
+    for i in range(_MAX_ZSTD_DICTS):
+        if _zstd_ddicts[i].refs > 0 and _zstd_ddicts[i].dict_id == dict_id:
+            # Referenced while decompressing, in case the last reference is released meanwhile
+            _zstd_ddicts[i].refs += 1
+            slot = i
+            break
+    PyThread_release_lock(_zstd_dicts_lock)
+    if slot < 0:
+        return BLOSC2_ERROR_CODEC_DICT
+    cdef ZSTD_DCtx *dctx = _pop_zstd_dctx()
+    cdef size_t size = 0
+    if dctx != NULL:
+        size = ZSTD_decompress_usingDDict(dctx, output, output_len, input, input_len,
+                                          _zstd_ddicts[slot].ddict)
+        _push_zstd_dctx(dctx)
+    _release_zstd_ddict(slot)
+    if dctx == NULL:
+        return BLOSC2_ERROR_MEMORY_ALLOC
+    if ZSTD_isError(size):
+        return BLOSC2_ERROR_DATA
+    return <int> size
+
+
+cdef bint _zstd_dict_codec_registered = False
+
+
+cdef _register_zstd_dict_codec():
+    global _zstd_dict_codec_registered
+    if _zstd_dict_codec_registered:
+        return
+    cdef blosc2_codec codec
+    codec.compcode = _ZSTD_DICT_CODEC
+    codec.compname = <char*> "zstd_dict"
+    codec.complib = BLOSC_ZSTD_LIB
+    codec.compver = 1
+    codec.encoder = _zstd_dict_encoder
+    codec.decoder = _zstd_dict_decoder
+    # The library must be initialized first, as that resets the registered codecs
+    blosc2_init()
+    if blosc2_register_codec(&codec) < 0:
+        raise RuntimeError("Could not register the codec for ZSTD dictionaries (is its id %d already "
+                           "registered?)" % _ZSTD_DICT_CODEC)
+    _zstd_dict_codec_registered = True
+
+
+cdef void _release_zstd_ddict(int slot) noexcept nogil:
+    cdef ZSTD_DDict *ddict = NULL
+    cdef char *content = NULL
+    PyThread_acquire_lock(_zstd_dicts_lock, WAIT_LOCK)
+    _zstd_ddicts[slot].refs -= 1
+    if _zstd_ddicts[slot].refs == 0:
+        ddict, content = _zstd_ddicts[slot].ddict, _zstd_ddicts[slot].content
+        _zstd_ddicts[slot].ddict = NULL
+        _zstd_ddicts[slot].content = NULL
+    PyThread_release_lock(_zstd_dicts_lock)
+    if ddict != NULL:
+        ZSTD_freeDDict(ddict)
+        free(content)
+
+
+cdef void _release_zstd_cdict(int slot) noexcept nogil:
+    cdef ZSTD_CDict *cdict = NULL
+    cdef int dslot = -1
+    PyThread_acquire_lock(_zstd_dicts_lock, WAIT_LOCK)
+    _zstd_cdicts[slot].refs -= 1
+    if _zstd_cdicts[slot].refs == 0:
+        cdict, dslot = _zstd_cdicts[slot].cdict, _zstd_cdicts[slot].dslot
+        _zstd_cdicts[slot].cdict = NULL
+    PyThread_release_lock(_zstd_dicts_lock)
+    if cdict != NULL:
+        ZSTD_freeCDict(cdict)
+        _release_zstd_ddict(dslot)
+
+
+cdef int _acquire_zstd_ddict(const char *content, size_t size, unsigned dict_id) noexcept nogil:
+    # Reference the slot of the dictionary in _zstd_ddicts (loading it if needed), and return it
+    # (or -1 if there is no free slot, or -2 if the dictionary could not be loaded)
+    cdef int slot = -1
+    cdef int i
+    PyThread_acquire_lock(_zstd_dicts_lock, WAIT_LOCK)
+    for i in range(_MAX_ZSTD_DICTS):
+        if _zstd_ddicts[i].refs > 0 and _zstd_ddicts[i].dict_id == dict_id:
+            slot = i
+            break
+        if slot < 0 and _zstd_ddicts[i].refs == 0:
+            slot = i
+    if slot >= 0 and _zstd_ddicts[slot].refs == 0:
+        _zstd_ddicts[slot].content = <char *> malloc(size)
+        if _zstd_ddicts[slot].content != NULL:
+            memcpy(_zstd_ddicts[slot].content, content, size)
+            _zstd_ddicts[slot].ddict = ZSTD_createDDict(content, size)
+            if _zstd_ddicts[slot].ddict == NULL:
+                free(_zstd_ddicts[slot].content)
+                _zstd_ddicts[slot].content = NULL
+        if _zstd_ddicts[slot].content == NULL:
+            slot = -2
+        else:
+            _zstd_ddicts[slot].dict_id = dict_id
+            _zstd_ddicts[slot].size = size
+    if slot >= 0:
+        _zstd_ddicts[slot].refs += 1
+    PyThread_release_lock(_zstd_dicts_lock)
+    return slot
+
+
+cdef int _acquire_zstd_cdict(int dslot, int clevel) noexcept nogil:
+    # Reference the slot in _zstd_cdicts of the dictionary in the dslot of _zstd_ddicts for clevel
+    # (creating it if needed, which takes over the reference to dslot of the caller), and return it
+    # (or -1 if there is no free slot, or -2 if the dictionary could not be loaded)
+    cdef unsigned dict_id = _zstd_ddicts[dslot].dict_id
+    cdef int slot = -1
+    cdef int i
+    # The same levels than the ones of C-Blosc2 for ZSTD
+    cdef int level = clevel * 2 - 1
+    if clevel >= 9:
+        level = ZSTD_maxCLevel()
+    elif clevel == 8:
+        level = ZSTD_maxCLevel() - 2
+    PyThread_acquire_lock(_zstd_dicts_lock, WAIT_LOCK)
+    for i in range(_MAX_ZSTD_DICTS):
+        if (_zstd_cdicts[i].refs > 0 and _zstd_cdicts[i].dict_id == dict_id
+                and _zstd_cdicts[i].clevel == clevel):
+            slot = i
+            break
+        if slot < 0 and _zstd_cdicts[i].refs == 0:
+            slot = i
+    if slot >= 0 and _zstd_cdicts[slot].refs == 0:
+        _zstd_cdicts[slot].cdict = ZSTD_createCDict(_zstd_ddicts[dslot].content, _zstd_ddicts[dslot].size,
+                                                    level)
+        if _zstd_cdicts[slot].cdict == NULL:
+            slot = -2
+        else:
+            _zstd_cdicts[slot].dict_id = dict_id
+            _zstd_cdicts[slot].clevel = clevel
+            _zstd_cdicts[slot].dslot = dslot
+            dslot = -1
+    if slot >= 0:
+        _zstd_cdicts[slot].refs += 1
+    PyThread_release_lock(_zstd_dicts_lock)
+    if dslot >= 0:
+        # Not taken over by a new slot
+        _release_zstd_ddict(dslot)
+    return slot
+
+
+cdef class _ZstdDict:
+    # A reference to the slot of a ZSTD dictionary in _zstd_cdicts (for compressing) or _zstd_ddicts
+    # (for decompressing), released when freed
+    cdef int slot
+    cdef bint compress
+
+    def __cinit__(self):
+        self.slot = -1
+
+    def __dealloc__(self):
+        if self.slot < 0:
+            return
+        if self.compress:
+            _release_zstd_cdict(self.slot)
+        else:
+            _release_zstd_ddict(self.slot)
+
+
+cdef _ZstdDict _get_zstd_ddict(dict_):
+    # Make a dictionary available for decompressing while the returned reference is alive
+    _register_zstd_dict_codec()
+    content = bytes(dict_)
+    cdef const char *c_content = content
+    cdef size_t size = len(content)
+    cdef unsigned dict_id = ZDICT_getDictID(c_content, size)
+    if dict_id == 0:
+        raise ValueError("The dictionary must be trained with blosc2.train_dict()")
+    cdef _ZstdDict ref = _ZstdDict()
+    with nogil:
+        ref.slot = _acquire_zstd_ddict(c_content, size, dict_id)
+    if ref.slot == -1:
+        raise RuntimeError("Cannot use more than %d dictionaries at the same time" % _MAX_ZSTD_DICTS)
+    elif ref.slot < 0:
+        raise RuntimeError("Could not load the dictionary")
+    return ref
+
+
+cdef _ZstdDict _get_zstd_cdict(dict_, int clevel):
+    # Make a dictionary available for compressing with clevel while the returned reference is alive,
+    # whose slot is the codec meta
+    cdef _ZstdDict dref = _get_zstd_ddict(dict_)
+    cdef int dslot = dref.slot
+    cdef _ZstdDict ref = _ZstdDict()
+    ref.compress = True
+    # The reference to the dictionary is passed on to the new slot
+    dref.slot = -1
+    with nogil:
+        ref.slot = _acquire_zstd_cdict(dslot, clevel)
+    if ref.slot == -1:
+        raise RuntimeError("Cannot use more than %d pairs of dictionaries and clevels at the same time"
+                           % _MAX_ZSTD_DICTS)
+    elif ref.slot < 0:
+        raise RuntimeError("Could not load the dictionary")
+    return ref
+
+
+def train_dict(samples, size):
+    views = [memoryview(sample).cast('B') for sample in samples]
+    data = b"".join(views)
+    cdef const char *c_data = data
+    cdef unsigned nsamples = len(views)
+    cdef size_t *sizes = <size_t*> malloc(max(nsamples, 1) * sizeof(size_t))
+    for i, view in enumerate(views):
+        sizes[i] = view.nbytes
+    cdef size_t capacity = size
+    dict_ = PyBytes_FromStringAndSize(NULL, capacity)
+    cdef char *c_dict = dict_
+    cdef size_t rc
+    with nogil:
+        rc = ZDICT_trainFromBuffer(c_dict, capacity, c_data, sizes, nsamples)
+    free(sizes)
+    if ZDICT_isError(rc):
+        raise RuntimeError("Could not train the dictionary: %s" % ZDICT_getErrorName(rc).decode())
+    return dict_[:rc]
+
+
 # Defaults for compression params
 cparams_dflts = {
         'codec': blosc2.Codec.BLOSCLZ,
@@ -484,7 +1069,8 @@ cparams_dflts = {
         'prefilter': None,
         'preparams': None,
         'udbtune': None,
-        'instr_codec': False
+        'instr_codec': False,
+        'dict': None,
 }
 
 # Defaults for decompression params
@@ -492,7 +1078,8 @@ dparams_dflts = {
     'nthreads': 1,
     'schunk': None,
     'postfilter': None,
-    'postparams': None
+    'postparams': None,
+    'dict': None,
 }
 
 cdef create_cparams_from_kwargs(blosc2_cparams *cparams, kwargs):
@@ -506,6 +1093,14 @@ cdef create_cparams_from_kwargs(blosc2_cparams *cparams, kwargs):
     cparams.blocksize = kwargs.get('blocksize', cparams_dflts['blocksize'])
     splitmode = kwargs.get('splitmode', cparams_dflts['splitmode'])
     cparams.splitmode = splitmode.value
+    dict_ = kwargs.get('dict', cparams_dflts['dict'])
+    dict_ref = None
+    if dict_ is not None:
+        if codec != blosc2.Codec.ZSTD:
+            raise ValueError("Dictionaries can only be used with the ZSTD codec")
+        dict_ref = _get_zstd_cdict(dict_, cparams.clevel)
+        cparams.compcode = _ZSTD_DICT_CODEC
+        cparams.compcode_meta = (<_ZstdDict> dict_ref).slot
     # TODO: support the commented ones in the future
     #schunk_c = kwargs.get('schunk', cparams_dflts['schunk'])
     #cparams.schunk = <void *> schunk_c
@@ -533,11 +1128,62 @@ cdef create_cparams_from_kwargs(blosc2_cparams *cparams, kwargs):
     #cparams.preparams = kwargs.get('preparams', cparams_dflts['preparams'])
     #cparams.udbtune = kwargs.get('udbtune', cparams_dflts['udbtune'])
     #cparams.instr_codec = kwargs.get('instr_codec', cparams_dflts['instr_codec'])
+    # The dictionary is only available while this reference is kept
+    return dict_ref
+
+
+cdef dict _cparams_to_dict(blosc2_cparams *cparams):
+    # The inverse of create_cparams_from_kwargs()
+    codec, codec_meta, dict_ = cparams.compcode, cparams.compcode_meta, None
+    cdef _zstd_dict *ddict
+    if codec == _ZSTD_DICT_CODEC and _zstd_cdicts[codec_meta].cdict != NULL:
+        codec, codec_meta = blosc2.Codec.ZSTD.value, 0
+        # The slot is referenced by the owner of cparams
+        ddict = &_zstd_ddicts[_zstd_cdicts[cparams.compcode_meta].dslot]
+        dict_ = PyBytes_FromStringAndSize(ddict.content, ddict.size)
+    return {
+        'codec': blosc2.Codec(codec),
+        'codec_meta': codec_meta,
+        'clevel': cparams.clevel,
+        'use_dict': cparams.use_dict != 0,
+        'typesize': cparams.typesize,
+        'nthreads': cparams.nthreads,
+        'blocksize': cparams.blocksize,
+        # The splitmode is not stored in frames
+        'splitmode': (blosc2.SplitMode(cparams.splitmode) if cparams.splitmode != 0
+                      else cparams_dflts['splitmode']),
+        'filters': [blosc2.Filter(cparams.filters[i]) for i in range(BLOSC2_MAX_FILTERS)],
+        'filters_meta': [cparams.filters_meta[i] for i in range(BLOSC2_MAX_FILTERS)],
+        'dict': dict_,
+    }
+
+
+cdef _tuned_cctx(dict cctxs, dict cparams, dict tuned):
+    # A compression context for cparams updated with the ones chosen by a tuner, cached in cctxs
+    key = (tuned["codec"], tuned["clevel"], tuple(tuned["filters"]), tuple(tuned["filters_meta"]))
+    cctx = cctxs.get(key)
+    if cctx is None:
+        cctx = cctxs[key] = blosc2.CompressionContext(**dict(cparams, **tuned))
+    return cctx
+
+
+cdef bint _same_chunk_format(blosc2_cparams *cparams1, blosc2_cparams *cparams2):
+    # Whether chunks compressed with cparams1 would be like the ones compressed with cparams2
+    # (the splitmode is not taken into account, as it is not stored in frames)
+    if (cparams1.compcode != cparams2.compcode or cparams1.compcode_meta != cparams2.compcode_meta
+            or cparams1.clevel != cparams2.clevel or cparams1.use_dict != cparams2.use_dict
+            or cparams1.typesize != cparams2.typesize or cparams1.blocksize != cparams2.blocksize):
+        return False
+    for i in range(BLOSC2_MAX_FILTERS):
+        if (cparams1.filters[i] != cparams2.filters[i]
+                or cparams1.filters_meta[i] != cparams2.filters_meta[i]):
+            return False
+    return True
 
 
 def compress2(src, **kwargs):
     cdef blosc2_cparams cparams
-    create_cparams_from_kwargs(&cparams, kwargs)
+    dict_ref = create_cparams_from_kwargs(&cparams, kwargs)
 
     cdef blosc2_context *cctx
     cdef Py_buffer *buf = <Py_buffer *> malloc(sizeof(Py_buffer))
@@ -565,18 +1211,52 @@ cdef create_dparams_from_kwargs(blosc2_dparams *dparams, kwargs):
     dparams.schunk = NULL
     dparams.postfilter = NULL
     dparams.postparams = NULL
+    dict_ = kwargs.get('dict', dparams_dflts['dict'])
     # TODO: support the next ones in the future
     #dparams.schunk = kwargs.get('schunk', dparams_dflts['schunk'])
     #dparams.postfilter = kwargs.get('postfilter', dparams_dflts['postfilter'])
     #dparams.postparams = kwargs.get('postparams', dparams_dflts['postparams'])
-
-def decompress2(src, dst=None, **kwargs):
+    # The dictionary is only available while this reference is kept
+    return _get_zstd_ddict(dict_) if dict_ is not None else None
+
+cdef _get_maskout(maskout, int32_t nbytes, int32_t blocksize):
+    # Return a bytes view of maskout after checking it has one item per block
+    cdef const uint8_t[:] typed_view_mask
+    try:
+        mem_view_mask = memoryview(maskout)
+    except TypeError:
+        mem_view_mask = memoryview(bytes([1 if m else 0 for m in maskout]))
+    if mem_view_mask.ndim != 1 or mem_view_mask.itemsize != 1:
+        raise ValueError("The mask must be a 1-dim array of bools")
+    typed_view_mask = mem_view_mask.cast('B')
+    if blocksize > 0:
+        nblocks = nbytes // blocksize + (nbytes % blocksize > 0)
+        if typed_view_mask.shape[0] != nblocks:
+            raise ValueError(f"The mask has {typed_view_mask.shape[0]} items, "
+                             f"but the chunk has {nblocks} blocks")
+    elif typed_view_mask.shape[0] == 0:
+        raise ValueError("The mask cannot be empty")
+    return typed_view_mask
+
+
+@cython.cdivision(True)
+cdef void _zero_masked_blocks(uint8_t *dest, const uint8_t *maskout, int nblocks,
+                              int32_t nbytes, int32_t blocksize) noexcept nogil:
+    # Masked blocks are not written at all, so zero them when dest has been freshly allocated
+    cdef int32_t start
+    cdef int i
+    for i in range(nblocks):
+        if maskout[i]:
+            start = i * blocksize
+            memset(dest + start, 0, min(blocksize, nbytes - start))
+
+
+def decompress2(src, dst=None, maskout=None, **kwargs):
     cdef blosc2_dparams dparams
     cdef char *dst_buf
     cdef void *view
-    create_dparams_from_kwargs(&dparams, kwargs)
+    dict_ref = create_dparams_from_kwargs(&dparams, kwargs)
 
-    cdef blosc2_context *dctx = blosc2_create_dctx(dparams)
     cdef const uint8_t[:] typed_view_src
     mem_view_src = memoryview(src)
     typed_view_src = mem_view_src.cast('B')
@@ -585,30 +1265,543 @@ def decompress2(src, dst=None, **kwargs):
     cdef int32_t cbytes
     cdef int32_t blocksize
     blosc2_cbuffer_sizes(<void*>&typed_view_src[0], &nbytes, &cbytes, &blocksize)
+    cdef const uint8_t[:] typed_view_mask
+    cdef const uint8_t *mask = NULL
+    cdef int nblocks = 0
+    if maskout is not None:
+        typed_view_mask = _get_maskout(maskout, nbytes, blocksize)
+        mask = &typed_view_mask[0]
+        nblocks = typed_view_mask.shape[0]
     cdef uint8_t[:] typed_view_dst
-    if dst is not None:
+    cdef bint return_dst = dst is None
+    cdef int size
+    if not return_dst:
         mem_view_dst = memoryview(dst)
         typed_view_dst = mem_view_dst.cast('B')
         if len(typed_view_dst) == 0:
             raise ValueError("The dst length must be greater than 0")
         dst_buf = <char*>&typed_view_dst[0]
-        view = <void*>&typed_view_src[0]
-        with nogil:
-            size = blosc2_decompress_ctx(dctx, view, cbytes, <void*>dst_buf, nbytes)
-            blosc2_free_ctx(dctx)
     else:
         dst = PyBytes_FromStringAndSize(NULL, nbytes)
         if dst is None:
             raise RuntimeError("Could not get a bytes object")
         dst_buf = <char*>dst
-        view = <void*>&typed_view_src[0]
-        with nogil:
-            size = blosc2_decompress_ctx(dctx, view, cbytes, <void*>dst_buf, nbytes)
-            blosc2_free_ctx(dctx)
+    view = <void*>&typed_view_src[0]
+    cdef blosc2_context *dctx = blosc2_create_dctx(dparams)
+    with nogil:
+        size = 0
+        if mask != NULL:
+            size = blosc2_set_maskout(dctx, <bool*>mask, nblocks)
         if size >= 0:
-            return dst
+            size = blosc2_decompress_ctx(dctx, view, cbytes, <void*>dst_buf, nbytes)
+        blosc2_free_ctx(dctx)
+        if size >= 0 and return_dst and mask != NULL:
+            _zero_masked_blocks(<uint8_t*>dst_buf, mask, nblocks, nbytes, blocksize)
     if size < 0:
         raise ValueError("Error while decompressing, check the src data and/or the dparams")
+    if return_dst:
+        return dst
+
+
+cdef int64_t _compress_items(blosc2_context **cctx, blosc2_cparams *cparams, int32_t *last_srcsize,
+                             uint8_t **srcs, int64_t *sizes, uint8_t *dest, int64_t destsize,
+                             int64_t *csizes, int64_t start, int64_t stop) noexcept nogil:
+    # Compress the items from start to stop one after the other into dest, while the next one fits
+    # in the worst case, returning the first item not compressed (or -1 - the item that failed)
+    cdef int64_t offset = 0
+    cdef int64_t i
+    for i in range(start, stop):
+        if offset + sizes[i] + BLOSC2_MAX_OVERHEAD > destsize:
+            break
+        csizes[i] = _compress_ctx(cctx, cparams, last_srcsize, srcs[i], <int32_t> sizes[i], dest + offset,
+                                  <int32_t> (sizes[i] + BLOSC2_MAX_OVERHEAD))
+        if csizes[i] <= 0:
+            return -1 - i
+        offset += csizes[i]
+    else:
+        i = stop
+    return i
+
+
+cdef int64_t _decompress_items(blosc2_dparams *dparams, uint8_t **srcs, int64_t *sizes, uint8_t **dests,
+                               int64_t *nbytes, int64_t start, int64_t stop) noexcept nogil:
+    # Like _compress_items, but for decompressing
+    cdef blosc2_context *dctx = blosc2_create_dctx(dparams[0])
+    cdef int64_t i
+    for i in range(start, stop):
+        if (blosc2_decompress_ctx(dctx, srcs[i], <int32_t> sizes[i], dests[i], <int32_t> nbytes[i])
+                != nbytes[i]):
+            blosc2_free_ctx(dctx)
+            return i
+    blosc2_free_ctx(dctx)
+    return -1
+
+
+cdef class _Items:
+    # The addresses and sizes of a sequence of buffers, or of the slices of one buffer
+    # between consecutive offsets, which are kept alive (and the buffers exported) meanwhile
+    cdef Py_buffer *bufs
+    cdef int64_t nbufs
+    cdef uint8_t **ptrs
+    cdef int64_t *sizes
+    cdef readonly int64_t n
+
+    def __cinit__(self, srcs, offsets):
+        cdef int64_t i
+        cdef const int64_t[:] typed_offsets
+        if offsets is None:
+            srcs = list(srcs)
+            self.n = len(srcs)
+        else:
+            import numpy
+            offsets = numpy.ascontiguousarray(offsets, dtype=numpy.int64)
+            if offsets.ndim != 1 or len(offsets) == 0:
+                raise ValueError("offsets must be a 1-dim sequence with the start of every item, "
+                                 "plus the end")
+            self.n = len(offsets) - 1
+        self.bufs = <Py_buffer *> malloc(max(self.n, 1) * sizeof(Py_buffer))
+        self.ptrs = <uint8_t **> malloc(max(self.n, 1) * sizeof(uint8_t *))
+        self.sizes = <int64_t *> malloc(max(self.n, 1) * sizeof(int64_t))
+        if offsets is None:
+            for i in range(self.n):
+                PyObject_GetBuffer(srcs[i], &self.bufs[i], PyBUF_SIMPLE)
+                self.nbufs += 1
+                self.ptrs[i] = <uint8_t *> self.bufs[i].buf
+                self.sizes[i] = self.bufs[i].len
+            return
+        PyObject_GetBuffer(srcs, &self.bufs[0], PyBUF_SIMPLE)
+        self.nbufs = 1
+        typed_offsets = offsets
+        if typed_offsets[0] < 0 or typed_offsets[self.n] > self.bufs[0].len:
+            raise ValueError("The offsets must be within the %d bytes of srcs" % self.bufs[0].len)
+        for i in range(self.n):
+            if typed_offsets[i + 1] < typed_offsets[i]:
+                raise ValueError("The offsets must not decrease")
+            self.ptrs[i] = <uint8_t *> self.bufs[0].buf + typed_offsets[i]
+            self.sizes[i] = typed_offsets[i + 1] - typed_offsets[i]
+
+    def __dealloc__(self):
+        cdef int64_t i
+        for i in range(self.nbufs):
+            PyBuffer_Release(&self.bufs[i])
+        free(self.bufs)
+        free(self.ptrs)
+        free(self.sizes)
+
+
+cdef list _run_in_groups(run, int64_t n, int nthreads):
+    # Run run(start, stop) over the n items in groups, so that the threads are balanced even
+    # if the items differ in size, but the GIL is taken once per group.  Return the results
+    # of every group, in order.
+    if nthreads < 1:
+        raise ValueError("nthreads must be at least 1")
+    if n == 0:
+        return []
+    if nthreads == 1 or n == 1:
+        return [run(0, n)]
+    cdef int64_t group = max(1, n // (nthreads * 8))
+    starts = range(0, n, group)
+    with ThreadPoolExecutor(max_workers=min(nthreads, len(starts))) as executor:
+        return list(executor.map(run, starts, [min(start + group, n) for start in starts]))
+
+
+cdef _packed_offsets(int64_t *sizes, int64_t n):
+    # The offsets of n items of the given sizes, one after the other, plus the end
+    import numpy
+    offsets = numpy.empty(n + 1, dtype=numpy.int64)
+    cdef int64_t[:] typed_offsets = offsets
+    cdef int64_t i
+    typed_offsets[0] = 0
+    for i in range(n):
+        typed_offsets[i + 1] = typed_offsets[i] + sizes[i]
+    return offsets
+
+
+def compress_many(srcs, offsets=None, packed=False, **kwargs):
+    cdef _Items items = _Items(srcs, offsets)
+    cdef int64_t n = items.n
+    # The threads go over the items, so every item is compressed with no threads of its own
+    nthreads = kwargs.get('nthreads', cparams_dflts['nthreads'])
+    cdef blosc2_cparams cparams
+    dict_ref = create_cparams_from_kwargs(&cparams, dict(kwargs, nthreads=1))
+    cdef int64_t i
+    cdef int64_t maxsize = 0
+    for i in range(n):
+        maxsize = max(maxsize, items.sizes[i])
+    if maxsize > BLOSC2_MAX_BUFFERSIZE:
+        raise ValueError("The items cannot be larger than %d bytes" % BLOSC2_MAX_BUFFERSIZE)
+    # Every thread compresses into a scratch buffer of its own, which is reused for all its items
+    # (so that the memory used does not depend on their number), and copied out when full
+    cdef int64_t scratch_size = max(2 ** 22, maxsize + BLOSC2_MAX_OVERHEAD)
+    local = threading.local()
+    cdef int64_t *csizes = <int64_t *> malloc(max(n, 1) * sizeof(int64_t))
+    cdef uintptr_t cparams_ = <uintptr_t> &cparams
+    cdef uintptr_t csizes_ = <uintptr_t> csizes
+
+    def compress(int64_t start, int64_t stop):
+        cdef uint8_t[:] scratch
+        cdef int64_t *csizes = <int64_t *> csizes_
+        cdef int64_t next_
+        cdef int64_t offset
+        cdef int64_t i
+        # A single context for the whole group
+        cdef blosc2_context *cctx = blosc2_create_cctx((<blosc2_cparams *> cparams_)[0])
+        cdef int32_t last_srcsize = -1
+        if cctx == NULL:
+            raise RuntimeError("Could not create the compression context")
+        if not hasattr(local, "scratch"):
+            local.scratch = bytearray(scratch_size)
+        scratch = local.scratch
+        out = []
+        try:
+            while start < stop:
+                with nogil:
+                    next_ = _compress_items(&cctx, <blosc2_cparams *> cparams_, &last_srcsize, items.ptrs,
+                                            items.sizes, &scratch[0], scratch_size, csizes, start, stop)
+                if next_ < 0:
+                    raise RuntimeError("Could not compress the item %d" % (-1 - next_))
+                offset = 0
+                for i in range(start, next_):
+                    if not packed:
+                        out.append(PyBytes_FromStringAndSize(<char *> &scratch[offset], csizes[i]))
+                    offset += csizes[i]
+                if packed:
+                    out.append(PyBytes_FromStringAndSize(<char *> &scratch[0], offset))
+                start = next_
+        finally:
+            blosc2_free_ctx(cctx)
+        return out
+
+    try:
+        groups = _run_in_groups(compress, n, nthreads)
+        if not packed:
+            return [chunk for group in groups for chunk in group]
+        return b"".join([blob for group in groups for blob in group]), _packed_offsets(csizes, n)
+    finally:
+        free(csizes)
+
+
+def decompress_many(srcs, offsets=None, packed=False, **kwargs):
+    cdef _Items items = _Items(srcs, offsets)
+    cdef int64_t n = items.n
+    nthreads = kwargs.get('nthreads', dparams_dflts['nthreads'])
+    cdef blosc2_dparams dparams
+    dict_ref = create_dparams_from_kwargs(&dparams, dict(kwargs, nthreads=1))
+    cdef int64_t i
+    cdef int32_t nbytes
+    cdef int32_t cbytes
+    cdef int32_t blocksize
+    for i in range(n):
+        if items.sizes[i] < BLOSC_MIN_HEADER_LENGTH:
+            raise ValueError("The item %d cannot be less than %d bytes" % (i, BLOSC_MIN_HEADER_LENGTH))
+
+    cdef uint8_t **dests = <uint8_t **> malloc(max(n, 1) * sizeof(uint8_t *))
+    cdef int64_t *sizes = <int64_t *> malloc(max(n, 1) * sizeof(int64_t))
+    cdef char *packed_dest
+    cdef uintptr_t dparams_ = <uintptr_t> &dparams
+    cdef uintptr_t dests_ = <uintptr_t> dests
+    cdef uintptr_t sizes_ = <uintptr_t> sizes
+
+    def decompress(int64_t start, int64_t stop):
+        cdef int64_t failed
+        with nogil:
+            failed = _decompress_items(<blosc2_dparams *> dparams_, items.ptrs, items.sizes,
+                                       <uint8_t **> dests_, <int64_t *> sizes_, start, stop)
+        if failed >= 0:
+            raise ValueError("Error while decompressing the item %d, check the src data and/or the dparams"
+                             % failed)
+
+    try:
+        for i in range(n):
+            blosc2_cbuffer_sizes(items.ptrs[i], &nbytes, &cbytes, &blocksize)
+            if cbytes > items.sizes[i]:
+                raise ValueError("The item %d is shorter than its compressed size" % i)
+            sizes[i] = nbytes
+        if packed:
+            offsets = _packed_offsets(sizes, n)
+            dest = PyBytes_FromStringAndSize(NULL, offsets[n])
+            if dest is None:
+                raise RuntimeError("Could not get a bytes object")
+            packed_dest = <char *> dest
+            for i in range(n):
+                dests[i] = <uint8_t *> packed_dest + <int64_t> offsets[i]
+        else:
+            dest = [PyBytes_FromStringAndSize(NULL, sizes[i]) for i in range(n)]
+            for i in range(n):
+                dests[i] = <uint8_t *> <char *> dest[i]
+        _run_in_groups(decompress, n, nthreads)
+        return (dest, offsets) if packed else dest
+    finally:
+        free(dests)
+        free(sizes)
+
+
+cdef class _BlockFilter:
+    # A Python callable run by C-Blosc2 as a prefilter or postfilter on every block, as
+    # func(input, output, offset, nchunk, nblock, tid), with input and output exposing the block
+    # buffers and offset being the position (in bytes) of the block in the chunk.
+    # The first exception raised by func is kept in error, and makes the (de)compression fail.
+    cdef object func
+    cdef object error
+    # When >= 0, the nchunk passed to func instead of the one reported by C-Blosc2
+    cdef int64_t nchunk
+    cdef blosc2_prefilter_params preparams
+    cdef blosc2_postfilter_params postparams
+
+    def __cinit__(self, func):
+        self.func = func
+        self.error = None
+        self.nchunk = -1
+        memset(&self.preparams, 0, sizeof(self.preparams))
+        memset(&self.postparams, 0, sizeof(self.postparams))
+        self.preparams.user_data = <void*> self
+        self.postparams.user_data = <void*> self
+
+    cdef raise_error(self):
+        # Raise (and forget) the exception that made the last (de)compression fail, if any
+        error = self.error
+        if error is not None:
+            self.error = None
+            raise error
+
+
+cdef class _BlockBuffer:
+    # Exposes a block through the buffer protocol while a filter (or an I/O callback) runs on it
+    cdef uint8_t *block
+    cdef int64_t size
+    cdef bint readonly
+    cdef int nexports
+
+    def __getbuffer__(self, Py_buffer *buffer, int flags):
+        if self.block == NULL:
+            raise BufferError("The block is only available during the callback")
+        PyBuffer_FillInfo(buffer, self, self.block, self.size, self.readonly, flags)
+        self.nexports += 1
+
+    def __releasebuffer__(self, Py_buffer *buffer):
+        self.nexports -= 1
+
+    cdef bint release(self):
+        # Make the block unavailable, and return whether it was still in use
+        self.block = NULL
+        return self.nexports > 0 or Py_REFCNT(self) > 1
+
+
+cdef _BlockBuffer _new_block_buffer(const uint8_t *block, int64_t size, bint readonly):
+    cdef _BlockBuffer buffer = _BlockBuffer.__new__(_BlockBuffer)
+    buffer.block = <uint8_t*> block
+    buffer.size = size
+    buffer.readonly = readonly
+    return buffer
+
+
+cdef int _run_block_filter(void *user_data, const uint8_t *input, uint8_t *out, int32_t size,
+                           int32_t offset, int64_t nchunk, int32_t nblock, int32_t tid) noexcept with gil:
+    # This may run in a thread of C-Blosc2, hence acquiring the GIL
+    cdef _BlockFilter filter_ = <_BlockFilter> user_data
+    cdef _BlockBuffer input_buffer
+    cdef _BlockBuffer output_buffer
+    if filter_.error is not None:
+        # Another block already failed
+        return -1
+    if filter_.nchunk >= 0:
+        nchunk = filter_.nchunk
+    try:
+        input_buffer = _new_block_buffer(input, size, True)
+        output_buffer = _new_block_buffer(out, size, False)
+        filter_.func(input_buffer, output_buffer, offset, nchunk, nblock, tid)
+        # The blocks cannot be accessed after the call, so no views of them can be kept
+        if input_buffer.release() | output_buffer.release():
+            raise BufferError("The block views cannot be kept after the filter returns")
+    except BaseException as exc:
+        filter_.error = exc
+        return -1
+    return 0
+
+
+cdef int _prefilter_trampoline(blosc2_prefilter_params *params) noexcept nogil:
+    return _run_block_filter(params.user_data, params.input, params.out, params.out_size,
+                             params.out_offset, params.nchunk, params.nblock, params.tid)
+
+
+cdef int _postfilter_trampoline(blosc2_postfilter_params *params) noexcept nogil:
+    return _run_block_filter(params.user_data, params.input, params.out, params.size,
+                             params.offset, params.nchunk, params.nblock, params.tid)
+
+
+cdef int _compress_ctx(blosc2_context **cctx, blosc2_cparams *cparams, int32_t *last_srcsize,
+                       const void *src, int32_t srcsize, void *dest, int32_t destsize) noexcept nogil:
+    # Compress with cctx[0], created from cparams.  A context keeps the blocksize computed for the last
+    # buffer (and C-Blosc2 cannot reset it), which is only right for a buffer of the same size, unless
+    # a blocksize was given and the last buffer was not smaller than it (so it was not cut down).
+    # Hence the context is created again for a buffer of another size when needed.
+    cdef blosc2_context *new_cctx
+    cdef int32_t last = last_srcsize[0]
+    if last >= 0 and last != srcsize and (cparams.blocksize == 0 or last < cparams.blocksize
+                                          or last < cparams.typesize):
+        new_cctx = blosc2_create_cctx(cparams[0])
+        if new_cctx == NULL:
+            return BLOSC2_ERROR_MEMORY_ALLOC
+        blosc2_free_ctx(cctx[0])
+        cctx[0] = new_cctx
+    last_srcsize[0] = srcsize
+    return blosc2_compress_ctx(cctx[0], src, srcsize, dest, destsize)
+
+
+cdef class CompressionContext:
+    cdef blosc2_context *cctx
+    cdef PyThread_type_lock lock
+    cdef blosc2_cparams cparams
+    # The size of the last buffer compressed, or -1 if none
+    cdef int32_t srcsize
+    # The reference to the ZSTD dictionary of cparams (if any)
+    cdef object _dict
+
+    def __init__(self, **kwargs):
+        self._dict = create_cparams_from_kwargs(&self.cparams, kwargs)
+        self.cctx = blosc2_create_cctx(self.cparams)
+        if self.cctx == NULL:
+            raise RuntimeError("Could not create the compression context")
+        self.srcsize = -1
+        self.lock = PyThread_allocate_lock()
+        if self.lock == NULL:
+            raise MemoryError("Could not allocate the context lock")
+
+    def compress(self, src):
+        cdef Py_buffer *buf = <Py_buffer *> malloc(sizeof(Py_buffer))
+        PyObject_GetBuffer(src, buf, PyBUF_SIMPLE)
+        cdef int size
+        cdef int32_t len_dest = <int32_t> (buf.len + BLOSC2_MAX_OVERHEAD)
+        dest = PyBytes_FromStringAndSize(NULL, len_dest)
+        if dest is None:
+            PyBuffer_Release(buf)
+            free(buf)
+            raise RuntimeError("Could not get a bytes object")
+        cdef void *_dest = <void*> <char *> dest
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            size = _compress_ctx(&self.cctx, &self.cparams, &self.srcsize, buf.buf, <int32_t> buf.len,
+                                 _dest, len_dest)
+            PyThread_release_lock(self.lock)
+        PyBuffer_Release(buf)
+        free(buf)
+        if size < 0:
+            raise RuntimeError("Could not compress the data")
+        elif size == 0:
+            raise RuntimeError("The result could not fit ")
+        return dest[:size]
+
+    def compress_into(self, src, dst):
+        cdef uint8_t[:] typed_view_dst
+        mem_view_dst = memoryview(dst)
+        typed_view_dst = mem_view_dst.cast('B')
+        if len(typed_view_dst) == 0:
+            raise ValueError("The dst length must be greater than 0")
+        cdef void *_dst = <void*> &typed_view_dst[0]
+        cdef int32_t len_dst = <int32_t> typed_view_dst.nbytes
+        cdef Py_buffer *buf = <Py_buffer *> malloc(sizeof(Py_buffer))
+        PyObject_GetBuffer(src, buf, PyBUF_SIMPLE)
+        cdef int size
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            size = _compress_ctx(&self.cctx, &self.cparams, &self.srcsize, buf.buf, <int32_t> buf.len,
+                                 _dst, len_dst)
+            PyThread_release_lock(self.lock)
+        PyBuffer_Release(buf)
+        free(buf)
+        if size < 0:
+            raise RuntimeError("Could not compress the data")
+        elif size == 0:
+            raise RuntimeError("The result could not fit ")
+        return size
+
+    def __dealloc__(self):
+        if self.cctx != NULL:
+            blosc2_free_ctx(self.cctx)
+        if self.lock != NULL:
+            PyThread_free_lock(self.lock)
+
+
+cdef class DecompressionContext:
+    cdef blosc2_context *dctx
+    cdef PyThread_type_lock lock
+    # The postfilter of the dctx (if any), and the filters version and nthreads it was created with
+    cdef _BlockFilter _filter
+    cdef int64_t _filters_version
+    cdef int16_t _nthreads
+    # The reference to the ZSTD dictionary of the dparams (if any)
+    cdef object _dict
+
+    def __init__(self, **kwargs):
+        cdef blosc2_dparams dparams
+        self._dict = create_dparams_from_kwargs(&dparams, kwargs)
+        self._create(dparams)
+
+    cdef _create(self, blosc2_dparams dparams):
+        self.dctx = blosc2_create_dctx(dparams)
+        if self.dctx == NULL:
+            raise RuntimeError("Could not create the decompression context")
+        self.lock = PyThread_allocate_lock()
+        if self.lock == NULL:
+            raise MemoryError("Could not allocate the context lock")
+
+    def decompress(self, src, dst=None):
+        cdef int32_t nbytes
+        cdef int32_t cbytes
+        cdef int32_t blocksize
+        cdef const uint8_t[:] typed_view_src
+        mem_view_src = memoryview(src)
+        typed_view_src = mem_view_src.cast('B')
+        _check_comp_length('src', typed_view_src.nbytes)
+        blosc2_cbuffer_sizes(<void*>&typed_view_src[0], &nbytes, &cbytes, &blocksize)
+        if dst is not None:
+            self.decompress_into(src, dst)
+            return None
+        dst = PyBytes_FromStringAndSize(NULL, nbytes)
+        if dst is None:
+            raise RuntimeError("Could not get a bytes object")
+        cdef void *_src = <void*>&typed_view_src[0]
+        cdef void *_dst = <void*> <char*> dst
+        cdef int size
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            size = blosc2_decompress_ctx(self.dctx, _src, cbytes, _dst, nbytes)
+            PyThread_release_lock(self.lock)
+        if size < 0:
+            raise ValueError("Error while decompressing, check the src data and/or the dparams")
+        return dst
+
+    def decompress_into(self, src, dst):
+        cdef int32_t nbytes
+        cdef int32_t cbytes
+        cdef int32_t blocksize
+        cdef const uint8_t[:] typed_view_src
+        cdef uint8_t[:] typed_view_dst
+        mem_view_src = memoryview(src)
+        typed_view_src = mem_view_src.cast('B')
+        _check_comp_length('src', typed_view_src.nbytes)
+        blosc2_cbuffer_sizes(<void*>&typed_view_src[0], &nbytes, &cbytes, &blocksize)
+        mem_view_dst = memoryview(dst)
+        typed_view_dst = mem_view_dst.cast('B')
+        if len(typed_view_dst) == 0:
+            raise ValueError("The dst length must be greater than 0")
+        cdef void *_src = <void*>&typed_view_src[0]
+        cdef void *_dst = <void*>&typed_view_dst[0]
+        cdef int32_t len_dst = <int32_t> typed_view_dst.nbytes
+        cdef int size
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            size = blosc2_decompress_ctx(self.dctx, _src, cbytes, _dst, len_dst)
+            PyThread_release_lock(self.lock)
+        if size < 0:
+            raise ValueError("Error while decompressing, check the src data and/or the dparams")
+        return size
+
+    def __dealloc__(self):
+        if self.dctx != NULL:
+            blosc2_free_ctx(self.dctx)
+        if self.lock != NULL:
+            PyThread_free_lock(self.lock)
 
 
 # Default for #blosc2_storage
@@ -621,6 +1814,191 @@ storage_dflts = {
 }
 
 
+# The id of the I/O callbacks running the methods of a Python I/O backend (see blosc2.IOBackend)
+cdef enum:
+    _PYTHON_IO_ID = 255
+
+cdef bint _python_io_registered = False
+
+
+cdef struct _python_io_params:
+    # The io params of the frames of a Python I/O backend.  C-Blosc2 passes sometimes the whole
+    # blosc2_io struct to the open callback instead of its params (e.g. when deleting chunks), so
+    # io.params points to this same struct, and both pointers lead to the backend
+    blosc2_io io
+    void *backend
+
+
+cdef class _PythonIO:
+    # Holds the io params for a Python I/O backend, which must live as long as its super-chunks
+    cdef _python_io_params params
+    cdef object backend
+
+    def __cinit__(self, backend):
+        self.backend = backend
+        self.params.io.id = _PYTHON_IO_ID
+        self.params.io.params = &self.params
+        self.params.backend = <void*> backend
+
+
+cdef void _write_io_error(exc, obj) noexcept:
+    # The C-Blosc2 callers only see the error code, so report the exception the same way than the
+    # exceptions raised by the __del__ methods; the operation fails with its usual RuntimeError
+    PyErr_SetObject(type(exc), exc)
+    PyErr_WriteUnraisable(obj)
+
+
+cdef void* _python_io_open(const char *urlpath, const char *mode, void *params) noexcept with gil:
+    cdef _python_io_params *io_params = <_python_io_params*> (<blosc2_io*> params).params
+    try:
+        stream = (<object> io_params.backend).open(urlpath.decode("utf-8"), mode.decode("utf-8"))
+    except BaseException as exc:
+        _write_io_error(exc, <object> io_params.backend)
+        return NULL
+    Py_INCREF(stream)
+    return <void*> stream
+
+
+cdef int _python_io_close(void *stream) noexcept with gil:
+    # C-Blosc2 does not check that the streams could be opened, hence the NULL checks
+    if stream == NULL:
+        return -1
+    try:
+        (<object> stream).close()
+    except BaseException as exc:
+        _write_io_error(exc, <object> stream)
+        return -1
+    finally:
+        Py_DECREF(<object> stream)
+    return 0
+
+
+cdef int64_t _python_io_tell(void *stream) noexcept with gil:
+    if stream == NULL:
+        return -1
+    try:
+        return (<object> stream).tell()
+    except BaseException as exc:
+        _write_io_error(exc, <object> stream)
+        return -1
+
+
+cdef int _python_io_seek(void *stream, int64_t offset, int whence) noexcept with gil:
+    if stream == NULL:
+        return -1
+    try:
+        (<object> stream).seek(offset, whence)
+    except BaseException as exc:
+        _write_io_error(exc, <object> stream)
+        return -1
+    return 0
+
+
+def _readinto(stream, buffer):
+    # Like stream.readinto(), but going on until the buffer is full or the end of the stream
+    nread = 0
+    while nread < len(buffer):
+        with buffer[nread:] as view:
+            n = stream.readinto(view)
+        if not n:
+            break
+        nread += n
+    return nread
+
+
+def _write(stream, buffer):
+    # Like stream.write(), but going on until the whole buffer is written
+    nwritten = 0
+    while nwritten < len(buffer):
+        with buffer[nwritten:] as view:
+            n = stream.write(view)
+        if n is None:
+            # Some file-like objects do not return the number of bytes written (as they write all)
+            return len(buffer)
+        if not n:
+            break
+        nwritten += n
+    return nwritten
+
+
+cdef int64_t _python_io_write(const void *ptr, int64_t size, int64_t nitems, void *stream) noexcept with gil:
+    cdef _BlockBuffer buffer
+    if stream == NULL or size <= 0 or nitems <= 0:
+        return 0
+    buffer = _new_block_buffer(<uint8_t*> ptr, size * nitems, True)
+    try:
+        with memoryview(buffer) as view:
+            nwritten = _write(<object> stream, view)
+    except BaseException as exc:
+        _write_io_error(exc, <object> stream)
+        return 0
+    finally:
+        buffer.release()
+    return nwritten // size
+
+
+cdef int64_t _python_io_read(void *ptr, int64_t size, int64_t nitems, void *stream) noexcept with gil:
+    cdef _BlockBuffer buffer
+    if stream == NULL or size <= 0 or nitems <= 0:
+        return 0
+    buffer = _new_block_buffer(<uint8_t*> ptr, size * nitems, False)
+    try:
+        with memoryview(buffer) as view:
+            nread = _readinto(<object> stream, view)
+    except BaseException as exc:
+        _write_io_error(exc, <object> stream)
+        return 0
+    finally:
+        buffer.release()
+    return nread // size
+
+
+cdef int _python_io_truncate(void *stream, int64_t size) noexcept with gil:
+    if stream == NULL:
+        return -1
+    try:
+        (<object> stream).truncate(size)
+    except BaseException as exc:
+        _write_io_error(exc, <object> stream)
+        return -1
+    return 0
+
+
+cdef _register_python_io():
+    global _python_io_registered
+    if _python_io_registered:
+        return
+    cdef blosc2_io_cb io_cb
+    io_cb.id = _PYTHON_IO_ID
+    io_cb.open = _python_io_open
+    io_cb.close = _python_io_close
+    io_cb.tell = _python_io_tell
+    io_cb.seek = _python_io_seek
+    io_cb.write = _python_io_write
+    io_cb.read = _python_io_read
+    io_cb.truncate = _python_io_truncate
+    if blosc2_register_io_cb(&io_cb) < 0:
+        raise RuntimeError("Could not register the callbacks for the Python I/O backends")
+    _python_io_registered = True
+
+
+def _remove_urlpath(urlpath, backend):
+    # Remove the frame at urlpath, which is stored by backend (when not None)
+    if isinstance(backend, _PythonIO):
+        backend = (<_PythonIO> backend).backend
+    if backend is None:
+        blosc2.remove_urlpath(urlpath)
+    elif urlpath is not None:
+        backend.remove(urlpath.decode("utf-8") if isinstance(urlpath, bytes) else urlpath)
+
+
+cdef _set_python_io(blosc2_io *io, _PythonIO python_io):
+    # python_io must be kept alive by the caller while the super-chunk is in use
+    _register_python_io()
+    io.id = _PYTHON_IO_ID
+    io.params = &python_io.params
+
+
 cdef create_storage(blosc2_storage *storage, kwargs):
     contiguous = kwargs.get('contiguous', storage_dflts['contiguous'])
     urlpath = kwargs.get('urlpath', storage_dflts['urlpath'])
@@ -628,20 +2006,226 @@ cdef create_storage(blosc2_storage *storage, kwargs):
         storage.urlpath = NULL
     else:
         storage.urlpath = urlpath
+    # The references to the ZSTD dictionaries of the params (if any)
+    dict_refs = []
     if kwargs.get('cparams', None) is not None:
-        create_cparams_from_kwargs(storage.cparams, kwargs.get('cparams'))
+        dict_refs.append(create_cparams_from_kwargs(storage.cparams, kwargs.get('cparams')))
 
     if kwargs.get('dparams', None) is not None:
-        create_dparams_from_kwargs(storage.dparams, kwargs.get('dparams'))
+        dict_refs.append(create_dparams_from_kwargs(storage.dparams, kwargs.get('dparams')))
     storage.contiguous = contiguous
 
-    storage.io = NULL
-    # TODO: support the next ones in the future
-    #storage.io = kwargs.get('io', storage_dflts['io'])
+    backend = kwargs.get('io', storage_dflts['io'])
+    if backend is None:
+        storage.io = NULL
+    else:
+        # Sparse frames are directories, which C-Blosc2 always creates in the local filesystem
+        if urlpath is None or not contiguous:
+            raise ValueError("An io backend can only be used for contiguous SChunks with an urlpath")
+        if not isinstance(backend, _PythonIO):
+            backend = kwargs['io'] = _PythonIO(backend)
+        _set_python_io(storage.io, backend)
+    # They must be kept while the params are in use
+    return dict_refs
+
+
+# A row of SChunk.chunk_info(), which must match _CHUNK_INFO_DTYPE
+cdef packed struct _chunk_info:
+    uint8_t nbytes[4]
+    uint8_t cbytes[4]
+    uint8_t blocksize[4]
+    uint8_t typesize
+    uint8_t codec
+    uint8_t codec_meta
+    uint8_t filters[6]
+    uint8_t filters_meta[6]
+    uint8_t special
+    uint8_t memcpyed
+
+# The int32 fields are copied as stored in the chunk headers, i.e. little-endian
+_CHUNK_INFO_DTYPE = [
+    ("nbytes", "<i4"),
+    ("cbytes", "<i4"),
+    ("blocksize", "<i4"),
+    ("typesize", "u1"),
+    ("codec", "u1"),
+    ("codec_meta", "u1"),
+    ("filters", "u1", (6,)),
+    ("filters_meta", "u1", (6,)),
+    ("special", "u1"),
+    ("memcpyed", "?"),
+]
+
+
+cdef void _read_chunk_info(const uint8_t *chunk, _chunk_info *info) nogil:
+    # Fill info from the (extended) header of the chunk
+    cdef uint8_t flags = chunk[BLOSC2_CHUNK_FLAGS]
+    memcpy(info.nbytes, &chunk[BLOSC2_CHUNK_NBYTES], 4)
+    memcpy(info.cbytes, &chunk[BLOSC2_CHUNK_CBYTES], 4)
+    memcpy(info.blocksize, &chunk[BLOSC2_CHUNK_BLOCKSIZE], 4)
+    info.typesize = chunk[BLOSC2_CHUNK_TYPESIZE]
+    # The codec and its meta go right after the filter codes
+    info.codec = chunk[BLOSC2_CHUNK_FILTER_CODES + 6]
+    info.codec_meta = chunk[BLOSC2_CHUNK_FILTER_CODES + 7]
+    memcpy(info.filters, &chunk[BLOSC2_CHUNK_FILTER_CODES], 6)
+    memcpy(info.filters_meta, &chunk[BLOSC2_CHUNK_FILTER_META], 6)
+    info.special = (chunk[BLOSC2_CHUNK_BLOSC2_FLAGS] >> 4) & BLOSC2_SPECIAL_MASK
+    info.memcpyed = (flags & BLOSC_MEMCPYED) != 0
+
+
+cdef int _decompress_lazychunk(blosc2_context *dctx, uint8_t *chunk, void *dest, int32_t nbytes,
+                               const uint8_t *maskout=NULL, int nblocks=0) nogil:
+    # Like blosc2_schunk_decompress_chunk(), but using the dctx passed instead of the shared schunk.dctx,
+    # so that different threads can decompress chunks of the same super-chunk concurrently.
+    # For lazy chunks, only the blocks that are not masked out are read from disk.
+    cdef int32_t chunk_nbytes
+    cdef int32_t chunk_cbytes
+    cdef int32_t blocksize
+    cdef int rc
+    rc = blosc2_cbuffer_sizes(chunk, &chunk_nbytes, &chunk_cbytes, &blocksize)
+    if rc >= 0 and maskout != NULL:
+        # The mask is only set once the chunk is at hand, as it would stick in the dctx otherwise
+        if blocksize > 0 and nblocks != chunk_nbytes // blocksize + (chunk_nbytes % blocksize > 0):
+            rc = BLOSC2_ERROR_INVALID_PARAM
+        else:
+            rc = blosc2_set_maskout(dctx, <bool*>maskout, nblocks)
+    if rc >= 0:
+        if chunk_nbytes > nbytes:
+            rc = BLOSC2_ERROR_WRITE_BUFFER
+        else:
+            rc = blosc2_decompress_ctx(dctx, chunk, chunk_cbytes, dest, nbytes)
+            if rc >= 0 and rc != chunk_nbytes:
+                rc = BLOSC2_ERROR_FAILURE
+    return rc
+
+
+cdef int _schunk_get_own_chunk(blosc2_schunk *schunk, PyThread_type_lock lock, int64_t nchunk, bint lazy,
+                               uint8_t **chunk) noexcept nogil:
+    # Get the (lazy) chunk into a buffer that the caller must free.  The chunks kept in memory by
+    # the super-chunk are copied while holding the lock, as they may be reallocated or freed by a
+    # modification of the super-chunk as soon as it is released.
+    cdef bool needs_free
+    cdef uint8_t *copy
+    cdef int rc
+    PyThread_acquire_lock(lock, WAIT_LOCK)
+    if lazy:
+        rc = blosc2_schunk_get_lazychunk(schunk, nchunk, chunk, &needs_free)
+    else:
+        rc = blosc2_schunk_get_chunk(schunk, nchunk, chunk, &needs_free)
+    if rc >= 0 and not needs_free:
+        copy = <uint8_t *> malloc(max(rc, 1))
+        if copy == NULL:
+            rc = BLOSC2_ERROR_MEMORY_ALLOC
+        else:
+            memcpy(copy, chunk[0], rc)
+            chunk[0] = copy
+    PyThread_release_lock(lock)
+    return rc
+
+
+@cython.cdivision(True)
+cdef int _schunk_get_slice(blosc2_schunk *schunk, PyThread_type_lock lock, blosc2_context *dctx,
+                           int64_t start, int64_t stop, uint8_t *dest, int64_t *filter_nchunk=NULL) nogil:
+    # Get the items in [start, stop) by only decompressing the blocks that contain them.
+    # The nchunk being decompressed is stored in filter_nchunk (if not NULL) for the postfilter.
+    cdef int32_t typesize = schunk.typesize
+    cdef int64_t chunk_nitems = schunk.chunksize // typesize
+    cdef int64_t nchunk
+    cdef int32_t offset
+    cdef int32_t nitems
+    cdef uint8_t *chunk
+    cdef bool needs_free
+    cdef int32_t chunk_nbytes
+    cdef int32_t chunk_cbytes
+    cdef int rc
+    if start < stop and chunk_nitems <= 0:
+        return BLOSC2_ERROR_INVALID_PARAM
+    while start < stop:
+        nchunk = start // chunk_nitems
+        offset = <int32_t> (start % chunk_nitems)
+        nitems = <int32_t> min(stop - start, chunk_nitems - offset)
+        PyThread_acquire_lock(lock, WAIT_LOCK)
+        rc = blosc2_schunk_get_lazychunk(schunk, nchunk, &chunk, &needs_free)
+        if needs_free or rc <= 0:
+            PyThread_release_lock(lock)
+        # Otherwise, the chunk is owned by the super-chunk, which may reallocate or free it when
+        # modified, so the lock is kept while its blocks are read (which is faster than copying it)
+        if rc <= 0:
+            return rc if rc < 0 else BLOSC2_ERROR_READ_BUFFER
+        rc = blosc2_cbuffer_sizes(chunk, &chunk_nbytes, &chunk_cbytes, NULL)
+        if rc >= 0:
+            if (<int64_t> offset + nitems) * typesize > chunk_nbytes:
+                # Chunks with a size different than chunksize are not supported
+                rc = BLOSC2_ERROR_INVALID_PARAM
+            else:
+                if filter_nchunk != NULL:
+                    filter_nchunk[0] = nchunk
+                rc = blosc2_getitem_ctx(dctx, chunk, chunk_cbytes, offset, nitems, dest, nitems * typesize)
+        if needs_free:
+            free(chunk)
+        else:
+            PyThread_release_lock(lock)
+        if rc < 0:
+            return rc
+        dest += nitems * typesize
+        start += nitems
+    return 0
+
+
+# Number of zero-copy users (exports via to_cframe() and imports via schunk_from_cframe()) of the
+# in-memory frame of every super-chunk, keyed by its address.  A shared frame cannot be modified,
+# as C-Blosc2 could reallocate it under the feet of its users.
+cdef dict _shared_frames = {}
+
+
+cdef _share_frame(blosc2_schunk *schunk):
+    key = <uintptr_t> schunk
+    _shared_frames[key] = _shared_frames.get(key, 0) + 1
+
+
+cdef _unshare_frame(blosc2_schunk *schunk):
+    key = <uintptr_t> schunk
+    nusers = _shared_frames.get(key, 0) - 1
+    if nusers > 0:
+        _shared_frames[key] = nusers
+    else:
+        _shared_frames.pop(key, None)
+
+
+cdef _check_frame_not_shared(blosc2_schunk *schunk):
+    if <uintptr_t> schunk in _shared_frames:
+        raise BufferError("The frame of this SChunk is shared with an external buffer, "
+                          "so it cannot be modified")
 
 
 cdef class SChunk:
     cdef blosc2_schunk *schunk
+    # Protects the access to the schunk internals (e.g. its frame and its cctx)
+    cdef PyThread_type_lock lock
+    # Pool of decompression contexts, so that several threads can decompress at the same time
+    cdef list dctx_pool
+    # The external buffer holding the frame, when imported with schunk_from_cframe(copy=False)
+    cdef object _cframe
+    # The Python prefilter run by the cctx, and the postfilter for the dctxs in dctx_pool
+    cdef _BlockFilter _prefilter
+    cdef bint _prefilter_parallel
+    cdef object _postfilter_func
+    cdef bint _postfilter_parallel
+    # Bumped whenever the postfilter changes, so that outdated dctxs are not put back in dctx_pool
+    cdef int64_t _filters_version
+    # The io params for the Python I/O backend of the frame (if any), which C-Blosc2 only references
+    cdef _PythonIO _io
+    # The blosc2.Tuner choosing the cparams of the chunks compressed from now on (if any)
+    cdef object _tuner
+    # The references to the ZSTD dictionaries of the storage params
+    cdef list _dicts
+
+    def __cinit__(self, *args, **kwargs):
+        self.lock = PyThread_allocate_lock()
+        if self.lock == NULL:
+            raise MemoryError("Could not allocate the SChunk lock")
+        self.dctx_pool = []
+        self._dicts = []
 
     def __init__(self, schunk=None, chunksize=8*10**6, data=None, mode="a", **kwargs):
         # hold on to a bytestring of urlpath for the lifetime of the instance
@@ -650,141 +2234,589 @@ cdef class SChunk:
         if urlpath is not None:
             self._urlpath = urlpath.encode() if isinstance(urlpath, str) else urlpath
             kwargs["urlpath"] = self._urlpath
+        backend = kwargs.get("io", None)
 
         if schunk is not None:
             self.schunk = <blosc2_schunk *> PyCapsule_GetPointer(schunk, <char *> "blosc2_schunk*")
+            # This comes from schunk_open() or copy(), which already wrapped the backend
+            self._io = backend
             if mode == "w" and urlpath is not None:
-                blosc2.remove_urlpath(urlpath)
+                _remove_urlpath(urlpath, backend)
                 self.schunk = blosc2_schunk_new(self.schunk.storage)
             return
 
         if kwargs is not None:
             if mode == "w":
-                blosc2.remove_urlpath(urlpath)
+                _remove_urlpath(urlpath, backend)
             elif mode == "r" and urlpath is not None:
                 raise ValueError("SChunk must already exist")
 
         cdef blosc2_storage storage
-        # Create space for cparams and dparams in the stack
+        # Create space for cparams, dparams and io in the stack
         cdef blosc2_cparams cparams = BLOSC2_CPARAMS_DEFAULTS
         cdef blosc2_dparams dparams = BLOSC2_DPARAMS_DEFAULTS
+        cdef blosc2_io io
         storage.cparams = &cparams
         storage.dparams = &dparams
+        storage.io = &io
         if kwargs is None:
             storage = BLOSC2_STORAGE_DEFAULTS
         else:
-            create_storage(&storage, kwargs)
+            self._dicts = create_storage(&storage, kwargs)
+            self._io = kwargs.get("io", None)
         self.schunk = blosc2_schunk_new(&storage)
         if self.schunk == NULL:
             raise RuntimeError("Could not create the Schunk")
         if chunksize > INT_MAX:
             raise ValueError("Maximum chunksize allowed is 2^31 - 1")
         self.schunk.chunksize = chunksize
-        cdef const uint8_t[:] typed_view
-        cdef int index
+        # The metalayers must be added before any data in frames
+        metalayers = kwargs.get("meta", None)
+        if metalayers is not None:
+            layers = meta(<uintptr_t> self.schunk)
+            for name, content in metalayers.items():
+                layers.set_meta(name, content)
         if data is not None:
-            mem_view = memoryview(data)
-            typed_view = mem_view.cast('B')
-            len_data = typed_view.nbytes
-            nchunks = len_data // chunksize + 1 if len_data % chunksize != 0 else len_data // chunksize
-            len_chunk = chunksize
-            for i in range(nchunks):
-                if i == (nchunks - 1):
-                    len_chunk = len_data - i*chunksize
-                index = i*chunksize
-                nchunks_ = blosc2_schunk_append_buffer(self.schunk, <void*>&typed_view[index], len_chunk)
-                if nchunks_ != (i + 1):
-                    raise RuntimeError("An error occurred while appending the chunks")
+            SChunk.extend(self, data)
 
     @property
     def c_schunk(self):
         return <uintptr_t> self.schunk
 
+    @property
+    def chunksize(self):
+        """The size, in bytes, of the chunks of the super-chunk."""
+        return self.schunk.chunksize
+
+    @property
+    def nchunks(self):
+        """The number of chunks in the super-chunk."""
+        return self.schunk.nchunks
+
+    @property
+    def tuner(self):
+        """The :class:`~blosc2.Tuner` choosing the cparams of the chunks compressed from now on
+        (`None` if the cparams are fixed)."""
+        return self._tuner
+
+    def _set_tuner(self, tuner):
+        self._tuner = tuner
+
+    def _set_dict(self, dict_):
+        # Compress the next chunks with the ZSTD dictionary (also registered for decompressing)
+        cdef blosc2_cparams *cparams = self.schunk.storage.cparams
+        cdef _ZstdDict ref = _get_zstd_cdict(dict_, cparams.clevel)
+        self._dicts.append(ref)
+        cparams.compcode = _ZSTD_DICT_CODEC
+        cparams.compcode_meta = ref.slot
+        self._update_cctx(self._prefilter, self._prefilter_parallel)
+
+    @property
+    def nbytes(self):
+        """The number of bytes of the data in the super-chunk (uncompressed)."""
+        return self.schunk.nbytes
+
+    @property
+    def cbytes(self):
+        """The number of bytes of the chunks in the super-chunk (compressed, with their headers).
+
+        For contiguous frames, this includes the chunks that have been updated or deleted
+        (which are only left out by :func:`~blosc2.SChunk.copy`), as they take space in the frame.
+        """
+        return self.schunk.cbytes
+
+    @property
+    def cratio(self):
+        """The compression ratio of the super-chunk, i.e. `nbytes / cbytes` (0 if it has no chunks)."""
+        return self.schunk.nbytes / self.schunk.cbytes if self.schunk.cbytes > 0 else 0.0
+
+    def chunk_info(self):
+        import numpy
+        cdef int64_t nchunks = self.schunk.nchunks
+        info = numpy.empty(nchunks, dtype=_CHUNK_INFO_DTYPE)
+        if nchunks == 0:
+            return info
+        cdef uint8_t[:] typed_view_info = info.view(numpy.uint8)
+        cdef _chunk_info *rows = <_chunk_info*> &typed_view_info[0]
+        cdef uint8_t *chunk
+        cdef bool needs_free
+        cdef int rc = 0
+        cdef int64_t nchunk
+        cdef uint8_t extended_flags = BLOSC_DOSHUFFLE | BLOSC_DOBITSHUFFLE
+        # Just the headers are read (for chunks on disk, only the lazy chunks are fetched)
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            for nchunk in range(nchunks):
+                rc = blosc2_schunk_get_lazychunk(self.schunk, nchunk, &chunk, &needs_free)
+                if rc < 0:
+                    break
+                # The chunks in super-chunks always have extended headers (flagged by both shuffles)
+                if (rc < BLOSC_EXTENDED_HEADER_LENGTH or
+                        chunk[BLOSC2_CHUNK_FLAGS] & extended_flags != extended_flags):
+                    rc = BLOSC2_ERROR_INVALID_HEADER
+                else:
+                    _read_chunk_info(chunk, &rows[nchunk])
+                if needs_free:
+                    free(chunk)
+                if rc < 0:
+                    break
+            PyThread_release_lock(self.lock)
+        if rc < 0:
+            raise RuntimeError("Could not read the header of the chunk %d" % nchunk)
+        return info
+
+    cdef DecompressionContext _pop_dctx(self, int16_t nthreads=0):
+        # A dctx with nthreads threads, or with the nthreads of the dparams of the super-chunk if 0
+        cdef blosc2_dparams dparams = self.schunk.storage.dparams[0]
+        if nthreads > 0:
+            dparams.nthreads = nthreads
+        cdef DecompressionContext dctx
+        for i in range(len(self.dctx_pool) - 1, -1, -1):
+            dctx = self.dctx_pool[i]
+            if dctx._nthreads == dparams.nthreads:
+                return self.dctx_pool.pop(i)
+        # The super-chunk is needed for decompressing lazy chunks
+        dparams.schunk = self.schunk
+        dctx = DecompressionContext.__new__(DecompressionContext)
+        dctx._nthreads = dparams.nthreads
+        if self._postfilter_func is not None:
+            # Every dctx gets its own filter, which reports the nchunk and errors of its decompressions
+            dctx._filter = _BlockFilter(self._postfilter_func)
+            dparams.postfilter = _postfilter_trampoline
+            dparams.postparams = &dctx._filter.postparams
+            if not self._postfilter_parallel:
+                dparams.nthreads = 1
+        dctx._filters_version = self._filters_version
+        dctx._create(dparams)
+        return dctx
+
+    cdef _push_dctx(self, DecompressionContext dctx):
+        # Return dctx to the pool, unless the postfilter has changed since it was created
+        if dctx._filters_version == self._filters_version:
+            self.dctx_pool.append(dctx)
+
+    def _set_prefilter(self, func, parallel=False):
+        self._update_cctx(_BlockFilter(func) if func is not None else None, parallel)
+
+    cdef _update_cctx(self, _BlockFilter filter_, bint parallel):
+        # Replace the cctx with a new one for the current cparams of the storage and the prefilter
+        cdef blosc2_cparams cparams = self.schunk.storage.cparams[0]
+        if filter_ is not None:
+            cparams.prefilter = _prefilter_trampoline
+            cparams.preparams = &filter_.preparams
+            if not parallel:
+                # Python callables are serialized by the GIL anyway
+                cparams.nthreads = 1
+        else:
+            cparams.prefilter = NULL
+            cparams.preparams = NULL
+        cparams.schunk = self.schunk
+        cdef blosc2_context *cctx = blosc2_create_cctx(cparams)
+        if cctx == NULL:
+            raise RuntimeError("Could not create the compression context")
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            cctx, self.schunk.cctx = self.schunk.cctx, cctx
+            PyThread_release_lock(self.lock)
+            blosc2_free_ctx(cctx)
+        # The previous filter is not needed anymore now that its context is freed
+        self._prefilter = filter_
+        self._prefilter_parallel = parallel
+
+    cdef _tune(self, data):
+        # Get the cparams of the tuner for data (if any), and make the cctx use them
+        if self._tuner is None or self._prefilter is not None:
+            # The data of a prefilter is not the one compressed (fill_from() does not even initialize
+            # it), so the chunks are compressed with the last choice of the tuner instead
+            return None
+        tuned = self._tuner.next_cparams(data, self.schunk.typesize)
+        self._set_tuned_cparams(tuned)
+        return tuned
+
+    cdef _set_tuned_cparams(self, dict tuned):
+        cdef blosc2_cparams *cparams = self.schunk.storage.cparams
+        cdef blosc2_cparams old = cparams[0]
+        cparams.compcode = tuned["codec"].value
+        cparams.clevel = tuned["clevel"]
+        for i in range(BLOSC2_MAX_FILTERS):
+            cparams.filters[i] = tuned["filters"][i].value
+            cparams.filters_meta[i] = tuned["filters_meta"][i]
+        if not _same_chunk_format(&old, cparams):
+            self._update_cctx(self._prefilter, self._prefilter_parallel)
+
+    def _set_postfilter(self, func, parallel=False):
+        self._postfilter_func = func
+        self._postfilter_parallel = parallel
+        self._filters_version += 1
+        self.dctx_pool = []
+
+    cdef _raise_prefilter_error(self):
+        if self._prefilter is not None:
+            self._prefilter.raise_error()
+
     def append_data(self, data):
+        _check_frame_not_shared(self.schunk)
+        tuned = self._tune(data)
         cdef Py_buffer *buf = <Py_buffer *> malloc(sizeof(Py_buffer))
         PyObject_GetBuffer(data, buf, PyBUF_SIMPLE)
-        rc = blosc2_schunk_append_buffer(self.schunk, buf.buf, <int32_t> buf.len)
+        cdef int64_t rc
+        cdef bint short_first_chunk
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            # C-Blosc2 crashes when the first chunk of a super-chunk without a frame is not full
+            short_first_chunk = (self.schunk.frame == NULL and self.schunk.nchunks == 0
+                                 and buf.len < self.schunk.chunksize)
+            if not short_first_chunk:
+                rc = blosc2_schunk_append_buffer(self.schunk, buf.buf, <int32_t> buf.len)
+            PyThread_release_lock(self.lock)
         PyBuffer_Release(buf)
         free(buf)
+        if short_first_chunk:
+            raise ValueError("The first chunk of a non-contiguous, in-memory SChunk must have "
+                             "chunksize bytes")
         if rc < 0:
+            self._raise_prefilter_error()
             raise RuntimeError("Could not append the buffer")
+        if tuned is not None:
+            self._tuner._record(tuned, nchunk=rc - 1)
         return rc
 
-    def decompress_chunk(self, nchunk, dst=None):
+    def extend(self, data, nthreads=None, max_pending=None):
+        _check_frame_not_shared(self.schunk)
+        view = memoryview(data).cast('B')
+        chunksize = self.schunk.chunksize
+        nchunks = -(-view.nbytes // chunksize)
+        nthreads = self.schunk.storage.cparams.nthreads if nthreads is None else nthreads
+        max_pending = 2 * nthreads if max_pending is None else max_pending
+        if nthreads < 1 or max_pending < 1:
+            raise ValueError("nthreads and max_pending must be at least 1")
+        if nchunks == 1 or nthreads == 1 or self._prefilter is not None:
+            # The threads are better used inside the chunks then, and the prefilter is run by the cctx
+            # of the super-chunk only
+            for i in range(nchunks):
+                SChunk.append_data(self, view[i * chunksize:(i + 1) * chunksize])
+            return self.schunk.nchunks
+
+        cparams = dict(_cparams_to_dict(self.schunk.storage.cparams), nthreads=1)
+        tuned = None
+        if self._tuner is not None:
+            # The tuner is asked in the order of the chunks, as its choices may depend on the previous ones
+            tuned = [self._tuner.next_cparams(view[i * chunksize:(i + 1) * chunksize], self.schunk.typesize)
+                     for i in range(nchunks)]
+        local = threading.local()
+
+        def compress(i):
+            if tuned is not None:
+                if not hasattr(local, "cctxs"):
+                    local.cctxs = {}
+                cctx = _tuned_cctx(local.cctxs, cparams, tuned[i])
+            else:
+                if not hasattr(local, "cctx"):
+                    local.cctx = blosc2.CompressionContext(**cparams)
+                cctx = local.cctx
+            return cctx.compress(view[i * chunksize:(i + 1) * chunksize])
+
+        first_nchunk = self.schunk.nchunks
+        self._append_in_order(compress, nchunks, nthreads, max_pending)
+        if tuned:
+            # The next chunks appended are compressed like the last one, until the tuner changes it
+            self._set_tuned_cparams(tuned[-1])
+            for i, chunk_cparams in enumerate(tuned):
+                self._tuner._record(chunk_cparams, nchunk=first_nchunk + i)
+        return self.schunk.nchunks
+
+    def decompress_chunk(self, nchunk, dst=None, block_mask=None):
         cdef uint8_t[:] typed_view_dst
+        cdef const uint8_t[:] typed_view_mask
+        cdef const uint8_t *mask = NULL
+        cdef int nblocks = 0
         cdef uint8_t *chunk
-        cdef bool needs_free
-        rc = blosc2_schunk_get_chunk(self.schunk, nchunk, &chunk, &needs_free)
-
+        cdef int64_t nchunk_ = nchunk
+        cdef int32_t nbytes = 0
+        cdef int32_t cbytes
+        cdef int32_t blocksize = 0
+        cdef int rc
+        cdef void *_dst
+        cdef int32_t len_dst
+        cdef int size
+        cdef bint return_dst = dst is None
+        cdef bint lazy = block_mask is not None
+        # The chunk is fetched just once, also when the size of dst is needed.  For chunks on disk,
+        # a lazy chunk (header and block offsets only) is fetched when just some blocks are needed,
+        # so that the rest of blocks are not read; otherwise, reading the whole chunk at once is faster.
+        with nogil:
+            rc = _schunk_get_own_chunk(self.schunk, self.lock, nchunk_, lazy, &chunk)
         if rc < 0:
             raise RuntimeError("Error while getting the chunk")
+        cdef DecompressionContext dctx
+        try:
+            blosc2_cbuffer_sizes(chunk, &nbytes, &cbytes, &blocksize)
+            if block_mask is not None:
+                typed_view_mask = _get_maskout(block_mask, nbytes, blocksize)
+                mask = &typed_view_mask[0]
+                nblocks = typed_view_mask.shape[0]
+
+            if not return_dst:
+                mem_view_dst = memoryview(dst)
+                typed_view_dst = mem_view_dst.cast('B')
+                if len(typed_view_dst) == 0:
+                    raise ValueError("The dst length must be greater than 0")
+                _dst = <void*>&typed_view_dst[0]
+                len_dst = <int32_t> typed_view_dst.nbytes
+            else:
+                dst = PyBytes_FromStringAndSize(NULL, nbytes)
+                if dst is None:
+                    raise RuntimeError("Could not get a bytes object")
+                _dst = <void*><char *>dst
+                len_dst = nbytes
+
+            dctx = self._pop_dctx()
+            if dctx._filter is not None:
+                dctx._filter.nchunk = nchunk_
+            with nogil:
+                size = _decompress_lazychunk(dctx.dctx, chunk, _dst, len_dst, mask, nblocks)
+                if size >= 0 and return_dst and mask != NULL:
+                    _zero_masked_blocks(<uint8_t*>_dst, mask, nblocks, nbytes, blocksize)
+            self._push_dctx(dctx)
+        finally:
+            free(chunk)
+        if size < 0:
+            if dctx is not None and dctx._filter is not None:
+                dctx._filter.raise_error()
+            raise RuntimeError("Error while decompressing the specified chunk")
+        if return_dst:
+            return dst
 
-        cdef int32_t nbytes
-        cdef int32_t cbytes
-        cdef int32_t blocksize
-        blosc2_cbuffer_sizes(chunk, &nbytes, &cbytes, &blocksize)
-        if needs_free:
+    cdef int32_t _decompress_to(self, int64_t nchunk, uint8_t *dst, int32_t len_dst,
+                                int16_t nthreads) except -1:
+        # Decompress the chunk into dst with a dctx of nthreads threads, and return its nbytes
+        cdef uint8_t *chunk
+        cdef int rc
+        with nogil:
+            rc = _schunk_get_own_chunk(self.schunk, self.lock, nchunk, False, &chunk)
+        if rc < 0:
+            raise RuntimeError("Error while getting the chunk")
+        cdef DecompressionContext dctx = self._pop_dctx(nthreads)
+        if dctx._filter is not None:
+            dctx._filter.nchunk = nchunk
+        with nogil:
+            rc = _decompress_lazychunk(dctx.dctx, chunk, dst, len_dst)
             free(chunk)
+        self._push_dctx(dctx)
+        if rc < 0:
+            if dctx._filter is not None:
+                dctx._filter.raise_error()
+            raise RuntimeError("Error while decompressing the chunk %d" % nchunk)
+        return rc
 
-        if dst is not None:
+    def decompress_range(self, start=0, stop=None, dst=None, nthreads=None):
+        cdef int64_t nchunks = self.schunk.nchunks
+        start, stop, _ = slice(start, stop, 1).indices(nchunks)
+        stop = max(start, stop)
+        nthreads = self.schunk.storage.dparams.nthreads if nthreads is None else nthreads
+        if nthreads < 1:
+            raise ValueError("nthreads must be at least 1")
+        cdef int64_t chunksize = self.schunk.chunksize
+        # The chunks go at multiples of chunksize from the start of dst, and only the last chunk
+        # of the super-chunk can be smaller
+        cdef int64_t nbytes = (stop - start) * chunksize
+        if stop == nchunks and stop > start:
+            nbytes -= nchunks * chunksize - self.schunk.nbytes
+        cdef uint8_t[:] typed_view_dst
+        cdef uintptr_t address
+        return_dst = dst is None
+        if return_dst:
+            dst = PyBytes_FromStringAndSize(NULL, nbytes)
+            if dst is None:
+                raise RuntimeError("Could not get a bytes object")
+            address = <uintptr_t> <char*> dst
+        else:
+            mem_view_dst = memoryview(dst)
+            typed_view_dst = mem_view_dst.cast('B')
+            if typed_view_dst.nbytes < nbytes:
+                raise ValueError("The dst length must be at least %d bytes" % nbytes)
+            address = <uintptr_t> &typed_view_dst[0] if nbytes > 0 else 0
+
+        def decompress(nchunk, nthreads):
+            offset = (nchunk - start) * chunksize
+            size = min(chunksize, nbytes - offset)
+            dst_ = <uint8_t*> <uintptr_t> (address + offset)
+            if self._decompress_to(nchunk, dst_, size, nthreads) != size:
+                raise RuntimeError("The chunks must have chunksize bytes (but the last one in the SChunk)")
+
+        if stop - start == 1 or nthreads == 1:
+            # Not enough chunks for the threads, which are better used inside every chunk
+            for nchunk in range(start, stop):
+                decompress(nchunk, nthreads)
+        elif stop > start:
+            # A chunk per thread, every chunk decompressed with no threads of its own
+            with ThreadPoolExecutor(max_workers=min(nthreads, stop - start)) as executor:
+                for _ in executor.map(decompress, range(start, stop), [1] * (stop - start)):
+                    pass
+        if return_dst:
+            return dst
+
+    def iterchunks(self, dtype=None, prefetch=2, reuse_buffer=True):
+        # Not a generator itself, so that the arguments are checked right away
+        if prefetch < 0:
+            raise ValueError("prefetch cannot be negative")
+        return self._iterchunks(dtype, prefetch, reuse_buffer)
+
+    def _iterchunks(self, dtype, prefetch, reuse_buffer):
+        if dtype is not None:
+            import numpy
+        cdef int64_t chunksize = self.schunk.chunksize
+        # The threads of the dparams are shared by the chunks being decompressed at the same time
+        nthreads = max(1, self.schunk.storage.dparams.nthreads // max(1, prefetch))
+        buffers = deque()
+
+        def decompress(nchunk):
+            # Every chunk gets its own buffer, which is handed back by the consumer (if reused)
+            buffer = buffers.popleft() if buffers else bytearray(chunksize)
+            size = self._decompress_into_buffer(nchunk, buffer, nthreads)
+            return buffer, size
+
+        def chunk_view(buffer, size):
+            view = memoryview(buffer)[:size]
+            return view if dtype is None else numpy.frombuffer(view, dtype=dtype)
+
+        cdef int64_t nchunks = self.schunk.nchunks
+        if prefetch == 0:
+            for nchunk in range(nchunks):
+                buffer, size = decompress(nchunk)
+                yield chunk_view(buffer, size)
+                if reuse_buffer:
+                    buffers.append(buffer)
+            return
+
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            pending = deque()
+            try:
+                for nchunk in range(nchunks):
+                    pending.append(executor.submit(decompress, nchunk))
+                    if len(pending) <= prefetch:
+                        continue
+                    buffer, size = pending.popleft().result()
+                    yield chunk_view(buffer, size)
+                    if reuse_buffer:
+                        buffers.append(buffer)
+                while pending:
+                    buffer, size = pending.popleft().result()
+                    yield chunk_view(buffer, size)
+                    if reuse_buffer:
+                        buffers.append(buffer)
+            finally:
+                # The chunks still in flight must not outlive the iteration (e.g. on a break)
+                for future in pending:
+                    future.cancel()
+
+    def _decompress_into_buffer(self, nchunk, buffer, nthreads):
+        cdef uint8_t[:] typed_view = buffer
+        return self._decompress_to(nchunk, &typed_view[0], typed_view.shape[0], nthreads)
+
+    def get_slice(self, start=0, stop=None, dst=None):
+        cdef int32_t typesize = self.schunk.typesize
+        nitems = self.schunk.nbytes // typesize
+        start, stop, _ = slice(start, stop, 1).indices(nitems)
+        if stop < start:
+            stop = start
+        cdef int64_t start_ = start
+        cdef int64_t stop_ = stop
+        cdef int64_t nbytes = (stop_ - start_) * typesize
+        cdef uint8_t[:] typed_view_dst
+        cdef uint8_t *_dst = NULL
+        return_dst = dst is None
+        if not return_dst:
             mem_view_dst = memoryview(dst)
             typed_view_dst = mem_view_dst.cast('B')
-            if len(typed_view_dst) == 0:
-                raise ValueError("The dst length must be greater than 0")
-            size = blosc2_schunk_decompress_chunk(self.schunk, nchunk, <void*>&typed_view_dst[0], typed_view_dst.nbytes)
+            if typed_view_dst.nbytes < nbytes:
+                raise ValueError("The dst length must be at least %d bytes" % nbytes)
+            if nbytes > 0:
+                _dst = &typed_view_dst[0]
         else:
             dst = PyBytes_FromStringAndSize(NULL, nbytes)
             if dst is None:
                 raise RuntimeError("Could not get a bytes object")
-            size = blosc2_schunk_decompress_chunk(self.schunk, nchunk, <void*><char *>dst, nbytes)
-            if size >= 0:
-                return dst
-
-        if size < 0:
-            raise RuntimeError("Error while decompressing the specified chunk")
+            _dst = <uint8_t*> <char*> dst
+        if nbytes == 0:
+            return dst if return_dst else None
+
+        cdef DecompressionContext dctx = self._pop_dctx()
+        cdef int64_t *filter_nchunk = NULL
+        if dctx._filter is not None:
+            filter_nchunk = &dctx._filter.nchunk
+        cdef int rc
+        with nogil:
+            rc = _schunk_get_slice(self.schunk, self.lock, dctx.dctx, start_, stop_, _dst, filter_nchunk)
+        self._push_dctx(dctx)
+        if rc < 0:
+            if dctx._filter is not None:
+                dctx._filter.raise_error()
+            raise RuntimeError("Error while getting the slice")
+        if return_dst:
+            return dst
 
     def get_chunk(self, nchunk):
-        cdef uint8_t[:] typed_view_dst
         cdef uint8_t *chunk
-        cdef bool needs_free
-        cbytes = blosc2_schunk_get_chunk(self.schunk, nchunk, &chunk, &needs_free)
+        cdef int64_t nchunk_ = nchunk
+        cdef int cbytes
+        with nogil:
+            cbytes = _schunk_get_own_chunk(self.schunk, self.lock, nchunk_, False, &chunk)
         if cbytes < 0:
            raise RuntimeError("Error while getting the chunk")
         ret_chunk = PyBytes_FromStringAndSize(<char*>chunk, cbytes)
-        if needs_free:
-            free(chunk)
+        free(chunk)
         return ret_chunk
 
     def delete_chunk(self, nchunk):
-        rc = blosc2_schunk_delete_chunk(self.schunk, nchunk)
+        _check_frame_not_shared(self.schunk)
+        cdef int64_t nchunk_ = nchunk
+        cdef int64_t rc
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            rc = blosc2_schunk_delete_chunk(self.schunk, nchunk_)
+            PyThread_release_lock(self.lock)
         if rc < 0:
             raise RuntimeError("Could not delete the desired chunk")
         return rc
 
     def insert_chunk(self, nchunk, chunk):
+        _check_frame_not_shared(self.schunk)
         cdef const uint8_t[:] typed_view_chunk
         mem_view_chunk = memoryview(chunk)
         typed_view_chunk = mem_view_chunk.cast('B')
         _check_comp_length('chunk', len(typed_view_chunk))
-        rc = blosc2_schunk_insert_chunk(self.schunk, nchunk, &typed_view_chunk[0], True)
+        cdef int64_t nchunk_ = nchunk
+        cdef uint8_t *_chunk = <uint8_t*> &typed_view_chunk[0]
+        cdef int64_t rc
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            rc = blosc2_schunk_insert_chunk(self.schunk, nchunk_, _chunk, True)
+            PyThread_release_lock(self.lock)
         if rc < 0:
             raise RuntimeError("Could not insert the desired chunk")
         return rc
 
     def insert_data(self, nchunk, data, copy):
-        cdef blosc2_context *cctx
+        _check_frame_not_shared(self.schunk)
+        tuned = self._tune(data)
         cdef Py_buffer *buf = <Py_buffer *> malloc(sizeof(Py_buffer))
         PyObject_GetBuffer(data, buf, PyBUF_SIMPLE)
         cdef int size
         cdef int32_t len_chunk = <int32_t> (buf.len + BLOSC2_MAX_OVERHEAD)
         cdef uint8_t* chunk = <uint8_t*> malloc(len_chunk)
+        cdef int64_t nchunk_ = nchunk
         with nogil:
-            cctx = blosc2_create_cctx(self.schunk.storage.cparams[0])
-            size = blosc2_compress_ctx(cctx, buf.buf, <int32_t> buf.len, chunk, len_chunk)
-            blosc2_free_ctx(cctx)
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            # The nchunk reported to the prefilter
+            self.schunk.current_nchunk = nchunk_
+            size = blosc2_compress_ctx(self.schunk.cctx, buf.buf, <int32_t> buf.len, chunk, len_chunk)
+            PyThread_release_lock(self.lock)
         PyBuffer_Release(buf)
         free(buf)
         if size < 0:
+            free(chunk)
+            self._raise_prefilter_error()
             raise RuntimeError("Could not compress the data")
         elif size == 0:
             free(chunk)
@@ -792,37 +2824,57 @@ cdef class SChunk:
 
         chunk = <uint8_t*> realloc(chunk, size)
         _check_comp_length('chunk', size)
-        rc = blosc2_schunk_insert_chunk(self.schunk, nchunk, chunk, copy)
+        cdef bool copy_ = copy
+        cdef int64_t rc
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            rc = blosc2_schunk_insert_chunk(self.schunk, nchunk_, chunk, copy_)
+            PyThread_release_lock(self.lock)
         if copy:
             free(chunk)
         if rc < 0:
             raise RuntimeError("Could not insert the desired chunk")
+        if tuned is not None:
+            self._tuner._record(tuned, nchunk=nchunk)
         return rc
 
     def update_chunk(self, nchunk, chunk):
+        _check_frame_not_shared(self.schunk)
         cdef const uint8_t[:] typed_view_chunk
         mem_view_chunk = memoryview(chunk)
         typed_view_chunk = mem_view_chunk.cast('B')
         _check_comp_length('chunk', len(typed_view_chunk))
-        rc = blosc2_schunk_update_chunk(self.schunk, nchunk, &typed_view_chunk[0], True)
+        cdef int64_t nchunk_ = nchunk
+        cdef uint8_t *_chunk = <uint8_t*> &typed_view_chunk[0]
+        cdef int64_t rc
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            rc = blosc2_schunk_update_chunk(self.schunk, nchunk_, _chunk, True)
+            PyThread_release_lock(self.lock)
         if rc < 0:
             raise RuntimeError("Could not update the desired chunk")
         return rc
 
     def update_data(self, nchunk, data, copy):
-        cdef blosc2_context *cctx
+        _check_frame_not_shared(self.schunk)
+        tuned = self._tune(data)
         cdef Py_buffer *buf = <Py_buffer *> malloc(sizeof(Py_buffer))
         PyObject_GetBuffer(data, buf, PyBUF_SIMPLE)
         cdef int size
         cdef int32_t len_chunk = <int32_t> (buf.len + BLOSC2_MAX_OVERHEAD)
         cdef uint8_t* chunk = <uint8_t*> malloc(len_chunk)
+        cdef int64_t nchunk_ = nchunk
         with nogil:
-            cctx = blosc2_create_cctx(self.schunk.storage.cparams[0])
-            size = blosc2_compress_ctx(cctx, buf.buf, <int32_t> buf.len, chunk, len_chunk)
-            blosc2_free_ctx(cctx)
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            # The nchunk reported to the prefilter
+            self.schunk.current_nchunk = nchunk_
+            size = blosc2_compress_ctx(self.schunk.cctx, buf.buf, <int32_t> buf.len, chunk, len_chunk)
+            PyThread_release_lock(self.lock)
         PyBuffer_Release(buf)
         free(buf)
         if size < 0:
+            free(chunk)
+            self._raise_prefilter_error()
             raise RuntimeError("Could not compress the data")
         elif size == 0:
             free(chunk)
@@ -830,41 +2882,372 @@ cdef class SChunk:
 
         chunk = <uint8_t*> realloc(chunk, size)
         _check_comp_length('chunk', size)
-        rc = blosc2_schunk_update_chunk(self.schunk, nchunk, chunk, copy)
+        cdef bool copy_ = copy
+        cdef int64_t rc
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            rc = blosc2_schunk_update_chunk(self.schunk, nchunk_, chunk, copy_)
+            PyThread_release_lock(self.lock)
         if copy:
             free(chunk)
         if rc < 0:
             raise RuntimeError("Could not update the desired chunk")
+        if tuned is not None:
+            self._tuner._record(tuned, nchunk=nchunk)
+        return rc
+
+    def to_cframe(self, copy=False):
+        cdef uint8_t *cframe
+        cdef bool needs_free
+        cdef int64_t len_cframe
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            len_cframe = blosc2_schunk_to_buffer(self.schunk, &cframe, &needs_free)
+            PyThread_release_lock(self.lock)
+        if len_cframe < 0:
+            raise RuntimeError("Error while getting the cframe")
+        if copy:
+            out = PyBytes_FromStringAndSize(<char*>cframe, len_cframe)
+            if needs_free:
+                free(cframe)
+            return out
+        cdef _FrameBuffer frame_buffer = _FrameBuffer.__new__(_FrameBuffer)
+        frame_buffer.cframe = cframe
+        frame_buffer.len = len_cframe
+        frame_buffer.needs_free = needs_free
+        if not needs_free:
+            # The buffer is the frame of this super-chunk itself
+            frame_buffer.schunk = self
+            _share_frame(self.schunk)
+        return memoryview(frame_buffer)
+
+    def copy(self, **kwargs):
+        urlpath = kwargs.get("urlpath", None)
+        if urlpath is not None:
+            urlpath = urlpath.encode() if isinstance(urlpath, str) else urlpath
+            if self.schunk.storage.urlpath != NULL and urlpath == self.schunk.storage.urlpath:
+                raise ValueError("Cannot copy the SChunk into its own urlpath")
+            _remove_urlpath(urlpath, kwargs.get("io", None))
+            kwargs["urlpath"] = urlpath
+        # The params not passed are the same than in this super-chunk
+        cparams = _cparams_to_dict(self.schunk.storage.cparams)
+        cparams.update(kwargs.get("cparams", None) or {})
+        if cparams["codec"] != blosc2.Codec.ZSTD and "dict" not in (kwargs.get("cparams", None) or {}):
+            # The dictionary only goes with ZSTD
+            cparams["dict"] = None
+        dparams = {"nthreads": self.schunk.storage.dparams.nthreads}
+        dparams.update(kwargs.get("dparams", None) or {})
+        kwargs["cparams"] = cparams
+        kwargs["dparams"] = dparams
+        kwargs.setdefault("contiguous", self.schunk.storage.contiguous)
+
+        cdef blosc2_storage storage
+        cdef blosc2_cparams ccparams
+        cdef blosc2_dparams cdparams
+        cdef blosc2_io cio
+        storage.cparams = &ccparams
+        storage.dparams = &cdparams
+        storage.io = &cio
+        dict_refs = create_storage(&storage, kwargs)
+        cdef blosc2_schunk *new_schunk = blosc2_schunk_new(&storage)
+        if new_schunk == NULL:
+            raise RuntimeError("Could not create the new SChunk")
+        new_schunk.chunksize = self.schunk.chunksize
+        # Wrap it right away, so that it is freed on errors
+        schunk = blosc2.SChunk(schunk=PyCapsule_New(new_schunk, <char *> "blosc2_schunk*", NULL), **kwargs)
+        (<SChunk> schunk)._dicts.extend(dict_refs)
+
+        cdef blosc2_metalayer *meta
+        for i in range(self.schunk.nmetalayers):
+            meta = self.schunk.metalayers[i]
+            if meta.name == _DICT_META.encode():
+                continue
+            if blosc2_meta_add(new_schunk, meta.name, meta.content, meta.content_len) < 0:
+                raise RuntimeError("Could not copy the metalayers")
+        if cparams["dict"] is not None:
+            dict_name = _DICT_META.encode()
+            dict_meta = packb(bytes(cparams["dict"]))
+            if blosc2_meta_add(new_schunk, dict_name, dict_meta, len(dict_meta)) < 0:
+                raise RuntimeError("Could not add the dictionary")
+
+        cdef uint8_t *chunk
+        cdef bool needs_free
+        cdef int64_t nchunk
+        cdef int64_t nchunks = self.schunk.nchunks
+        cdef int64_t rc = 0
+        cdef SChunk new = schunk
+        if new._tuner is not None:
+            # The tuner chooses the cparams chunk by chunk, for the data as stored (no postfilter)
+            dctx = blosc2.DecompressionContext()
+            cctxs = {}
+            for nchunk in range(nchunks):
+                data = dctx.decompress(self.get_chunk(nchunk))
+                tuned = new._tune(data)
+                rc = new._append_compressed(_tuned_cctx(cctxs, cparams, tuned).compress(data))
+                new._tuner._record(tuned, nchunk=rc - 1)
+        elif _same_chunk_format(self.schunk.storage.cparams, &ccparams):
+            # The chunks can be copied in compressed form
+            with nogil:
+                PyThread_acquire_lock(self.lock, WAIT_LOCK)
+                for nchunk in range(nchunks):
+                    rc = blosc2_schunk_get_chunk(self.schunk, nchunk, &chunk, &needs_free)
+                    if rc < 0:
+                        break
+                    rc = blosc2_schunk_append_chunk(new_schunk, chunk, not needs_free)
+                    if rc < 0:
+                        if needs_free:
+                            free(chunk)
+                        break
+                PyThread_release_lock(self.lock)
+            if rc < 0:
+                raise RuntimeError("Could not copy the chunks")
+        else:
+            self._recompress_into(schunk, cparams)
+
+        cdef uint8_t *content
+        cdef int32_t content_len
+        for i in range(self.schunk.nvlmetalayers):
+            name = self.schunk.vlmetalayers[i].name
+            if blosc2_vlmeta_get(self.schunk, name, &content, &content_len) < 0:
+                raise RuntimeError("Could not get the vlmetalayers")
+            rc = blosc2_vlmeta_add(new_schunk, name, content, content_len, NULL)
+            free(content)
+            if rc < 0:
+                raise RuntimeError("Could not copy the vlmetalayers")
+        return schunk
+
+    cdef _recompress_into(self, SChunk schunk, dict cparams):
+        # Decompress and recompress the chunks in parallel (a chunk per thread), and append them in order.
+        # The number of chunks in flight is bounded, so that memory usage does not grow with the SChunk.
+        nthreads = max(cparams["nthreads"], 1)
+        cparams = dict(cparams, nthreads=1)
+        local = threading.local()
+
+        def recompress(nchunk):
+            if not hasattr(local, "cctx"):
+                local.cctx = blosc2.CompressionContext(**cparams)
+                # Not the dctxs of this super-chunk, as the copy gets the data as stored (no postfilter)
+                local.dctx = blosc2.DecompressionContext()
+            return local.cctx.compress(local.dctx.decompress(self.get_chunk(nchunk)))
+
+        schunk._append_in_order(recompress, self.schunk.nchunks, nthreads, 2 * nthreads)
+
+    cdef _append_in_order(self, func, int64_t nchunks, nthreads, max_pending):
+        # Run func(i) for every i in range(nchunks) in a thread pool, and append the chunks compressed
+        # by it in order.  At most max_pending chunks are in flight, so that memory usage does not grow
+        # with nchunks.
+        with ThreadPoolExecutor(max_workers=nthreads) as executor:
+            pending = deque()
+            for i in range(nchunks):
+                pending.append(executor.submit(func, i))
+                if len(pending) >= max_pending:
+                    self._append_compressed(pending.popleft().result())
+            while pending:
+                self._append_compressed(pending.popleft().result())
+
+    cdef _append_compressed(self, chunk):
+        cdef const uint8_t[:] typed_view_chunk = chunk
+        cdef uint8_t *chunk_ = <uint8_t*> &typed_view_chunk[0]
+        cdef int64_t rc
+        with nogil:
+            PyThread_acquire_lock(self.lock, WAIT_LOCK)
+            rc = blosc2_schunk_append_chunk(self.schunk, chunk_, True)
+            PyThread_release_lock(self.lock)
+        if rc < 0:
+            raise RuntimeError("Could not append the chunk")
         return rc
 
     def __dealloc__(self):
+        # Free the decompression contexts before the super-chunk they point to
+        self.dctx_pool = None
+        if self._cframe is not None:
+            _unshare_frame(self.schunk)
+            self._cframe = None
         if self.schunk != NULL:
             blosc2_schunk_free(self.schunk)
+            self.schunk = NULL
+        if self.lock != NULL:
+            PyThread_free_lock(self.lock)
+            self.lock = NULL
+
+
+cdef class _FrameBuffer:
+    # Exposes a cframe through the buffer protocol, without copying it
+    cdef uint8_t *cframe
+    cdef int64_t len
+    cdef bool needs_free
+    # The super-chunk whose frame is exposed, if the buffer is not owned
+    cdef SChunk schunk
+
+    def __getbuffer__(self, Py_buffer *buffer, int flags):
+        PyBuffer_FillInfo(buffer, self, self.cframe, self.len, 1, flags)
+
+    def __releasebuffer__(self, Py_buffer *buffer):
+        pass
+
+    def __dealloc__(self):
+        if self.needs_free:
+            free(self.cframe)
+        if self.schunk is not None:
+            _unshare_frame(self.schunk.schunk)
+            self.schunk = None
+
+
+cdef _schunk_from_buffer(cframe, bint copy, kwargs):
+    cdef const uint8_t[:] typed_view
+    mem_view = memoryview(cframe)
+    typed_view = mem_view.cast('B')
+    if typed_view.nbytes == 0:
+        raise ValueError("The cframe cannot be empty")
+    cdef blosc2_schunk *schunk_ = blosc2_schunk_from_buffer(<uint8_t*>&typed_view[0], typed_view.nbytes, copy)
+    if schunk_ == NULL:
+        raise RuntimeError("Could not get the schunk from the cframe")
+    schunk = blosc2.SChunk(schunk=PyCapsule_New(schunk_, <char *> "blosc2_schunk*", NULL), **kwargs)
+    if not copy:
+        # Keep the buffer alive (and unresizable) for as long as the super-chunk uses it
+        (<SChunk>schunk)._cframe = mem_view
+        _share_frame(schunk_)
+    return schunk
+
+
+def schunk_from_cframe(cframe, copy=False):
+    return _schunk_from_buffer(cframe, copy, {})
 
 
 def remove_urlpath(path):
     blosc2_remove_urlpath(path)
 
 
-cdef class vlmeta:
+cdef class meta:
     cdef blosc2_schunk* schunk
     def __init__(self, schunk):
         self.schunk = <blosc2_schunk*> <uintptr_t>schunk
 
-    def set_vlmeta(self, name, content, **cparams):
-        cdef blosc2_cparams ccparams
-        create_cparams_from_kwargs(&ccparams, cparams)
+    cdef int _find(self, name) except -2:
+        # The index of the metalayer (or -1 if it does not exist), without the errors of C-Blosc2
         name = name.encode("utf-8") if isinstance(name, str) else name
-        content = content.encode("utf-8") if isinstance(content, str) else content
-        cdef uint32_t len_content = <uint32_t> len(content)
-        rc = blosc2_vlmeta_exists(self.schunk, name)
-        if rc >= 0:
-            rc = blosc2_vlmeta_update(self.schunk, name, <uint8_t*> content, len_content, &ccparams)
+        for i in range(self.schunk.nmetalayers):
+            if self.schunk.metalayers[i].name == name:
+                return i
+        return -1
+
+    def meta_exists(self, name):
+        return self._find(name) >= 0
+
+    def get_meta(self, name):
+        # The content is read straight from the schunk, without the copy of blosc2_meta_get()
+        cdef int n = self._find(name)
+        if n < 0:
+            raise KeyError(name)
+        cdef blosc2_metalayer *layer = self.schunk.metalayers[n]
+        return PyBytes_FromStringAndSize(<char*> layer.content, layer.content_len)
+
+    def set_meta(self, name, content):
+        _check_frame_not_shared(self.schunk)
+        name = name.encode("utf-8") if isinstance(name, str) else name
+        cdef const uint8_t[:] typed_view = memoryview(content).cast("B")
+        cdef int32_t content_len = typed_view.nbytes
+        cdef uint8_t *content_ = &typed_view[0] if content_len > 0 else NULL
+        cdef int n = self._find(name)
+        cdef int rc
+        if n >= 0:
+            if content_len != self.schunk.metalayers[n].content_len:
+                raise ValueError(f"The size of the metalayer {name.decode()!r} cannot change "
+                                 f"({self.schunk.metalayers[n].content_len} bytes)")
+            # Only the header of the frame is rewritten, as the size does not change
+            rc = blosc2_meta_update(self.schunk, name, content_, content_len)
+        else:
+            if len(name) > BLOSC2_METALAYER_NAME_MAXLEN:
+                raise ValueError(f"Metalayer names cannot be longer than "
+                                 f"{BLOSC2_METALAYER_NAME_MAXLEN} chars")
+            if self.schunk.nmetalayers >= BLOSC2_MAX_METALAYERS:
+                raise ValueError(f"A SChunk cannot have more than {BLOSC2_MAX_METALAYERS} metalayers")
+            if self.schunk.frame != NULL and self.schunk.cbytes > 0:
+                raise ValueError("Metalayers cannot be added to a frame once it has data")
+            rc = blosc2_meta_add(self.schunk, name, content_, content_len)
+        if rc < 0:
+            raise RuntimeError(f"Could not set the metalayer {name.decode()!r}")
+
+    def nmetalayers(self):
+        return self.schunk.nmetalayers
+
+    def get_names(self):
+        return [self.schunk.metalayers[i].name.decode() for i in range(self.schunk.nmetalayers)]
+
+
+cdef class vlmeta:
+    cdef blosc2_schunk* schunk
+    # The lock of the SChunk, for the writes that change its frame
+    cdef PyThread_type_lock lock
+
+    def __init__(self, schunk):
+        if isinstance(schunk, SChunk):
+            self.schunk = (<SChunk> schunk).schunk
+            self.lock = (<SChunk> schunk).lock
         else:
-            rc = blosc2_vlmeta_add(self.schunk, name,  <uint8_t*> content, len_content, &ccparams)
+            self.schunk = <blosc2_schunk*> <uintptr_t>schunk
+            self.lock = NULL
+
+    cdef int _set_vlmeta(self, name, content, blosc2_cparams *ccparams):
+        cdef uint32_t len_content = <uint32_t> len(content)
+        if blosc2_vlmeta_exists(self.schunk, name) >= 0:
+            return blosc2_vlmeta_update(self.schunk, name, <uint8_t*> content, len_content, ccparams)
+        return blosc2_vlmeta_add(self.schunk, name, <uint8_t*> content, len_content, ccparams)
+
+    cdef _acquire(self):
+        if self.lock != NULL:
+            with nogil:
+                PyThread_acquire_lock(self.lock, WAIT_LOCK)
+
+    cdef _release(self):
+        if self.lock != NULL:
+            PyThread_release_lock(self.lock)
+
+    def set_vlmeta(self, name, content, **cparams):
+        self.set_vlmeta_many([(name, content)], **cparams)
+
+    def set_vlmeta_many(self, items, **cparams):
+        # Set several vlmetalayers, flushing them to the frame (if any) just once
+        _check_frame_not_shared(self.schunk)
+        cdef blosc2_cparams ccparams
+        dict_ref = create_cparams_from_kwargs(&ccparams, cparams)
+        items = [(name.encode("utf-8") if isinstance(name, str) else name,
+                  content.encode("utf-8") if isinstance(content, str) else content)
+                 for name, content in items]
+        nnew = 0
+        for name, _ in items:
+            if len(name) > BLOSC2_METALAYER_NAME_MAXLEN:
+                raise ValueError(f"Metalayer names cannot be longer than "
+                                 f"{BLOSC2_METALAYER_NAME_MAXLEN} chars")
+            nnew += blosc2_vlmeta_exists(self.schunk, name) < 0
+        # The trailer of the frames has room for BLOSC2_MAX_METALAYERS vlmetalayers only
+        max_vlmetalayers = BLOSC2_MAX_VLMETALAYERS if self.schunk.frame == NULL else BLOSC2_MAX_METALAYERS
+        if self.schunk.nvlmetalayers + nnew > max_vlmetalayers:
+            raise ValueError(f"This SChunk cannot have more than {max_vlmetalayers} vlmetalayers")
+        if not items:
+            return
 
+        cdef blosc2_frame *frame = self.schunk.frame
+        cdef int rc = 0
+        self._acquire()
+        try:
+            # C-Blosc2 rewrites the frame trailer for every vlmetalayer set, so the frame is
+            # detached (under the lock) but for the last one, which flushes all of them
+            self.schunk.frame = NULL
+            for name, content in items[:-1]:
+                rc = self._set_vlmeta(name, content, &ccparams)
+                if rc < 0:
+                    break
+            self.schunk.frame = frame
+            name, content = items[-1]
+            # On errors, the last vlmetalayer is still set for flushing the previous ones
+            if self._set_vlmeta(name, content, &ccparams) < 0:
+                rc = -1
+        finally:
+            self.schunk.frame = frame
+            self._release()
         if rc < 0:
-            raise RuntimeError
+            raise RuntimeError("Could not set the vlmetalayers")
 
     def get_vlmeta(self, name):
         name = name.encode("utf-8") if isinstance(name, str) else name
@@ -872,16 +3255,23 @@ cdef class vlmeta:
         cdef uint8_t* content
         cdef int32_t content_len
         if rc < 0:
-            raise KeyError
-        if rc >= 0:
-            rc = blosc2_vlmeta_get(self.schunk, name, &content, &content_len)
+            raise KeyError(name.decode("utf-8"))
+        rc = blosc2_vlmeta_get(self.schunk, name, &content, &content_len)
         if rc < 0:
             raise RuntimeError
-        return content[:content_len]
+        try:
+            return content[:content_len]
+        finally:
+            free(content)
 
     def del_vlmeta(self, name):
+        _check_frame_not_shared(self.schunk)
         name = name.encode("utf-8") if isinstance(name, str) else name
-        rc = blosc2_vlmeta_delete(self.schunk, name)
+        self._acquire()
+        try:
+            rc = blosc2_vlmeta_delete(self.schunk, name)
+        finally:
+            self._release()
         if rc < 0:
             raise RuntimeError("Could not delete the vlmeta")
 
@@ -889,27 +3279,24 @@ cdef class vlmeta:
         return self.schunk.nvlmetalayers
 
     def get_names(self):
-        cdef char** names = <char **> malloc(self.schunk.nvlmetalayers * sizeof (char *))
-        rc = blosc2_vlmeta_get_names(self.schunk, names)
-        if rc != self.schunk.nvlmetalayers:
-            raise RuntimeError
-        res = [names[i].decode() for i in range(rc)]
-        return res
+        # The names are owned by the schunk, so there is no need for blosc2_vlmeta_get_names()
+        return [self.schunk.vlmetalayers[i].name.decode() for i in range(self.schunk.nvlmetalayers)]
 
     def to_dict(self):
-        cdef char** names = <char **> malloc(self.schunk.nvlmetalayers * sizeof (char*))
-        rc = blosc2_vlmeta_get_names(self.schunk, names)
-        if rc != self.schunk.nvlmetalayers:
-            raise RuntimeError
-        res = {}
-        for i in range(rc):
-            res[names[i]] = unpackb(self.get_vlmeta(names[i]))
-        return res
+        return {name: unpackb(self.get_vlmeta(name)) for name in self.get_names()}
 
 
 def schunk_open(urlpath, mode, **kwargs):
     urlpath = urlpath.encode("utf-8") if isinstance(urlpath, str) else urlpath
-    cdef blosc2_schunk* schunk = blosc2_schunk_open(urlpath)
+    cdef blosc2_schunk* schunk
+    cdef blosc2_io io
+    backend = kwargs.get("io", None)
+    if backend is None:
+        schunk = blosc2_schunk_open(urlpath)
+    else:
+        backend = kwargs["io"] = _PythonIO(backend)
+        _set_python_io(&io, backend)
+        schunk = blosc2_schunk_open_udio(urlpath, &io)
     if schunk == NULL:
         raise RuntimeError(f'blosc2_schunk_open({urlpath!r}) returned NULL')
     kwargs["urlpath"] = urlpath
@@ -919,6 +3306,25 @@ def schunk_open(urlpath, mode, **kwargs):
     return blosc2.SChunk(schunk=PyCapsule_New(schunk, <char *> "blosc2_schunk*", NULL), mode=mode, **kwargs)
 
 
+def schunk_open_mmap(urlpath, mode, **kwargs):
+    # The frame file is mapped and used in place, so that chunks are decompressed straight from
+    # the page cache, which is shared by all the processes mapping the same file
+    if mode != "r":
+        raise ValueError("A SChunk can only be memory-mapped in reading mode")
+    if os.path.isdir(urlpath):
+        raise ValueError("Only contiguous frames (files) can be memory-mapped")
+    if kwargs.get("io", None) is not None:
+        raise ValueError("Only the frames in the local filesystem can be memory-mapped")
+    with io.open(urlpath, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    kwargs["urlpath"] = urlpath.encode("utf-8") if isinstance(urlpath, str) else urlpath
+    kwargs["contiguous"] = True
+    kwargs["mode"] = mode
+    schunk = _schunk_from_buffer(mapping, False, kwargs)
+    _check_schunk_params((<SChunk>schunk).schunk, kwargs)
+    return schunk
+
+
 def _check_access_mode(urlpath, mode):
     if urlpath is not None and mode == "r":
         raise ValueError("Cannot do this action with reading mode")
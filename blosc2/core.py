@@ -5,9 +5,13 @@
 ########################################################################
 
 
+import collections
+import itertools
 import os
 import pickle
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import blosc2
 from blosc2 import blosc2_ext
@@ -84,6 +88,10 @@ def compress(src, typesize=None, clevel=9, filter=blosc2.Filter.SHUFFLE, codec=b
     have to be used instead of the python-blosc API variables such as `blosc.SHUFFLE` for :paramref:`filter`
     or strings like "blosclz" for :paramref:`codec`.
 
+    This function does not modify any global state (e.g. the compressor set via
+    :func:`~blosc2.set_compressor`): internally, a compression context is cached
+    per Python thread, so it is safe to call it from different threads at the same time.
+
     Examples
     --------
     >>> import array, sys
@@ -176,6 +184,53 @@ def decompress(src, dst=None, as_bytearray=False):
     return blosc2_ext.decompress(src, dst, as_bytearray)
 
 
+def getitem(src, start, nitems, dst=None):
+    """Get :paramref:`nitems` items, starting at :paramref:`start`, out of a compressed buffer.
+
+    Only the blocks containing the items requested are decompressed, so this is
+    much faster than decompressing the whole buffer when just a few items are needed.
+
+    Parameters
+    ----------
+    src : bytes-like object
+        The compressed data (as returned by e.g. :func:`~blosc2.compress` or
+        :func:`~blosc2.compress2`).
+    start : int
+        The position of the first item (of `typesize` size) to get.
+    nitems : int
+        The number of items (of `typesize` size) to get.
+    dst : NumPy object or bytearray
+        The destination NumPy object or bytearray to fill, which must have
+        enough capacity for hosting the items. Default is None, meaning that
+        a new bytes object is created, filled and returned.
+
+    Returns
+    -------
+    out : str/bytes
+        The items requested in form of a Python str / bytes object if
+        :paramref:`dst` is `None`. Otherwise, it will return `None` because the result
+        will already be in :paramref:`dst`.
+
+    Raises
+    ------
+    ValueError
+        If the items requested are out of the bounds of :paramref:`src`.
+        If :paramref:`dst` is too small.
+    RuntimeError
+        If the items could not be retrieved.
+
+    Examples
+    --------
+    >>> import numpy
+    >>> a = numpy.arange(1000 * 1000, dtype="int64")
+    >>> c = blosc2.compress(a)
+    >>> items = blosc2.getitem(c, 500_000, 10)
+    >>> numpy.array_equal(numpy.frombuffer(items, dtype="int64"), a[500_000:500_010])
+    True
+    """
+    return blosc2_ext.getitem(src, start, nitems, dst)
+
+
 def pack(obj, clevel=9, filter=blosc2.Filter.SHUFFLE, codec=blosc2.Codec.BLOSCLZ):
     """Pack (compress) a Python object.
 
@@ -410,6 +465,9 @@ def set_compressor(codec):
     -----
     The `compname` parameter in python-blosc API has been replaced by :paramref:`codec` , using `compname`
     as parameter or a string as a :paramref:`codec` value will not work.
+
+    The :func:`~blosc2.compress` and :func:`~blosc2.pack` family always use the
+    :paramref:`codec` passed to them, so they are not affected by this setting.
     """
     return blosc2_ext.set_compressor(codec)
 
@@ -552,8 +610,12 @@ def get_compressor():
 def set_releasegil(gilstate):
     """
     Sets a boolean on whether to release the Python global inter-lock (GIL)
-    during c-blosc compress and decompress operations or not.  This defaults
-    to False.
+    during :func:`~blosc2.compress` and :func:`~blosc2.decompress` operations
+    or not.  This defaults to False.
+
+    The rest of the operations that are heavy on the C side (e.g.
+    :func:`~blosc2.compress2`, :func:`~blosc2.decompress2` or the
+    :class:`~blosc2.SChunk` methods) always release the GIL.
 
     Parameters
     ----------
@@ -675,8 +737,11 @@ def compress2(src, **kwargs):
     kwargs: dict, optional
         Keyword arguments supported:
 
-            codec: :class:`Codec`
+            codec: :class:`Codec` or "auto"
                 The compressor code. Default is :py:obj:`Codec.BLOSCLZ <Codec>`.
+                With "auto", the codec (and the `clevel` and `filters`, unless they
+                are given) with the best balance of speed and ratio for :paramref:`src`
+                is chosen, from the estimates of :func:`~blosc2.estimate`.
             codec_meta: int
                 The metadata for the compressor code, 0 by default.
             clevel: int
@@ -698,6 +763,16 @@ def compress2(src, **kwargs):
                 The sequence of filters. By default: {0, 0, 0, 0, 0, :py:obj:`Filter.SHUFFLE <Filter>`}.
             filters_meta: list
                 The metadata for filters. By default: `{0, 0, 0, 0, 0, 0}`.
+            tuner: :class:`TuneMode` or :class:`Tuner`
+                If given, the `codec`, `clevel`, `filters` and `filters_meta`
+                are chosen for :paramref:`src` by the tuner (a new one for a
+                :class:`TuneMode`).  Pass the same :class:`Tuner` for compressing
+                many buffers, so that the candidates are not tried for every one.
+                By default `None`.
+            dict: bytes-like object
+                A dictionary from :func:`~blosc2.train_dict` for compressing with
+                :py:obj:`Codec.ZSTD <Codec>`, which is needed for decompressing too.
+                By default `None`.
 
     Returns
     -------
@@ -710,11 +785,22 @@ def compress2(src, **kwargs):
         If the data cannot be compressed into `dst`.
         If an internal error occurred, probably because some
         parameter is not a valid parameter.
+    TypeError
+        If the `tuner` is not a :class:`TuneMode` or a :class:`Tuner`.
     """
-    return blosc2_ext.compress2(src, **kwargs)
-
-
-def decompress2(src, dst=None, **kwargs):
+    tuner = kwargs.pop("tuner", None)
+    if tuner is None:
+        if kwargs.get("codec", None) == "auto":
+            kwargs.update(_auto_cparams(src, kwargs))
+        return blosc2_ext.compress2(src, **kwargs)
+    tuner = _as_tuner(tuner)
+    cparams = tuner.next_cparams(src, kwargs.get("typesize", blosc2.cparams_dflts["typesize"]))
+    dest = blosc2_ext.compress2(src, **dict(kwargs, **cparams))
+    tuner._record(cparams, nbytes=memoryview(src).nbytes, cbytes=len(dest))
+    return dest
+
+
+def decompress2(src, dst=None, maskout=None, **kwargs):
     """Compress :paramref:`src` with the given compression params (if given)
 
     Parameters
@@ -729,6 +815,11 @@ def decompress2(src, dst=None, **kwargs):
         that it has enough capacity for hosting the decompressed
         data. Default is `None`, meaning that a new bytes object
         is created, filled and returned.
+    maskout: NumPy bool array or sequence of bools
+        A mask with one item per block in :paramref:`src`. The blocks whose
+        item is `True` are masked out, i.e. they are not decompressed, and their
+        area in :paramref:`dst` is left untouched (or zeroed if :paramref:`dst`
+        is `None`). Default is `None`, meaning that all the blocks are decompressed.
 
     Other Parameters
     ----------------
@@ -736,6 +827,9 @@ def decompress2(src, dst=None, **kwargs):
         Keyword arguments supported:
         nthreads: int
         The number of threads to use internally (1 by default).
+        dict: bytes-like object
+        The dictionary used for compressing :paramref:`src` (see :func:`~blosc2.train_dict`),
+        if any.  It is remembered by the process, so passing it once is enough. By default `None`.
 
     Returns
     -------
@@ -756,8 +850,624 @@ def decompress2(src, dst=None, **kwargs):
     ValueError
         If the length of :paramref:`src` is smaller than the minimum.
         If :paramref:`dst` is not None and its length is 0.
+        If the length of :paramref:`maskout` does not match the number of blocks.
+
+    Examples
+    --------
+    >>> import numpy
+    >>> a = numpy.arange(10 * 1000, dtype="int32")
+    >>> c = blosc2.compress2(a, typesize=4, blocksize=4 * 1000)
+    >>> mask = numpy.array([True] * 5 + [False] * 5)
+    >>> res = numpy.frombuffer(blosc2.decompress2(c, maskout=mask), dtype="int32")
+    >>> res[[4999, 5000]].tolist()
+    [0, 5000]
+    """
+    return blosc2_ext.decompress2(src, dst, maskout, **kwargs)
+
+
+def compress_many(srcs, offsets=None, packed=False, **kwargs):
+    """Compress many independent buffers in a single call.
+
+    The compression params are checked once, and the buffers are compressed
+    by several threads at the same time (each buffer by a single one), with the
+    GIL released.  This is much faster than calling :func:`~blosc2.compress2`
+    for every buffer when they are small.
+
+    Parameters
+    ----------
+    srcs: sequence of bytes-like objects, or a bytes-like object
+        The buffers to be compressed.  If :paramref:`offsets` is given, a single
+        buffer with all of them, one after the other.
+    offsets: sequence of ints, optional
+        The offset (in bytes) of every buffer in :paramref:`srcs`, plus the end
+        of the last one.  The buffers may leave gaps among them, but not overlap.
+    packed: bool
+        Whether the compressed buffers are returned one after the other in a single
+        bytes object, together with their offsets, instead of in a list. Default is `False`.
+
+    Other Parameters
+    ----------------
+    kwargs: dict, optional
+        The compression params, as in :func:`~blosc2.compress2` (a `tuner` and
+        the "auto" codec excepted).  `nthreads` is the number of buffers compressed
+        at the same time.
+
+    Returns
+    -------
+    out: list of bytes, or tuple of bytes and NumPy array
+        The compressed buffers, which can be decompressed with :func:`~blosc2.decompress2`
+        or :func:`~blosc2.decompress_many`.  If :paramref:`packed` is True, a bytes object
+        with all of them, and an array with their offsets, plus its length.
+
+    Raises
+    ------
+    RuntimeError
+        If some buffer could not be compressed.
+    TypeError
+        If some buffer does not support the Buffer Protocol.
+    ValueError
+        If the :paramref:`offsets` are decreasing or outside of :paramref:`srcs`.
+        If some buffer is too large.
+        If the `typesize` or `clevel` are not within the allowed range, or there
+        is a `tuner` or the "auto" codec.
+
+    Examples
+    --------
+    >>> msgs = [b"message %d" % i * 10 for i in range(1000)]
+    >>> chunks = blosc2.compress_many(msgs, typesize=1)
+    >>> blosc2.decompress2(chunks[1]) == msgs[1]
+    True
+    >>> packed, offsets = blosc2.compress_many(msgs, typesize=1, packed=True)
+    >>> blosc2.decompress_many(packed, offsets) == msgs
+    True
     """
-    return blosc2_ext.decompress2(src, dst, **kwargs)
+    _check_typesize(kwargs.get("typesize", blosc2.cparams_dflts["typesize"]))
+    _check_clevel(kwargs.get("clevel", blosc2.cparams_dflts["clevel"]))
+    if kwargs.get("tuner", None) is not None or kwargs.get("codec", None) == "auto":
+        raise ValueError("A tuner or the 'auto' codec cannot be used with compress_many()")
+    return blosc2_ext.compress_many(srcs, offsets, packed, **kwargs)
+
+
+def decompress_many(srcs, offsets=None, packed=False, **kwargs):
+    """Decompress many buffers in a single call.
+
+    Like :func:`~blosc2.compress_many`, but for decompressing the buffers.
+
+    Parameters
+    ----------
+    srcs: sequence of bytes-like objects, or a bytes-like object
+        The compressed buffers.  If :paramref:`offsets` is given, a single
+        buffer with all of them, one after the other (e.g. as returned by
+        :func:`~blosc2.compress_many` with :paramref:`packed` set).
+    offsets: sequence of ints, optional
+        The offset (in bytes) of every buffer in :paramref:`srcs`, plus the end
+        of the last one.
+    packed: bool
+        Whether the decompressed buffers are returned one after the other in a single
+        bytes object, together with their offsets, instead of in a list. Default is `False`.
+
+    Other Parameters
+    ----------------
+    kwargs: dict, optional
+        The decompression params, as in :func:`~blosc2.decompress2`.  `nthreads`
+        is the number of buffers decompressed at the same time.
+
+    Returns
+    -------
+    out: list of bytes, or tuple of bytes and NumPy array
+        The decompressed buffers.  If :paramref:`packed` is True, a bytes object
+        with all of them, and an array with their offsets, plus its length.
+
+    Raises
+    ------
+    RuntimeError
+        If could not create a bytes object to store the result.
+    TypeError
+        If some buffer does not support the Buffer Protocol.
+    ValueError
+        If the :paramref:`offsets` are decreasing or outside of :paramref:`srcs`.
+        If some buffer is shorter than the minimum or could not be decompressed.
+
+    Examples
+    --------
+    >>> import numpy
+    >>> arrays = [numpy.arange(i, i + 1000, dtype="int64") for i in range(100)]
+    >>> chunks = blosc2.compress_many(arrays, typesize=8)
+    >>> out, offsets = blosc2.decompress_many(chunks, packed=True)
+    >>> numpy.array_equal(numpy.frombuffer(out, dtype="int64")[1000:2000], arrays[1])
+    True
+    >>> offsets[:3].tolist()
+    [0, 8000, 16000]
+    """
+    return blosc2_ext.decompress_many(srcs, offsets, packed, **kwargs)
+
+
+class CompressionContext(blosc2_ext.CompressionContext):
+    def __init__(self, **kwargs):
+        """Create a reusable compression context.
+
+        Contrarily to :func:`~blosc2.compress2`, which creates and frees a
+        new context (and its internal thread pool and temporaries) for every
+        call, this object keeps a single context alive for its whole lifetime,
+        so it can be used for compressing many buffers with the same parameters.
+
+        The context is protected by an internal lock, so it can be shared
+        between Python threads, although calls on the same context will be
+        serialized.  Use one context per thread for concurrent compression.
+
+        The compressed data is the same as with :func:`~blosc2.compress2`.  As
+        the blocksize actually used depends on the size of the buffer, the
+        context may be created again when the size changes, so it pays off the
+        most for buffers of the same size.
+
+        Other Parameters
+        ----------------
+        kwargs: dict, optional
+            The compression parameters, which are the same that can be
+            used in the :func:`~blosc2.compress2` function.
+
+        Raises
+        ------
+        RuntimeError
+            If the context could not be created.
+
+        Examples
+        --------
+        >>> import numpy
+        >>> cctx = blosc2.CompressionContext(typesize=4, clevel=5)
+        >>> a = numpy.arange(1000, dtype="int32")
+        >>> c = cctx.compress(a)
+        >>> len(c) < a.size * a.itemsize
+        True
+        """
+        super(CompressionContext, self).__init__(**kwargs)
+
+    def compress(self, src):
+        """Compress :paramref:`src` using this context.
+
+        Parameters
+        ----------
+        src: bytes-like object (supporting the buffer interface)
+            The data to be compressed.
+
+        Returns
+        -------
+        out: str/bytes
+            The compressed data in form of a Python str / bytes object.
+
+        Raises
+        ------
+        RuntimeError
+            If the data cannot be compressed.
+        """
+        return super(CompressionContext, self).compress(src)
+
+    def compress_into(self, src, dst):
+        """Compress :paramref:`src` into the preallocated :paramref:`dst` buffer.
+
+        Parameters
+        ----------
+        src: bytes-like object (supporting the buffer interface)
+            The data to be compressed.
+        dst: NumPy object or bytearray
+            The destination buffer.  For the compression to always succeed,
+            it should be at least `len(src) + blosc2.MAX_OVERHEAD` bytes long.
+
+        Returns
+        -------
+        out: int
+            The number of bytes written into :paramref:`dst`.
+
+        Raises
+        ------
+        RuntimeError
+            If the data cannot be compressed or the result does not fit in :paramref:`dst`.
+        ValueError
+            If the length of :paramref:`dst` is 0.
+
+        Examples
+        --------
+        >>> import numpy
+        >>> cctx = blosc2.CompressionContext(typesize=8)
+        >>> a = numpy.arange(1000)
+        >>> dst = bytearray(a.size * a.itemsize + blosc2.MAX_OVERHEAD)
+        >>> size = cctx.compress_into(a, dst)
+        >>> numpy.array_equal(numpy.frombuffer(blosc2.decompress2(dst[:size]), dtype=a.dtype), a)
+        True
+        """
+        return super(CompressionContext, self).compress_into(src, dst)
+
+
+class DecompressionContext(blosc2_ext.DecompressionContext):
+    def __init__(self, **kwargs):
+        """Create a reusable decompression context.
+
+        This is the decompression counterpart of :class:`~blosc2.CompressionContext`.
+
+        Other Parameters
+        ----------------
+        kwargs: dict, optional
+            The decompression parameters, which are the same that can be
+            used in the :func:`~blosc2.decompress2` function.
+
+        Raises
+        ------
+        RuntimeError
+            If the context could not be created.
+
+        Examples
+        --------
+        >>> cctx = blosc2.CompressionContext(typesize=1)
+        >>> dctx = blosc2.DecompressionContext(nthreads=2)
+        >>> dctx.decompress(cctx.compress(b"1" * 100)) == b"1" * 100
+        True
+        """
+        super(DecompressionContext, self).__init__(**kwargs)
+
+    def decompress(self, src, dst=None):
+        """Decompress :paramref:`src` using this context.
+
+        Parameters
+        ----------
+        src: bytes-like object
+            The data to be decompressed.
+        dst: NumPy object or bytearray
+            The destination NumPy object or bytearray to fill. Default is `None`,
+            meaning that a new bytes object is created, filled and returned.
+
+        Returns
+        -------
+        out: str/bytes
+            The decompressed data in form of a Python str / bytes object if
+            :paramref:`dst` is `None`. Otherwise, it will return `None` because the result
+            will already be in :paramref:`dst`.
+
+        Raises
+        ------
+        ValueError
+            If the length of :paramref:`src` is smaller than the minimum.
+            If :paramref:`dst` is not None and its length is 0.
+            If the data cannot be decompressed.
+        """
+        return super(DecompressionContext, self).decompress(src, dst)
+
+    def decompress_into(self, src, dst):
+        """Decompress :paramref:`src` into the preallocated :paramref:`dst` buffer.
+
+        Parameters
+        ----------
+        src: bytes-like object
+            The data to be decompressed.
+        dst: NumPy object or bytearray
+            The destination buffer, which must have enough capacity for
+            hosting the decompressed data.
+
+        Returns
+        -------
+        out: int
+            The number of bytes written into :paramref:`dst`.
+
+        Raises
+        ------
+        ValueError
+            If the length of :paramref:`src` is smaller than the minimum.
+            If the length of :paramref:`dst` is 0.
+            If the data cannot be decompressed.
+        """
+        return super(DecompressionContext, self).decompress_into(src, dst)
+
+
+def train_dict(samples, size=2 ** 16):
+    """Train a dictionary for compressing buffers like :paramref:`samples`.
+
+    Small buffers (a few KB) do not have enough data for learning their
+    repetitions, so they get poor compression ratios.  A dictionary trained on
+    typical buffers supplies those repetitions beforehand.  Pass it as the `dict`
+    in the compression params, along with :py:obj:`Codec.ZSTD <Codec>`, and as
+    the `dict` in the decompression params.  The dictionary of a :class:`SChunk`
+    is stored in its frame.
+
+    The data compressed with a dictionary uses a codec of python-blosc2 (with
+    the first id for user codecs), so it cannot be decompressed by C-Blosc2 or
+    other Blosc2 readers.
+
+    Parameters
+    ----------
+    samples: sequence of bytes-like objects
+        Buffers similar to the ones to be compressed. There should be many of them
+        (for a total of about 100 times :paramref:`size`).
+    size: int
+        The maximum size of the dictionary, in bytes. Default is 64 KB.
+
+    Returns
+    -------
+    out: bytes
+        The dictionary.
+
+    Raises
+    ------
+    RuntimeError
+        If the dictionary could not be trained (e.g. because there are too few samples).
+
+    Examples
+    --------
+    >>> msgs = [b'{"id": %d, "user": "user%d", "op": "get"}' % (i, i % 100) for i in range(10000)]
+    >>> d = blosc2.train_dict(msgs, 4096)
+    >>> c = blosc2.compress2(msgs[0], typesize=1, codec=blosc2.Codec.ZSTD, dict=d)
+    >>> blosc2.decompress2(c, dict=d) == msgs[0]
+    True
+    """
+    return blosc2_ext.train_dict(samples, size)
+
+
+def _candidate_cparams(codec, clevel, filter_):
+    return {
+        "codec": codec,
+        "clevel": clevel,
+        "filters": (blosc2.Filter.NOFILTER,) * 5 + (filter_,),
+        "filters_meta": (0,) * 6,
+    }
+
+
+def _default_candidates(codecs=None, clevels=None, filters=None):
+    codecs = list(blosc2.Codec) if codecs is None else codecs
+    clevels = [1, 5, 9] if clevels is None else clevels
+    filters = [blosc2.Filter.NOFILTER, blosc2.Filter.SHUFFLE, blosc2.Filter.BITSHUFFLE] if filters is None \
+        else filters
+    return [_candidate_cparams(*candidate) for candidate in itertools.product(codecs, clevels, filters)]
+
+
+def estimate(src, typesize=8, candidates=None, nsamples=4, sample_size=2 ** 15, nthreads=None):
+    """Estimate the compression ratio and speed of several compression params for :paramref:`src`.
+
+    Instead of compressing the whole :paramref:`src` with every candidate,
+    just :paramref:`nsamples` blocks of :paramref:`sample_size` bytes, spread
+    evenly over :paramref:`src`, are compressed and decompressed, and the
+    candidates are tried in parallel.  Hence, the estimates cost milliseconds,
+    even for large buffers.
+
+    Parameters
+    ----------
+    src: bytes-like object (supporting the buffer interface)
+        The data to be compressed.
+    typesize: int
+        The typesize of the data. Default is 8.
+    candidates: list of dicts, optional
+        The compression params to try, which are the same that can be used in
+        :func:`~blosc2.compress2` (`typesize` and `nthreads` excepted).  By default,
+        every codec with clevels 1, 5 and 9, and no filter, SHUFFLE or BITSHUFFLE.
+    nsamples: int
+        The number of blocks of :paramref:`src` compressed. Default is 4.
+    sample_size: int
+        The size of every block, in bytes. Default is 32 KB.
+    nthreads: int, optional
+        The number of candidates tried at the same time. Default is `blosc2.nthreads`.
+
+    Returns
+    -------
+    out: list of dicts
+        A copy of every candidate, with the estimated `cratio` and the speeds of
+        compression (`cspeed`) and decompression (`dspeed`), in MB/s per thread.
+
+    Raises
+    ------
+    ValueError
+        If :paramref:`src` is empty, or there are no candidates.
+        If :paramref:`nsamples`, :paramref:`sample_size` or :paramref:`nthreads` are not positive.
+
+    Notes
+    -----
+    The codecs meant for high compression ratios use blocks of up to a few MB
+    with high clevels, so for very compressible data their ratio may be
+    underestimated with small samples.  The estimates are still good for
+    ranking the candidates, but a larger :paramref:`sample_size` gives closer ratios.
+
+    Examples
+    --------
+    >>> import numpy
+    >>> data = numpy.arange(1000 * 1000, dtype="int64")
+    >>> candidates = [{"codec": blosc2.Codec.LZ4}, {"codec": blosc2.Codec.ZSTD, "clevel": 9}]
+    >>> estimates = blosc2.estimate(data, typesize=8, candidates=candidates)
+    >>> estimates[1]["cratio"] > estimates[0]["cratio"]
+    True
+    """
+    view = memoryview(src).cast("B")
+    candidates = _default_candidates() if candidates is None else candidates
+    nthreads = blosc2.nthreads if nthreads is None else nthreads
+    if view.nbytes == 0 or not candidates:
+        raise ValueError("src cannot be empty and there must be at least one candidate")
+    if nsamples < 1 or sample_size < 1 or nthreads < 1:
+        raise ValueError("nsamples, sample_size and nthreads must be at least 1")
+    sample_size = max(sample_size - sample_size % typesize, typesize)
+    nitems = view.nbytes // typesize
+    if nsamples * sample_size >= view.nbytes or nitems <= sample_size // typesize:
+        sample = view
+    else:
+        # The offsets (in items) of the blocks, from the beginning to the end of src
+        step = (nitems - sample_size // typesize) / max(nsamples - 1, 1)
+        offsets = sorted({int(i * step) * typesize for i in range(nsamples)})
+        sample = b"".join(view[offset:offset + sample_size] for offset in offsets)
+    nbytes = memoryview(sample).nbytes
+
+    def try_candidate(cparams):
+        cctx = CompressionContext(**dict(cparams, typesize=typesize, nthreads=1))
+        dctx = DecompressionContext(nthreads=1)
+        t0 = time.perf_counter()
+        compressed = cctx.compress(sample)
+        t1 = time.perf_counter()
+        dctx.decompress(compressed)
+        t2 = time.perf_counter()
+        # Clocks may not be precise enough for the fastest codecs on small samples
+        return dict(cparams, cratio=nbytes / len(compressed), cspeed=nbytes / max(t1 - t0, 1e-9) / 2 ** 20,
+                    dspeed=nbytes / max(t2 - t1, 1e-9) / 2 ** 20)
+
+    if nthreads == 1 or len(candidates) == 1:
+        return [try_candidate(cparams) for cparams in candidates]
+    with ThreadPoolExecutor(max_workers=nthreads) as executor:
+        return list(executor.map(try_candidate, candidates))
+
+
+# The bandwidth, in bytes/s, at which the compressed data is assumed to be stored or sent,
+# which weights the compression time against the compressed size
+_TUNE_BANDWIDTHS = {
+    blosc2.TuneMode.SPEED: 10 * 2 ** 30,
+    blosc2.TuneMode.BALANCED: 100 * 2 ** 20,
+}
+
+
+def _tune_cost(mode, estimate):
+    # The cost of the estimate of a candidate for mode (the lower the better)
+    if mode == blosc2.TuneMode.RATIO:
+        return -estimate["cratio"], -estimate["cspeed"]
+    # The seconds per byte for compressing, and then storing or sending the result
+    return 1 / (estimate["cspeed"] * 2 ** 20) + 1 / (estimate["cratio"] * _TUNE_BANDWIDTHS[mode])
+
+
+def _auto_cparams(src, kwargs):
+    # The codec, and the clevel and filters (unless given), with the best balance of speed and ratio
+    if memoryview(src).nbytes == 0:
+        return {"codec": blosc2.cparams_dflts["codec"]}
+    codecs = [blosc2.Codec.ZSTD] if kwargs.get("dict", None) is not None else list(blosc2.Codec)
+    clevels = [kwargs["clevel"]] if "clevel" in kwargs else [1, 5, 9]
+    if "filters" in kwargs:
+        pipelines = [(kwargs["filters"], kwargs.get("filters_meta", blosc2.cparams_dflts["filters_meta"]))]
+    else:
+        filters = [blosc2.Filter.NOFILTER, blosc2.Filter.SHUFFLE, blosc2.Filter.BITSHUFFLE]
+        pipelines = [((blosc2.Filter.NOFILTER,) * 5 + (filter_,), (0,) * 6) for filter_ in filters]
+    # The rest of params (e.g. the blocksize) are the ones given
+    cparams = {name: value for name, value in kwargs.items()
+               if name not in ("codec", "typesize", "nthreads")}
+    candidates = [
+        dict(cparams, codec=codec, clevel=clevel, filters=filters, filters_meta=filters_meta)
+        for codec in codecs for clevel in clevels for filters, filters_meta in pipelines
+    ]
+    estimates = estimate(src, kwargs.get("typesize", blosc2.cparams_dflts["typesize"]), candidates)
+    best = min(estimates, key=lambda estimate: _tune_cost(blosc2.TuneMode.BALANCED, estimate))
+    return {name: best[name] for name in ("codec", "clevel", "filters", "filters_meta")}
+
+
+class Tuner:
+    def __init__(self, mode=blosc2.TuneMode.BALANCED, codecs=None, clevels=None, filters=None,
+                 sample_size=2 ** 16, retune_every=32, history_size=1000):
+        """Create a tuner, which chooses the compression params for every chunk.
+
+        The tuner compresses a sample of the chunk with every combination of
+        :paramref:`codecs`, :paramref:`clevels` and :paramref:`filters`, and
+        keeps the best one for :paramref:`mode`.  The combinations are tried
+        again every :paramref:`retune_every` chunks, so that the choice follows
+        the changes in the data.  The chunks of a :class:`SChunk` with a
+        prefilter are compressed with the last choice, as their data is not
+        known in advance.
+
+        A tuner (or just a :class:`TuneMode`) can be passed as the `tuner` in
+        the `cparams` of :func:`~blosc2.compress2` and :class:`~blosc2.SChunk`.
+        Subclasses can override :func:`~blosc2.Tuner.next_cparams` for other
+        policies.
+
+        Parameters
+        ----------
+        mode: :class:`TuneMode`
+            What to optimize: :py:obj:`TuneMode.SPEED <TuneMode>` favours the
+            compression speed, :py:obj:`TuneMode.RATIO <TuneMode>` the compression
+            ratio and :py:obj:`TuneMode.BALANCED <TuneMode>` (the default) weights both.
+        codecs: :class:`Codec` list, optional
+            The codecs to try. By default, BLOSCLZ, LZ4 and ZSTD.
+        clevels: int list, optional
+            The compression levels to try. By default, 1, 5 and 9.
+        filters: :class:`Filter` list, optional
+            The filters to try (as the last one of the pipeline). By default,
+            SHUFFLE and BITSHUFFLE.
+        sample_size: int
+            The maximum number of bytes of the chunk that are compressed with every
+            combination. Default is 64 KB.
+        retune_every: int
+            The number of chunks after which the combinations are tried again.
+            Default is 32.
+        history_size: int
+            The maximum number of chunks kept in the `history` (the last ones).
+            Default is 1000; 0 disables the history, and `None` means no limit.
+
+        Raises
+        ------
+        ValueError
+            If there is no codec, clevel or filter to try.
+            If :paramref:`sample_size` or :paramref:`retune_every` are not positive.
+            If :paramref:`history_size` is negative.
+
+        Examples
+        --------
+        >>> import numpy
+        >>> tuner = blosc2.Tuner(blosc2.TuneMode.RATIO, codecs=[blosc2.Codec.LZ4, blosc2.Codec.ZSTD])
+        >>> data = numpy.arange(1000 * 1000, dtype="int64")
+        >>> c = blosc2.compress2(data, typesize=8, tuner=tuner)
+        >>> tuner.history[0]["codec"]
+        <Codec.ZSTD: 5>
+        """
+        self.mode = blosc2.TuneMode(mode)
+        codecs = [blosc2.Codec.BLOSCLZ, blosc2.Codec.LZ4, blosc2.Codec.ZSTD] if codecs is None else codecs
+        clevels = [1, 5, 9] if clevels is None else clevels
+        filters = [blosc2.Filter.SHUFFLE, blosc2.Filter.BITSHUFFLE] if filters is None else filters
+        if not (codecs and clevels and filters):
+            raise ValueError("There must be at least one codec, clevel and filter to try")
+        for clevel in clevels:
+            _check_clevel(clevel)
+        if sample_size < 1 or retune_every < 1:
+            raise ValueError("sample_size and retune_every must be at least 1")
+        if history_size is not None and history_size < 0:
+            raise ValueError("history_size cannot be negative")
+        self._candidates = _default_candidates(codecs, clevels, filters)
+        self.sample_size = sample_size
+        self.retune_every = retune_every
+        #: The compression params chosen for every chunk, along with its `nchunk` in the
+        #: :class:`SChunk`, or its `nbytes` and `cbytes` for :func:`~blosc2.compress2`
+        #: (up to the last `history_size` ones).
+        self.history = collections.deque(maxlen=history_size)
+        self._best = None
+        self._nchunks = 0
+
+    def next_cparams(self, src, typesize):
+        """Get the compression params for the next chunk.
+
+        Parameters
+        ----------
+        src: bytes-like object (supporting the buffer interface)
+            The data of the chunk.
+        typesize: int
+            The typesize of the data.
+
+        Returns
+        -------
+        out: dict
+            The `codec`, `clevel`, `filters` and `filters_meta` for compressing
+            :paramref:`src`, which replace the ones in the compression params.
+        """
+        if self._best is None or self._nchunks % self.retune_every == 0:
+            self._best = self._try_candidates(src, typesize)
+        self._nchunks += 1
+        return dict(self._best)
+
+    def _try_candidates(self, src, typesize):
+        view = memoryview(src).cast("B")
+        sample = view[:max(self.sample_size - self.sample_size % typesize, typesize)]
+        if sample.nbytes == 0:
+            # Nothing to compare
+            return self._candidates[0]
+        # The chunks come one after the other, so the threads are better used for compressing them
+        estimates = estimate(sample, typesize, self._candidates, nsamples=1, sample_size=sample.nbytes,
+                             nthreads=1)
+        best = min(range(len(estimates)), key=lambda i: _tune_cost(self.mode, estimates[i]))
+        return self._candidates[best]
+
+    def _record(self, cparams, **info):
+        self.history.append(dict(cparams, **info))
+
+
+def _as_tuner(tuner):
+    if isinstance(tuner, blosc2.TuneMode):
+        return Tuner(tuner)
+    if not isinstance(tuner, Tuner):
+        raise TypeError("The tuner must be a TuneMode or a Tuner")
+    return tuner
 
 
 # Directory utilities
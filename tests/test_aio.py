@@ -0,0 +1,158 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import asyncio
+
+import numpy
+import pytest
+
+import blosc2
+import blosc2.aio
+
+
+@pytest.mark.parametrize("nthreads", [1, 4])
+@pytest.mark.parametrize("ncalls", [1, 100])
+def test_aio_compress2(nthreads, ncalls):
+    oldn = blosc2.aio.set_nthreads(nthreads)
+    data = [numpy.arange(i * 1000, (i + 1) * 1000, dtype="int64") for i in range(ncalls)]
+
+    async def roundtrip():
+        chunks = await asyncio.gather(*[blosc2.aio.compress2(a, typesize=8, clevel=5) for a in data])
+        assert chunks == [blosc2.compress2(a, typesize=8, clevel=5) for a in data]
+        out = [numpy.empty_like(a) for a in data]
+        await asyncio.gather(*[blosc2.aio.decompress2(chunk, dst) for chunk, dst in zip(chunks, out)])
+        return await asyncio.gather(*[blosc2.aio.decompress2(chunk) for chunk in chunks]), out
+
+    res, out = asyncio.run(roundtrip())
+    for a, b, c in zip(data, res, out):
+        assert b == a.tobytes()
+        assert numpy.array_equal(a, c)
+    blosc2.aio.set_nthreads(oldn)
+
+
+def test_aio_errors():
+    async def decompress():
+        return await blosc2.aio.decompress2(b"not a chunk" * 10)
+
+    with pytest.raises(ValueError):
+        asyncio.run(decompress())
+    with pytest.raises(ValueError):
+        blosc2.aio.set_nthreads(0)
+    # Outside an event loop
+    with pytest.raises(RuntimeError):
+        blosc2.aio._submit(len, b"")
+
+
+def test_aio_not_blocking():
+    data = numpy.random.default_rng(0).bytes(32 * 2 ** 20)
+
+    async def compress():
+        ticks = 0
+        coro = blosc2.aio.compress2(data, typesize=1, codec=blosc2.Codec.ZSTD, clevel=5)
+        task = asyncio.ensure_future(coro)
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0)
+        return ticks, task.result()
+
+    ticks, c = asyncio.run(compress())
+    # The event loop kept running while compressing
+    assert ticks > 1
+    assert blosc2.decompress2(c) == data
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+def test_schunk_aio(contiguous, urlpath):
+    blosc2.remove_urlpath(urlpath)
+    chunk_nitems = 10 * 1000
+    nchunks = 20
+    data = numpy.arange(chunk_nitems * nchunks, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=chunk_nitems * 4, contiguous=contiguous, urlpath=urlpath,
+                           cparams={"typesize": 4}, mode="w")
+
+    async def append():
+        # The chunks are appended in the order of the calls
+        return await asyncio.gather(*[schunk.aappend_data(data[i * chunk_nitems:(i + 1) * chunk_nitems])
+                                      for i in range(nchunks)])
+
+    assert asyncio.run(append()) == list(range(1, nchunks + 1))
+    assert schunk.get_slice() == data.tobytes()
+
+    async def get_slices():
+        dst = numpy.empty(100, dtype="int32")
+        await schunk.aget_slice(chunk_nitems - 50, chunk_nitems + 50, dst)
+        slices = await asyncio.gather(*[schunk.aget_slice(i * 1000, i * 1000 + 1500) for i in range(100)])
+        return dst, slices
+
+    dst, slices = asyncio.run(get_slices())
+    assert numpy.array_equal(dst, data[chunk_nitems - 50:chunk_nitems + 50])
+    for i, res in enumerate(slices):
+        assert res == data[i * 1000:i * 1000 + 1500].tobytes()
+
+    if urlpath is not None:
+        schunk = blosc2.open(urlpath, mode="r")
+        assert asyncio.run(schunk.aget_slice()) == data.tobytes()
+        with pytest.raises(ValueError):
+            asyncio.run(schunk.aappend_data(data[:chunk_nitems]))
+    blosc2.remove_urlpath(urlpath)
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+def test_schunk_aio_read_while_appending(contiguous):
+    chunk_nitems = 10 * 1000
+    nchunks = 10
+    data = numpy.arange(chunk_nitems * (nchunks + 1), dtype="int64")
+
+    async def append_and_read():
+        appends = [schunk.aappend_data(data[i * chunk_nitems:(i + 1) * chunk_nitems])
+                   for i in range(1, nchunks + 1)]
+        reads = [schunk.aget_slice(0, chunk_nitems) for _ in range(30)]
+        whole = [schunk.aget_slice() for _ in range(30)]
+        return await asyncio.gather(asyncio.gather(*appends), asyncio.gather(*reads),
+                                    asyncio.gather(*whole))
+
+    for _ in range(3):
+        schunk = blosc2.SChunk(chunksize=chunk_nitems * 8, contiguous=contiguous, cparams={"typesize": 8})
+        schunk.append_data(data[:chunk_nitems])
+        nchunks_, reads, whole = asyncio.run(append_and_read())
+        assert nchunks_ == list(range(2, nchunks + 2))
+        for res in reads:
+            assert res == data[:chunk_nitems].tobytes()
+        # A whole slice has the chunks appended before it was got
+        for res in whole:
+            assert len(res) % (chunk_nitems * 8) == 0
+            assert res == data[:len(res) // 8].tobytes()
+        assert schunk.get_slice() == data.tobytes()
+
+
+def test_schunk_aio_set_nthreads():
+    chunk_nitems = 25 * 1000
+    nchunks = 40
+    data = numpy.random.default_rng(0).integers(0, 1000, chunk_nitems * nchunks)
+    schunk = blosc2.SChunk(chunksize=chunk_nitems * 8,
+                           cparams={"typesize": 8, "codec": blosc2.Codec.ZSTD, "clevel": 9})
+    oldn = blosc2.aio.set_nthreads(2)
+
+    async def append(i):
+        return await schunk.aappend_data(data[i * chunk_nitems:(i + 1) * chunk_nitems])
+
+    async def append_all():
+        tasks = []
+        for i in range(nchunks):
+            tasks.append(asyncio.ensure_future(append(i)))
+            if i in (20, 30):
+                # Let the appends be submitted, so that they are pending when changing the threads
+                await asyncio.sleep(0)
+                blosc2.aio.set_nthreads(4 if i == 20 else 1)
+        return await asyncio.wait_for(asyncio.gather(*tasks), timeout=60)
+
+    try:
+        # The appends submitted before changing the threads are finished, in order
+        assert asyncio.run(append_all()) == list(range(1, nchunks + 1))
+    finally:
+        blosc2.aio.set_nthreads(oldn)
+    assert schunk.get_slice() == data.tobytes()
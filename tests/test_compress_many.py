@@ -0,0 +1,97 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("nthreads", [1, 4])
+@pytest.mark.parametrize("nbufs", [0, 1, 1000])
+@pytest.mark.parametrize(
+    "cparams",
+    [
+        {"typesize": 8},
+        {"typesize": 8, "codec": blosc2.Codec.ZSTD, "clevel": 5, "filters": [blosc2.Filter.BITSHUFFLE]},
+        {"typesize": 1, "codec": blosc2.Codec.LZ4, "clevel": 0},
+    ],
+)
+def test_compress_many(nthreads, nbufs, cparams):
+    rng = numpy.random.default_rng(0)
+    # Buffers of different sizes, including empty ones
+    bufs = [numpy.linspace(0, i, rng.integers(0, 2000)) for i in range(nbufs)]
+    chunks = blosc2.compress_many(bufs, nthreads=nthreads, **cparams)
+    assert chunks == [blosc2.compress2(buf, **cparams) for buf in bufs]
+    assert blosc2.decompress_many(chunks, nthreads=nthreads) == [buf.tobytes() for buf in bufs]
+
+    packed, offsets = blosc2.compress_many(bufs, packed=True, nthreads=nthreads, **cparams)
+    assert offsets.tolist() == numpy.cumsum([0] + [len(chunk) for chunk in chunks]).tolist()
+    assert packed == b"".join(chunks)
+    out, out_offsets = blosc2.decompress_many(packed, offsets, packed=True, nthreads=nthreads)
+    assert out == b"".join(buf.tobytes() for buf in bufs)
+    assert numpy.diff(out_offsets).tolist() == [buf.nbytes for buf in bufs]
+
+
+@pytest.mark.parametrize("nthreads", [1, 4])
+def test_compress_many_offsets(nthreads):
+    data = numpy.arange(100 * 1000, dtype="int32")
+    # Items of different sizes, with a gap between the last two
+    offsets = [0, 4000, 4000, 100 * 1000, 300 * 1000, 350 * 1000, 400 * 1000]
+    chunks = blosc2.compress_many(data, offsets, typesize=4, nthreads=nthreads)
+    view = memoryview(data).cast("B")
+    items = [view[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])]
+    # The blocksize of an item does not depend on the previous ones compressed with the same context
+    assert chunks == [blosc2.compress2(item, typesize=4) for item in items]
+    assert blosc2.decompress_many(chunks, nthreads=nthreads) == [item.tobytes() for item in items]
+    items = [items[3], items[3], items[0], items[3], items[3]]
+    assert blosc2.compress_many(items, typesize=4) == [blosc2.compress2(item, typesize=4) for item in items]
+
+    # Bigger than the scratch buffer of a thread
+    data = numpy.arange(2 * 1000 * 1000, dtype="int64")
+    offsets = numpy.arange(0, data.nbytes + 1, data.nbytes // 4)
+    packed, coffsets = blosc2.compress_many(data, offsets, packed=True, typesize=8, nthreads=nthreads)
+    out, _ = blosc2.decompress_many(packed, coffsets, packed=True, nthreads=nthreads)
+    assert out == data.tobytes()
+
+
+def test_compress_many_dict():
+    msgs = [b'{"id": %d, "user": "user%d", "method": "GetUser"}' % (i, i % 97) for i in range(2000)]
+    dict_ = blosc2.train_dict(msgs, 2 ** 12)
+    chunks = blosc2.compress_many(msgs, typesize=1, codec=blosc2.Codec.ZSTD, dict=dict_, nthreads=4)
+    assert blosc2.decompress_many(chunks, dict=dict_, nthreads=4) == msgs
+    assert sum(len(chunk) for chunk in chunks) < sum(len(c) for c in blosc2.compress_many(msgs, typesize=1))
+
+
+def test_compress_many_errors():
+    data = numpy.arange(1000, dtype="int64")
+    with pytest.raises(TypeError):
+        blosc2.compress_many([data, 1])
+    with pytest.raises(ValueError):
+        blosc2.compress_many(data, offsets=[0, 100, 50])
+    with pytest.raises(ValueError):
+        blosc2.compress_many(data, offsets=[0, data.nbytes + 1])
+    with pytest.raises(ValueError):
+        blosc2.compress_many(data, offsets=[])
+    with pytest.raises(ValueError):
+        blosc2.compress_many([data], clevel=10)
+    with pytest.raises(ValueError):
+        blosc2.compress_many([data], codec="auto")
+    with pytest.raises(ValueError):
+        blosc2.compress_many([data], tuner=blosc2.TuneMode.SPEED)
+    with pytest.raises(ValueError):
+        blosc2.compress_many([data], nthreads=0)
+
+    chunks = blosc2.compress_many([data, data])
+    with pytest.raises(ValueError):
+        blosc2.decompress_many([chunks[0], b"short"])
+    with pytest.raises(ValueError):
+        blosc2.decompress_many([chunks[0], chunks[1][:-10]])
+    # The offset of the first block (after the 32 bytes of the header) past the end of the chunk
+    corrupted = bytearray(chunks[1])
+    corrupted[32:36] = (len(corrupted) + 100).to_bytes(4, "little")
+    with pytest.raises(ValueError):
+        blosc2.decompress_many([chunks[0], corrupted], nthreads=2)
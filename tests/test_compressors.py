@@ -28,3 +28,45 @@ def test_compressors(clevel, filt, codec):
     else:
         assert blosc2.get_clib(dest).lower() == codec.name.lower()
     blosc2.free_resources()
+
+
+@pytest.mark.parametrize("releasegil", [True, False])
+def test_compressors_threads(releasegil):
+    from concurrent.futures import ThreadPoolExecutor
+
+    old_state = blosc2.set_releasegil(releasegil)
+    codecs = [codec for codec in blosc2.Codec] * 4
+
+    def roundtrip(codec):
+        src = (codec.name.encode() + b"Something to be compressed") * 1000
+        dest = blosc2.compress(src, 1, 5, blosc2.Filter.SHUFFLE, codec)
+        if codec == blosc2.Codec.LZ4HC:
+            assert blosc2.get_clib(dest).lower() == "lz4"
+        else:
+            assert blosc2.get_clib(dest).lower() == codec.name.lower()
+        return blosc2.decompress(dest) == src
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(roundtrip, codecs * 10))
+    blosc2.set_releasegil(old_state)
+
+
+def test_compressors_sizes():
+    from concurrent.futures import ThreadPoolExecutor
+
+    import numpy
+
+    small = numpy.arange(1000, dtype="int64")
+    large = numpy.arange(4 * 1000 * 1000, dtype="int64")
+
+    def compress(*arrays):
+        # Every thread has contexts of its own, so the first call of a new thread uses fresh ones
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(lambda: [blosc2.compress(a, 8, 5) for a in arrays]).result()
+
+    [expected] = compress(large)
+    # The blocksize chosen for the small buffer must not be kept for the large one
+    c_small, c_large, c_small2 = compress(small, large, small)
+    assert c_large == expected
+    assert c_small2 == c_small
+    assert blosc2.decompress(c_large) == large.tobytes()
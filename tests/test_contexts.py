@@ -0,0 +1,75 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize(
+    "obj, cparams, dparams",
+    [
+        (numpy.random.randint(0, 10, 10), {"codec": blosc2.Codec.LZ4, "clevel": 6}, {}),
+        (
+            numpy.arange(1000, dtype="float32"),
+            {"filters": [blosc2.Filter.TRUNC_PREC, blosc2.Filter.BITSHUFFLE], "filters_meta": [10],
+             "typesize": 4},
+            {"nthreads": 4},
+        ),
+        (numpy.arange(45, dtype=numpy.float64), {"codec": blosc2.Codec.LZ4HC, "typesize": 8}, {}),
+        (numpy.arange(50_000, dtype=numpy.int64), {"nthreads": 2, "typesize": 8}, {"nthreads": 2}),
+    ],
+)
+def test_contexts_numpy(obj, cparams, dparams):
+    cctx = blosc2.CompressionContext(**cparams)
+    dctx = blosc2.DecompressionContext(**dparams)
+    # Reuse the contexts several times
+    for i in range(3):
+        c = cctx.compress(obj)
+        assert c == blosc2.compress2(obj, **cparams)
+
+        dest = numpy.empty(obj.shape, obj.dtype)
+        assert dctx.decompress_into(c, dest) == obj.size * obj.itemsize
+        dest2 = numpy.frombuffer(dctx.decompress(c), dtype=obj.dtype)
+        assert numpy.array_equal(dest, dest2)
+
+        cdest = bytearray(obj.size * obj.itemsize + blosc2.MAX_OVERHEAD)
+        size = cctx.compress_into(obj, cdest)
+        assert cdest[:size] == c
+        dest3 = numpy.empty(obj.shape, obj.dtype)
+        dctx.decompress(cdest[:size], dst=dest3)
+        assert numpy.array_equal(dest, dest3)
+
+
+@pytest.mark.parametrize("blocksize", [0, 2 ** 14])
+def test_contexts_sizes(blocksize):
+    # The automatic blocksize of a small buffer must not be kept for the next ones
+    cparams = {"typesize": 8, "clevel": 5, "blocksize": blocksize}
+    cctx = blosc2.CompressionContext(**cparams)
+    for size in [1000, 4 * 1000 * 1000, 4 * 1000 * 1000, 10, 100 * 1000]:
+        obj = numpy.arange(size, dtype=numpy.int64)
+        assert cctx.compress(obj) == blosc2.compress2(obj, **cparams)
+        cdest = bytearray(obj.size * obj.itemsize + blosc2.MAX_OVERHEAD)
+        size = cctx.compress_into(obj, cdest)
+        assert cdest[:size] == blosc2.compress2(obj, **cparams)
+
+
+def test_contexts_errors():
+    cctx = blosc2.CompressionContext(typesize=1)
+    dctx = blosc2.DecompressionContext()
+    c = cctx.compress(b"0123456789" * 100)
+    with pytest.raises(ValueError):
+        cctx.compress_into(b"0123456789", bytearray())
+    with pytest.raises(RuntimeError):
+        cctx.compress_into(b"0123456789" * 100, bytearray(4))
+    with pytest.raises(ValueError):
+        dctx.decompress_into(c, bytearray())
+    with pytest.raises(ValueError):
+        dctx.decompress_into(c, bytearray(10))
+    with pytest.raises(ValueError):
+        dctx.decompress(b"")
@@ -0,0 +1,118 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import json
+import random
+
+import numpy
+import pytest
+
+import blosc2
+
+
+def messages(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        json.dumps({
+            "id": i,
+            "method": rng.choice(["GetUser", "PutItem", "DeleteItem"]),
+            "user": "user%d" % rng.randint(0, 1000),
+            "items": [{"sku": "SKU-%05d" % rng.randint(0, 99999), "quantity": rng.randint(1, 9)}
+                      for _ in range(rng.randint(5, 50))],
+        }).encode()
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(scope="module")
+def dict_():
+    return blosc2.train_dict(messages(2000), 2 ** 14)
+
+
+@pytest.mark.parametrize("clevel", [1, 5, 9])
+def test_compress2_dict(dict_, clevel):
+    assert 0 < len(dict_) <= 2 ** 14
+    cbytes = cbytes_dict = 0
+    for msg in messages(100, seed=1):
+        c = blosc2.compress2(msg, typesize=1, codec=blosc2.Codec.ZSTD, clevel=clevel, dict=dict_)
+        assert blosc2.decompress2(c, dict=dict_) == msg
+        cbytes_dict += len(c)
+        cbytes += len(blosc2.compress2(msg, typesize=1, codec=blosc2.Codec.ZSTD, clevel=clevel))
+    assert cbytes_dict < cbytes
+    # The dictionary is freed when not used anymore
+    last = msg
+    with pytest.raises(RuntimeError):
+        blosc2.decompress(c)
+
+    cctx = blosc2.CompressionContext(typesize=1, codec=blosc2.Codec.ZSTD, clevel=clevel, dict=dict_)
+    dctx = blosc2.DecompressionContext(dict=dict_)
+    for msg in messages(10, seed=2):
+        assert dctx.decompress(cctx.compress(msg)) == msg
+    # But any context holding it makes it available
+    assert blosc2.decompress(c) == last
+
+
+def with_id(dict_, dict_id):
+    # The same dictionary with another ID (which follows the magic number)
+    return dict_[:4] + dict_id.to_bytes(4, "little") + dict_[8:]
+
+
+def test_dicts_reused(dict_):
+    msg = messages(1, seed=4)[0]
+    # More dictionaries than slots, but not at the same time
+    for dict_id in range(1, 300):
+        d = with_id(dict_, dict_id)
+        c = blosc2.compress2(msg, typesize=1, codec=blosc2.Codec.ZSTD, clevel=dict_id % 10, dict=d)
+        assert blosc2.decompress2(c, dict=d) == msg
+
+    dctxs = [blosc2.DecompressionContext(dict=with_id(dict_, dict_id)) for dict_id in range(1, 257)]
+    with pytest.raises(RuntimeError):
+        blosc2.DecompressionContext(dict=with_id(dict_, 257))
+    del dctxs
+    assert blosc2.decompress2(blosc2.compress2(msg, codec=blosc2.Codec.ZSTD, dict=dict_), dict=dict_) == msg
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+def test_schunk_dict(dict_, contiguous, urlpath):
+    blosc2.remove_urlpath(urlpath)
+    msgs = messages(20, seed=3)
+    chunksize = max(len(msg) for msg in msgs)
+    cparams = {"typesize": 1, "codec": blosc2.Codec.ZSTD, "dict": dict_}
+    schunk = blosc2.SChunk(chunksize=chunksize, contiguous=contiguous, urlpath=urlpath, cparams=cparams,
+                           meta={"kind": "rpc"}, mode="w")
+    for msg in msgs:
+        schunk.append_data(msg.ljust(chunksize))
+    assert schunk.meta["b2dict"] == dict_
+    assert schunk.meta["kind"] == "rpc"
+
+    if urlpath is not None:
+        schunk = blosc2.open(urlpath)
+        schunk.append_data(msgs[0].ljust(chunksize))
+        msgs.append(msgs[0])
+    for i, msg in enumerate(msgs):
+        assert schunk.decompress_chunk(i).rstrip() == msg
+    assert len(set(schunk.chunk_info()["codec"].tolist())) == 1
+
+    # The copies keep the dictionary, unless the codec is changed
+    copy = schunk.copy(contiguous=True)
+    assert copy.meta["b2dict"] == dict_
+    assert copy.chunk_info()["codec"].tolist() == schunk.chunk_info()["codec"].tolist()
+    copy = schunk.copy(cparams={"codec": blosc2.Codec.LZ4})
+    assert "b2dict" not in copy.meta
+    assert numpy.all(copy.chunk_info()["codec"] == blosc2.Codec.LZ4.value)
+    assert copy.get_slice() == schunk.get_slice()
+    blosc2.remove_urlpath(urlpath)
+
+
+def test_dict_errors(dict_):
+    with pytest.raises(RuntimeError):
+        blosc2.train_dict([b"too few samples"], 2 ** 14)
+    with pytest.raises(ValueError):
+        blosc2.compress2(b"a" * 100, codec=blosc2.Codec.LZ4, dict=dict_)
+    with pytest.raises(ValueError):
+        # Not a trained dictionary
+        blosc2.compress2(b"a" * 100, codec=blosc2.Codec.ZSTD, dict=b"a" * 100)
@@ -0,0 +1,99 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("nthreads", [1, 4])
+@pytest.mark.parametrize("typesize", [1, 4, 8])
+def test_estimate(nthreads, typesize):
+    data = numpy.linspace(0, 100, 1000 * 1000)
+    candidates = [
+        {"codec": blosc2.Codec.LZ4, "clevel": 1},
+        {"codec": blosc2.Codec.ZSTD, "clevel": 9, "filters": [blosc2.Filter.BITSHUFFLE]},
+        {"codec": blosc2.Codec.BLOSCLZ, "clevel": 0},
+    ]
+    estimates = blosc2.estimate(data, typesize, candidates, nthreads=nthreads)
+    # The estimates are copies of the candidates, in the same order
+    assert [{name: estimate[name] for name in cparams} for cparams, estimate in
+            zip(candidates, estimates)] == candidates
+    assert "cratio" not in candidates[0]
+    for estimate in estimates:
+        assert estimate["cratio"] > 0 and estimate["cspeed"] > 0 and estimate["dspeed"] > 0
+    assert estimates[1]["cratio"] > estimates[0]["cratio"] > estimates[2]["cratio"]
+    # A plain copy only adds the header
+    assert estimates[2]["cratio"] == pytest.approx(1, rel=0.01)
+
+    # The default candidates are every codec, clevel 1, 5 and 9, and 3 filters
+    estimates = blosc2.estimate(data, typesize, nthreads=nthreads)
+    assert len(estimates) == len(blosc2.Codec) * 3 * 3
+
+
+@pytest.mark.parametrize("nbytes", [1000, 100 * 1000])
+def test_estimate_whole(nbytes):
+    # The whole data fits in the samples, so the ratio is the one of compress2
+    data = numpy.arange(nbytes // 4, dtype="int32")
+    candidates = [{"codec": codec, "clevel": 5} for codec in blosc2.Codec]
+    estimates = blosc2.estimate(data, 4, candidates, nsamples=2, sample_size=nbytes // 2)
+    for cparams, estimate in zip(candidates, estimates):
+        cbytes = len(blosc2.compress2(data, typesize=4, **cparams))
+        assert estimate["cratio"] == pytest.approx(nbytes / cbytes)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"clevel": 1},
+        {"filters": [blosc2.Filter.BITSHUFFLE], "filters_meta": [0]},
+        {"blocksize": 2 ** 14},
+    ],
+)
+@pytest.mark.parametrize("data", [numpy.linspace(0, 100, 100 * 1000), numpy.arange(0)])
+def test_compress2_auto(monkeypatch, kwargs, data):
+    tried = []
+    estimate = blosc2.core.estimate
+    monkeypatch.setattr(blosc2.core, "estimate",
+                        lambda src, typesize, candidates: tried.extend(candidates) or
+                        estimate(src, typesize, candidates))
+    c = blosc2.compress2(data, typesize=8, codec="auto", **kwargs)
+    assert blosc2.decompress2(c) == data.tobytes()
+    if data.size == 0:
+        assert tried == []
+        return
+    assert len(c) < data.nbytes / 2
+    # The params given are kept in every candidate
+    nclevels, nfilters = (1 if "clevel" in kwargs else 3), (1 if "filters" in kwargs else 3)
+    assert len(tried) == len(blosc2.Codec) * nclevels * nfilters
+    for cparams in tried:
+        assert {name: cparams[name] for name in kwargs} == kwargs
+    if "blocksize" in kwargs:
+        # The blocksize goes at the bytes 8 to 12 of the header
+        assert int.from_bytes(c[8:12], "little") == kwargs["blocksize"]
+
+
+def test_compress2_auto_dict():
+    msgs = [b'{"id": %d, "user": "user%d", "method": "GetUser"}' % (i, i % 97) for i in range(2000)]
+    dict_ = blosc2.train_dict(msgs, 2 ** 12)
+    c = blosc2.compress2(msgs[0], typesize=1, codec="auto", dict=dict_)
+    assert blosc2.decompress2(c, dict=dict_) == msgs[0]
+
+
+def test_estimate_errors():
+    data = numpy.arange(1000, dtype="int64")
+    with pytest.raises(ValueError):
+        blosc2.estimate(b"", 8)
+    with pytest.raises(ValueError):
+        blosc2.estimate(data, 8, candidates=[])
+    with pytest.raises(ValueError):
+        blosc2.estimate(data, 8, nsamples=0)
+    with pytest.raises(ValueError):
+        blosc2.estimate(data, 8, sample_size=0)
+    with pytest.raises(ValueError):
+        blosc2.estimate(data, 8, nthreads=0)
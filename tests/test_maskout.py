@@ -0,0 +1,83 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+N = 100 * 1000
+BLOCKSIZE = 4 * 1000 * 4
+
+
+def check_masked(res, data, mask, masked_value):
+    nitems_block = BLOCKSIZE // data.itemsize
+    for i, masked in enumerate(mask):
+        block = slice(i * nitems_block, (i + 1) * nitems_block)
+        if masked:
+            assert numpy.all(res[block] == masked_value)
+        else:
+            assert numpy.array_equal(res[block], data[block])
+
+
+@pytest.mark.parametrize("every", [1, 2, 5])
+@pytest.mark.parametrize("nthreads", [1, 4])
+def test_decompress2_maskout(every, nthreads):
+    data = numpy.arange(N, dtype="int32")
+    c = blosc2.compress2(data, typesize=4, blocksize=BLOCKSIZE)
+    nblocks = N * 4 // BLOCKSIZE
+    mask = numpy.ones(nblocks, dtype=bool)
+    mask[::every] = False
+
+    res = numpy.frombuffer(blosc2.decompress2(c, maskout=mask, nthreads=nthreads), dtype="int32")
+    check_masked(res, data, mask, 0)
+
+    dst = numpy.full_like(data, -1)
+    assert blosc2.decompress2(c, dst, maskout=list(mask), nthreads=nthreads) is None
+    check_masked(dst, data, mask, -1)
+
+    # The mask is not kept for later calls
+    assert blosc2.decompress2(c) == data.tobytes()
+
+    with pytest.raises(ValueError):
+        blosc2.decompress2(c, maskout=mask[1:])
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize("every", [1, 3])
+def test_schunk_block_mask(contiguous, urlpath, every):
+    blosc2.remove_urlpath(urlpath)
+    storage = {
+        "contiguous": contiguous,
+        "urlpath": urlpath,
+        "cparams": {"typesize": 4, "blocksize": BLOCKSIZE},
+    }
+    data = numpy.arange(3 * N, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=N * 4, data=data, **storage)
+    nblocks = N * 4 // BLOCKSIZE
+    mask = numpy.ones(nblocks, dtype=bool)
+    mask[::every] = False
+
+    for nchunk in range(3):
+        chunk_data = data[nchunk * N : (nchunk + 1) * N]
+        res = numpy.frombuffer(schunk.decompress_chunk(nchunk, block_mask=mask), dtype="int32")
+        check_masked(res, chunk_data, mask, 0)
+
+        dst = numpy.full_like(chunk_data, -1)
+        assert schunk.decompress_chunk(nchunk, dst, block_mask=mask) is None
+        check_masked(dst, chunk_data, mask, -1)
+
+        # The mask is not kept for later calls
+        assert schunk.decompress_chunk(nchunk) == chunk_data.tobytes()
+
+    with pytest.raises(ValueError):
+        schunk.decompress_chunk(0, block_mask=mask[1:])
+    with pytest.raises(ValueError):
+        schunk.decompress_chunk(0, dst, block_mask=mask[1:])
+    assert schunk.decompress_chunk(0) == data[:N].tobytes()
+
+    blosc2.remove_urlpath(urlpath)
@@ -0,0 +1,131 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize(
+    "shape, chunks, blocks",
+    [
+        ((100,), (30,), (7,)),
+        ((37, 23, 11), (10, 7, 5), (3, 2, 5)),
+        ((50, 50), (50, 50), (50, 50)),
+        ((20, 30), None, None),
+    ],
+)
+@pytest.mark.parametrize("dtype", ["int32", "float64", "U5"])
+def test_ndarray_getitem(shape, chunks, blocks, dtype):
+    array = numpy.arange(numpy.prod(shape)).reshape(shape).astype(dtype)
+    ndarray = blosc2.asarray(array, chunks=chunks, blocks=blocks)
+    assert ndarray.shape == shape
+    assert ndarray.ndim == len(shape)
+    assert ndarray.size == array.size
+    assert ndarray.dtype == array.dtype
+    assert len(ndarray.chunks) == len(ndarray.blocks) == len(shape)
+
+    keys = [
+        ...,
+        0,
+        -1,
+        slice(3, 17),
+        slice(None, None, 3),
+        slice(5, 5),
+        (..., 2),
+        (1, ..., slice(1, None, 4)),
+        tuple(slice(n // 3, n - 1) for n in shape),
+        tuple(numpy.int64(n // 2) for n in shape),
+    ]
+    for key in keys:
+        if isinstance(key, tuple) and len([k for k in key if k is not ...]) > len(shape):
+            continue
+        assert numpy.array_equal(ndarray[key], array[key])
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "test.b2nd"])
+def test_ndarray_setitem(contiguous, urlpath):
+    blosc2.remove_urlpath(urlpath)
+    shape = (40, 30, 20)
+    array = numpy.zeros(shape, dtype="float32")
+    ndarray = blosc2.zeros(shape, dtype="float32", chunks=(15, 10, 20), blocks=(5, 5, 10),
+                           contiguous=contiguous, urlpath=urlpath)
+    assert numpy.array_equal(ndarray[...], array)
+
+    values = [
+        ((slice(0, 15), slice(0, 10)), 1),
+        ((slice(3, 33), 4), numpy.arange(30 * 20).reshape(30, 20)),
+        ((..., 7), numpy.arange(30)),
+        ((slice(1, None, 3), slice(None, None, 2), 5), -1),
+        ((-1, -1, -1), 42),
+    ]
+    for key, value in values:
+        ndarray[key] = value
+        array[key] = value
+    assert numpy.array_equal(ndarray[...], array)
+
+    if urlpath is not None:
+        ndarray = blosc2.open(urlpath, mode="r")
+        assert isinstance(ndarray, blosc2.NDArray)
+        assert ndarray.shape == shape and ndarray.chunks == (15, 10, 20)
+        assert numpy.array_equal(ndarray[...], array)
+        with pytest.raises(ValueError):
+            ndarray[0] = 1
+    blosc2.remove_urlpath(urlpath)
+
+
+@pytest.mark.parametrize("shape", [(), (0,), (10, 0), 25, (2000, 2000)])
+def test_ndarray_constructors(shape):
+    ndarray = blosc2.full(shape, 3, dtype="int16")
+    array = numpy.full(shape, 3, dtype="int16")
+    assert ndarray.shape == array.shape
+    assert numpy.array_equal(ndarray[...], array)
+    assert numpy.array_equal(blosc2.zeros(shape)[...], numpy.zeros(shape))
+    assert blosc2.empty(shape, dtype="i1").dtype == numpy.int8
+    assert blosc2.full(shape, 1.5).dtype == numpy.float64
+
+    # The chunks are compressed once, so they are all the same
+    if ndarray.size > 0 and ndarray.ndim > 1:
+        nchunks = numpy.prod([-(-n // c) for n, c in zip(ndarray.shape, ndarray.chunks)])
+        assert nchunks > 1
+        assert ndarray.schunk.get_chunk(0) == ndarray.schunk.get_chunk(nchunks - 1)
+
+
+def test_ndarray_meta():
+    ndarray = blosc2.zeros((10, 10), meta={"units": "m"}, cparams={"codec": blosc2.Codec.ZSTD})
+    assert ndarray.schunk.meta["units"] == "m"
+    assert "b2nd" in ndarray.schunk.meta
+    # The layout can be wrapped again
+    ndarray2 = blosc2.NDArray(ndarray.schunk)
+    assert ndarray2.shape == (10, 10) and ndarray2.dtype == numpy.float64
+
+    with pytest.raises(ValueError):
+        blosc2.NDArray(blosc2.SChunk(chunksize=100))
+
+
+def test_ndarray_errors():
+    ndarray = blosc2.zeros((10, 10), chunks=(5, 5), blocks=(5, 5))
+    with pytest.raises(IndexError):
+        ndarray[10]
+    with pytest.raises(IndexError):
+        ndarray[0, 0, 0]
+    with pytest.raises(IndexError):
+        ndarray[[1, 2]]
+    with pytest.raises(ValueError):
+        ndarray[::-1]
+    with pytest.raises(ValueError):
+        ndarray[0] = numpy.arange(5)
+
+    with pytest.raises(ValueError):
+        blosc2.zeros((10, 10), chunks=(5,))
+    with pytest.raises(ValueError):
+        blosc2.zeros((10, 10), chunks=(5, 5), blocks=(10, 5))
+    with pytest.raises(ValueError):
+        blosc2.zeros((-1,))
+    with pytest.raises(ValueError):
+        blosc2.zeros((2 ** 16, 2 ** 16), chunks=(2 ** 16, 2 ** 16), dtype="i1")
@@ -73,3 +73,45 @@ def test_open(contiguous, urlpath, cparams, dparams, nchunks, chunk_nitems, dtyp
                 assert numpy.array_equal(buffer, dest)
 
     blosc2.remove_urlpath(urlpath)
+
+
+@pytest.mark.parametrize("nchunks", [0, 1, 5])
+@pytest.mark.parametrize("cparams", [{"typesize": 4}, {"compcode": blosc2.Codec.ZSTD, "typesize": 4}])
+def test_open_mmap(nchunks, cparams):
+    urlpath = "schunk.b2frame"
+    blosc2.remove_urlpath(urlpath)
+    chunk_nitems = 200 * 100
+    data = numpy.arange(chunk_nitems * nchunks, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=chunk_nitems * 4, data=data, urlpath=urlpath, contiguous=True,
+                           cparams=cparams)
+    schunk.vlmeta["name"] = "mmap"
+    del schunk
+
+    schunk_mmap = blosc2.open(urlpath, mode="r", mmap=True)
+    for i in range(nchunks):
+        dest = numpy.empty(chunk_nitems, dtype="int32")
+        schunk_mmap.decompress_chunk(i, dest)
+        assert numpy.array_equal(dest, data[i * chunk_nitems: (i + 1) * chunk_nitems])
+    assert schunk_mmap.get_slice() == data.tobytes()
+    assert schunk_mmap.vlmeta["name"] == "mmap"
+
+    # Memory-mapped SChunks are read-only
+    with pytest.raises(ValueError):
+        schunk_mmap.append_data(data[:chunk_nitems])
+    with pytest.raises(ValueError):
+        schunk_mmap.vlmeta["name"] = "changed"
+
+    blosc2.remove_urlpath(urlpath)
+
+
+def test_open_mmap_errors():
+    urlpath = "schunk.b2frame"
+    for contiguous in (True, False):
+        blosc2.remove_urlpath(urlpath)
+        blosc2.SChunk(chunksize=100, data=b"a" * 1000, urlpath=urlpath, contiguous=contiguous)
+        with pytest.raises(ValueError):
+            blosc2.open(urlpath, mode="a", mmap=True)
+    # Sparse frames cannot be mapped
+    with pytest.raises(ValueError):
+        blosc2.open(urlpath, mode="r", mmap=True)
+    blosc2.remove_urlpath(urlpath)
@@ -92,3 +92,70 @@ def test_schunk(contiguous, urlpath, nbytes, cparams, dparams, nchunks):
         schunk.get_chunk(i)
 
     blosc2.remove_urlpath(urlpath)
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+def test_schunk_threads(contiguous, urlpath):
+    from concurrent.futures import ThreadPoolExecutor
+
+    storage = {"contiguous": contiguous, "urlpath": urlpath, "cparams": {"typesize": 4}}
+    blosc2.remove_urlpath(urlpath)
+    nchunks = 16
+    schunk = blosc2.SChunk(chunksize=1000 * 4, **storage)
+    for i in range(nchunks):
+        schunk.append_data(i * numpy.arange(1000, dtype="int32"))
+
+    def read(i):
+        dest = numpy.empty(1000, dtype="int32")
+        schunk.decompress_chunk(i % nchunks, dest)
+        return numpy.array_equal(dest, (i % nchunks) * numpy.arange(1000, dtype="int32"))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(read, range(nchunks * 10)))
+
+    blosc2.remove_urlpath(urlpath)
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+def test_schunk_threads_read_while_writing(contiguous):
+    # The chunks kept in memory by the super-chunk are moved or freed when it is modified,
+    # so the readers must not use them once the lock is released
+    import threading
+
+    nitems = 10 * 1000
+    data = numpy.arange(nitems, dtype="int64")
+    schunk = blosc2.SChunk(chunksize=nitems * 8, contiguous=contiguous,
+                           cparams={"typesize": 8, "nthreads": 1})
+    schunk.append_data(data)
+    schunk.append_data(data)
+    errors = []
+    done = threading.Event()
+
+    def read(kind):
+        dest = numpy.empty(nitems, dtype="int64")
+        try:
+            while not done.is_set():
+                if kind == 0:
+                    schunk.decompress_chunk(0, dest)
+                    assert numpy.array_equal(dest, data)
+                elif kind == 1:
+                    assert schunk.get_slice(5, 15) == data[5:15].tobytes()
+                elif kind == 2:
+                    assert blosc2.decompress2(schunk.get_chunk(0)) == data.tobytes()
+                else:
+                    assert schunk.decompress_range(0, 2, nthreads=2) == data.tobytes() * 2
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=read, args=(i % 4,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for _ in range(500):
+        schunk.append_data(data)
+        if not contiguous:
+            schunk.update_data(0, data, copy=True)
+    done.set()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,75 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize("copy_to", [True, False])
+@pytest.mark.parametrize("copy_from", [True, False])
+@pytest.mark.parametrize("nchunks", [0, 1, 5])
+def test_schunk_cframe(contiguous, urlpath, copy_to, copy_from, nchunks):
+    storage = {"contiguous": contiguous, "urlpath": urlpath, "cparams": {"typesize": 4}}
+    blosc2.remove_urlpath(urlpath)
+
+    data = numpy.arange(200 * 1000 * nchunks, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=200 * 1000 * 4, data=data, **storage)
+    schunk.vlmeta["name"] = "cframe"
+
+    cframe = schunk.to_cframe(copy=copy_to)
+    assert isinstance(cframe, bytes if copy_to else memoryview)
+    schunk2 = blosc2.schunk_from_cframe(cframe, copy=copy_from)
+    for i in range(nchunks):
+        assert schunk2.decompress_chunk(i) == data[i * 200 * 1000 : (i + 1) * 200 * 1000].tobytes()
+    assert schunk2.vlmeta["name"] == "cframe"
+
+    chunk = numpy.arange(200 * 1000, dtype="int32")
+    if copy_from:
+        assert schunk2.append_data(chunk) == nchunks + 1
+        schunk2.vlmeta["name"] = "copy"
+    else:
+        with pytest.raises(BufferError):
+            schunk2.append_data(chunk)
+        with pytest.raises(BufferError):
+            schunk2.vlmeta["name"] = "copy"
+
+    blosc2.remove_urlpath(urlpath)
+
+
+def test_schunk_cframe_shared():
+    data = numpy.arange(200 * 1000 * 2, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=200 * 1000 * 4, data=data, contiguous=True)
+
+    # The frame of an in-memory contiguous SChunk is shared with the exported buffer
+    cframe = schunk.to_cframe()
+    assert cframe.readonly
+    with pytest.raises(BufferError):
+        schunk.append_data(data[: 200 * 1000])
+    with pytest.raises(BufferError):
+        schunk.delete_chunk(0)
+    with pytest.raises(BufferError):
+        del schunk.vlmeta["missing"]
+
+    schunk2 = blosc2.schunk_from_cframe(cframe)
+    del cframe
+    # The imported SChunk keeps the buffer alive
+    with pytest.raises(BufferError):
+        schunk.append_data(data[: 200 * 1000])
+    assert schunk2.decompress_chunk(1) == data[200 * 1000 :].tobytes()
+
+    del schunk2
+    assert schunk.append_data(data[: 200 * 1000]) == 3
+
+
+def test_schunk_cframe_errors():
+    with pytest.raises(ValueError):
+        blosc2.schunk_from_cframe(b"")
+    with pytest.raises(RuntimeError):
+        blosc2.schunk_from_cframe(b"x" * 100)
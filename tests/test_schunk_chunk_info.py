@@ -0,0 +1,65 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize(
+    "cparams",
+    [
+        {"typesize": 4, "codec": blosc2.Codec.LZ4, "blocksize": 2 ** 14},
+        {"typesize": 8, "codec": blosc2.Codec.ZSTD, "filters": [blosc2.Filter.BITSHUFFLE]},
+        {"typesize": 2, "codec": blosc2.Codec.BLOSCLZ, "clevel": 0},
+    ],
+)
+def test_schunk_chunk_info(contiguous, urlpath, cparams):
+    blosc2.remove_urlpath(urlpath)
+    chunksize = 100 * 1000 * 4
+    schunk = blosc2.SChunk(chunksize=chunksize, contiguous=contiguous, urlpath=urlpath, cparams=cparams,
+                           mode="w")
+    assert schunk.nchunks == schunk.nbytes == schunk.cbytes == 0
+    assert schunk.cratio == 0
+    assert len(schunk.chunk_info()) == 0
+
+    data = numpy.arange(5 * 100 * 1000 + 1000, dtype="int32")
+    schunk.extend(data)
+    # An incompressible chunk
+    schunk.update_data(2, numpy.random.default_rng(0).bytes(chunksize), copy=True)
+    if urlpath is not None:
+        schunk = blosc2.open(urlpath, mode="r")
+
+    info = schunk.chunk_info()
+    assert len(info) == schunk.nchunks == 6
+    assert info["nbytes"].tolist() == [chunksize] * 5 + [1000 * 4]
+    assert numpy.all(info["typesize"] == cparams["typesize"])
+    assert numpy.all(info["codec"] == cparams["codec"].value)
+    assert numpy.all(info["special"] == 0)
+    if "blocksize" in cparams:
+        # The blocksize of the chunks just copied is their nbytes
+        assert numpy.all(info["blocksize"][:-1][~info["memcpyed"][:-1]] == cparams["blocksize"])
+    if "filters" in cparams:
+        assert numpy.all(info["filters"][:, 0] == blosc2.Filter.BITSHUFFLE.value)
+    assert info["memcpyed"][2] or cparams.get("clevel") == 0
+    assert info["memcpyed"].tolist() == [True] * 6 or not info["memcpyed"][0]
+
+    for nchunk in range(schunk.nchunks):
+        # The nbytes, blocksize and cbytes go at the bytes 4 to 16 of the header
+        nbytes, blocksize, cbytes = numpy.frombuffer(schunk.get_chunk(nchunk)[4:16], dtype="<i4")
+        assert info[nchunk][["nbytes", "blocksize", "cbytes"]].tolist() == (nbytes, blocksize, cbytes)
+    assert schunk.nbytes == info["nbytes"].sum() == data.nbytes + chunksize - 100 * 1000 * 4
+    if contiguous:
+        # The chunk replaced is still in the frame (unless it has been overwritten)
+        assert schunk.cbytes >= info["cbytes"].sum()
+        assert schunk.copy().cbytes == info["cbytes"].sum()
+    else:
+        assert schunk.cbytes == info["cbytes"].sum()
+    assert schunk.cratio == pytest.approx(schunk.nbytes / schunk.cbytes)
+    blosc2.remove_urlpath(urlpath)
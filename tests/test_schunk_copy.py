@@ -0,0 +1,66 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize("contiguous2", [True, False])
+@pytest.mark.parametrize("urlpath2", [None, "b2frame2"])
+@pytest.mark.parametrize(
+    "cparams, cparams2, nchunks",
+    [
+        ({"typesize": 4}, None, 0),
+        ({"typesize": 4}, None, 5),
+        ({"codec": blosc2.Codec.LZ4, "typesize": 4}, {"codec": blosc2.Codec.ZSTD, "clevel": 7}, 5),
+        ({"typesize": 4}, {"codec": blosc2.Codec.LZ4HC, "nthreads": 3, "blocksize": 2**14}, 10),
+        ({"typesize": 4}, {"filters": [blosc2.Filter.BITSHUFFLE], "filters_meta": [0]}, 1),
+    ],
+)
+def test_schunk_copy(contiguous, urlpath, contiguous2, urlpath2, cparams, cparams2, nchunks):
+    storage = {"contiguous": contiguous, "urlpath": urlpath, "cparams": cparams}
+    blosc2.remove_urlpath(urlpath)
+    blosc2.remove_urlpath(urlpath2)
+
+    # The last chunk is smaller
+    data = numpy.arange(200 * 1000 * nchunks + 1000 * (nchunks > 0), dtype="int32")
+    schunk = blosc2.SChunk(chunksize=200 * 1000 * 4, data=data, **storage)
+    schunk.vlmeta["name"] = "copy"
+
+    schunk2 = schunk.copy(contiguous=contiguous2, urlpath=urlpath2, cparams=cparams2)
+    assert schunk2.get_slice() == data.tobytes()
+    assert schunk2.vlmeta["name"] == "copy"
+    for i in range(nchunks):
+        if cparams2 is None:
+            assert schunk2.get_chunk(i) == schunk.get_chunk(i)
+        assert schunk2.decompress_chunk(i) == schunk.decompress_chunk(i)
+
+    if urlpath2 is not None:
+        schunk3 = blosc2.open(urlpath2)
+        assert schunk3.get_slice() == data.tobytes()
+        assert schunk3.vlmeta["name"] == "copy"
+
+    # The copy is independent of the original
+    assert schunk2.append_data(numpy.arange(200 * 1000, dtype="int32")) == schunk.append_data(
+        numpy.arange(200 * 1000, dtype="int32")
+    )
+
+    blosc2.remove_urlpath(urlpath)
+    blosc2.remove_urlpath(urlpath2)
+
+
+def test_schunk_copy_same_urlpath():
+    urlpath = "b2frame"
+    blosc2.remove_urlpath(urlpath)
+    schunk = blosc2.SChunk(chunksize=1000, data=b"a" * 10_000, urlpath=urlpath)
+    with pytest.raises(ValueError):
+        schunk.copy(urlpath=urlpath)
+    assert blosc2.open(urlpath).get_slice() == b"a" * 10_000
+    blosc2.remove_urlpath(urlpath)
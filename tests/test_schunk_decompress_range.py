@@ -0,0 +1,79 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize("nthreads", [None, 1, 4])
+@pytest.mark.parametrize(
+    "start, stop",
+    [(0, None), (2, 5), (-1, None), (3, 4), (4, 2), (0, 100)],
+)
+def test_schunk_decompress_range(contiguous, urlpath, nthreads, start, stop):
+    storage = {
+        "contiguous": contiguous,
+        "urlpath": urlpath,
+        "cparams": {"typesize": 4},
+        "dparams": {"nthreads": 2},
+    }
+    blosc2.remove_urlpath(urlpath)
+    chunk_nitems = 50 * 1000
+    # The last chunk is not full
+    data = numpy.arange(chunk_nitems * 6 + 123, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=chunk_nitems * 4, data=data, mode="w", **storage)
+    start_, stop_, _ = slice(start, stop).indices(7)
+    expected = data[start_ * chunk_nitems:max(start_, stop_) * chunk_nitems]
+
+    res = schunk.decompress_range(start, stop, nthreads=nthreads)
+    assert res == expected.tobytes()
+    dst = numpy.full(len(expected) + 10, -1, dtype="int32")
+    assert schunk.decompress_range(start, stop, dst, nthreads=nthreads) is None
+    assert numpy.array_equal(dst[:len(expected)], expected)
+    assert numpy.all(dst[len(expected):] == -1)
+    blosc2.remove_urlpath(urlpath)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_schunk_decompress_range_postfilter(parallel):
+    chunk_nitems = 10 * 1000
+    data = numpy.zeros(chunk_nitems * 8, dtype="int64")
+    schunk = blosc2.SChunk(chunksize=chunk_nitems * 8, data=data, cparams={"typesize": 8})
+
+    @schunk.postfilter(numpy.int64, parallel=parallel)
+    def plus_nchunk(input, output, nchunk, nblock, tid):
+        output[:] = input + nchunk
+
+    # Every chunk gets its own nchunk, also when decompressed concurrently
+    res = numpy.frombuffer(schunk.decompress_range(nthreads=4), dtype="int64")
+    assert numpy.array_equal(res, numpy.repeat(numpy.arange(8), chunk_nitems))
+
+    @schunk.postfilter(numpy.int64)
+    def fail(input, output, nchunk, nblock, tid):
+        if nchunk == 5:
+            raise KeyError("postfilter")
+        output[:] = input
+
+    with pytest.raises(KeyError):
+        schunk.decompress_range(nthreads=4)
+
+
+def test_schunk_decompress_range_errors():
+    data = numpy.arange(10 * 1000, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=1000 * 4, data=data, cparams={"typesize": 4})
+    with pytest.raises(ValueError):
+        schunk.decompress_range(0, 2, numpy.empty(1999, dtype="int32"))
+    with pytest.raises(ValueError):
+        schunk.decompress_range(nthreads=0)
+
+    # The chunks in the middle must be full
+    schunk.insert_data(1, data[:10], copy=True)
+    with pytest.raises(RuntimeError):
+        schunk.decompress_range(0, 3, nthreads=4)
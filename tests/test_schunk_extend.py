@@ -0,0 +1,72 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize("nthreads, max_pending", [(None, None), (1, None), (4, 1), (4, 3)])
+@pytest.mark.parametrize("nitems", [200 * 1000, 1000 * 1000 + 1, 0])
+def test_schunk_extend(contiguous, urlpath, nthreads, max_pending, nitems):
+    storage = {
+        "contiguous": contiguous,
+        "urlpath": urlpath,
+        "cparams": {"typesize": 8, "nthreads": 2, "codec": blosc2.Codec.ZSTD, "clevel": 3},
+    }
+    blosc2.remove_urlpath(urlpath)
+    schunk = blosc2.SChunk(chunksize=200 * 1000 * 8, mode="w", **storage)
+    data = numpy.arange(nitems, dtype="int64")
+    nchunks = -(-nitems // (200 * 1000))
+    assert schunk.extend(data, nthreads=nthreads, max_pending=max_pending) == nchunks
+    assert schunk.get_slice() == data.tobytes()
+    for i in range(nchunks):
+        chunk = data[i * 200 * 1000:(i + 1) * 200 * 1000]
+        assert schunk.decompress_chunk(i) == chunk.tobytes()
+
+    if urlpath is not None:
+        schunk = blosc2.open(urlpath, mode="r")
+        assert schunk.get_slice() == data.tobytes()
+        with pytest.raises(ValueError):
+            schunk.extend(data)
+    blosc2.remove_urlpath(urlpath)
+
+
+@pytest.mark.parametrize("nthreads", [1, 4])
+def test_schunk_constructor_parallel(nthreads):
+    data = numpy.linspace(0, 1, 3 * 1000 * 1000)
+    cparams = {"typesize": 8, "nthreads": nthreads}
+    schunk = blosc2.SChunk(chunksize=100 * 1000 * 8, data=data, cparams=cparams)
+    assert schunk.get_slice() == data.tobytes()
+    # More data can be appended after full chunks
+    assert schunk.extend(data[:150 * 1000]) == 32
+    assert schunk.get_slice(3 * 1000 * 1000) == data[:150 * 1000].tobytes()
+
+
+def test_schunk_extend_prefilter():
+    schunk = blosc2.SChunk(chunksize=1000 * 4, cparams={"typesize": 4, "nthreads": 4})
+
+    @schunk.prefilter(numpy.int32)
+    def negate(input, output, nchunk, nblock, tid):
+        output[:] = -input
+
+    data = numpy.arange(10 * 1000, dtype="int32")
+    assert schunk.extend(data, nthreads=4) == 10
+    assert numpy.array_equal(numpy.frombuffer(schunk.get_slice(), dtype="int32"), -data)
+
+
+def test_schunk_extend_errors():
+    schunk = blosc2.SChunk(chunksize=1000 * 4, cparams={"typesize": 4})
+    data = numpy.arange(10 * 1000, dtype="int32")
+    with pytest.raises(ValueError):
+        schunk.extend(data, nthreads=0)
+    with pytest.raises(ValueError):
+        schunk.extend(data, nthreads=2, max_pending=0)
+    assert schunk.extend(data[:1500], nthreads=4) == 2
+    assert schunk.extend(b"") == 2
@@ -0,0 +1,234 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize("nthreads, parallel", [(1, False), (4, False), (4, True)])
+@pytest.mark.parametrize("nchunks", [1, 5])
+def test_schunk_prefilter(contiguous, urlpath, nthreads, parallel, nchunks):
+    storage = {
+        "contiguous": contiguous,
+        "urlpath": urlpath,
+        "cparams": {"typesize": 4, "nthreads": nthreads, "blocksize": 2**16},
+    }
+    blosc2.remove_urlpath(urlpath)
+    schunk = blosc2.SChunk(chunksize=200 * 1000 * 4, **storage)
+    calls = []
+
+    @schunk.prefilter(numpy.int32, numpy.float32, parallel=parallel)
+    def half(input, output, nchunk, nblock, tid):
+        calls.append((nchunk, nblock, tid))
+        output[:] = input / 2
+
+    data = numpy.arange(200 * 1000 * nchunks, dtype="int32")
+    for i in range(nchunks):
+        assert schunk.append_data(data[i * 200 * 1000:(i + 1) * 200 * 1000]) == i + 1
+    res = numpy.frombuffer(schunk.get_slice(), dtype="float32")
+    assert numpy.array_equal(res, data / 2)
+
+    nblocks = -(-200 * 1000 * 4 // 2**16)
+    assert sorted((nchunk, nblock) for nchunk, nblock, _ in calls) == [
+        (i, j) for i in range(nchunks) for j in range(nblocks)
+    ]
+    assert all(tid == 0 for _, _, tid in calls) or parallel
+
+    # The prefilter knows the position of the chunks being inserted or updated
+    calls.clear()
+    schunk.update_data(0, data[:200 * 1000], copy=True)
+    schunk.insert_data(nchunks, data[:200 * 1000], copy=False)
+    assert {nchunk for nchunk, _, _ in calls} == {0, nchunks}
+
+    schunk.remove_prefilter()
+    schunk.append_data(data[:200 * 1000])
+    assert schunk.decompress_chunk(nchunks + 1) == data[:200 * 1000].tobytes()
+    blosc2.remove_urlpath(urlpath)
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize("nthreads, parallel", [(1, False), (4, False), (4, True)])
+def test_schunk_postfilter(contiguous, urlpath, nthreads, parallel):
+    storage = {
+        "contiguous": contiguous,
+        "urlpath": urlpath,
+        "cparams": {"typesize": 8, "blocksize": 2**15},
+        "dparams": {"nthreads": nthreads},
+    }
+    blosc2.remove_urlpath(urlpath)
+    nchunks = 4
+    data = numpy.arange(100 * 1000 * nchunks, dtype="int64")
+    schunk = blosc2.SChunk(chunksize=100 * 1000 * 8, data=data, **storage)
+    chunks = [schunk.get_chunk(i) for i in range(nchunks)]
+    calls = []
+
+    @schunk.postfilter("i8", parallel=parallel)
+    def plus_nchunk(input, output, nchunk, nblock, tid):
+        calls.append((nchunk, nblock))
+        output[:] = input + nchunk
+
+    expected = data + numpy.repeat(numpy.arange(nchunks), 100 * 1000)
+    for i in range(nchunks):
+        res = numpy.frombuffer(schunk.decompress_chunk(i), dtype="int64")
+        assert numpy.array_equal(res, expected[i * 100 * 1000:(i + 1) * 100 * 1000])
+    res = numpy.empty(100 * 1000, dtype="int64")
+    schunk.decompress_chunk(2, res)
+    assert numpy.array_equal(res, expected[200 * 1000:300 * 1000])
+
+    # The nchunk is right also when the slice spans several chunks
+    calls.clear()
+    res = numpy.frombuffer(schunk.get_slice(50 * 1000, 350 * 1000), dtype="int64")
+    assert numpy.array_equal(res, expected[50 * 1000:350 * 1000])
+    assert {nchunk for nchunk, _ in calls} == {0, 1, 2, 3}
+    assert numpy.frombuffer(schunk[123_456], dtype="int64")[0] == expected[123_456]
+
+    # The postfilter does not change the stored data
+    assert [schunk.get_chunk(i) for i in range(nchunks)] == chunks
+    schunk2 = schunk.copy(cparams={"codec": blosc2.Codec.ZSTD})
+    assert schunk2.get_slice() == data.tobytes()
+
+    schunk.remove_postfilter()
+    assert schunk.get_slice() == data.tobytes()
+    blosc2.remove_urlpath(urlpath)
+
+
+@pytest.mark.parametrize("nthreads", [1, 4])
+def test_schunk_filters_errors(nthreads):
+    data = numpy.arange(100 * 1000, dtype="int32")
+    schunk = blosc2.SChunk(
+        chunksize=100 * 1000 * 4,
+        data=data,
+        cparams={"typesize": 4, "nthreads": nthreads},
+        dparams={"nthreads": nthreads},
+    )
+
+    with pytest.raises(ValueError):
+        schunk.prefilter(numpy.int32, numpy.int64)
+    with pytest.raises(ValueError):
+        schunk.postfilter(numpy.int8, numpy.int16)
+
+    # Exceptions raised by the filters are propagated
+    @schunk.prefilter(numpy.int32, parallel=True)
+    def prefilter(input, output, nchunk, nblock, tid):
+        raise KeyError("prefilter")
+
+    with pytest.raises(KeyError):
+        schunk.append_data(data)
+    with pytest.raises(KeyError):
+        schunk.update_data(0, data, copy=True)
+    assert schunk.get_slice() == data.tobytes()
+
+    @schunk.postfilter(numpy.int32, parallel=True)
+    def postfilter(input, output, nchunk, nblock, tid):
+        raise ZeroDivisionError("postfilter")
+
+    with pytest.raises(ZeroDivisionError):
+        schunk.decompress_chunk(0)
+    with pytest.raises(ZeroDivisionError):
+        schunk.get_slice()
+
+    # The views cannot outlive the call
+    views = []
+
+    @schunk.postfilter(numpy.int32)
+    def leak(input, output, nchunk, nblock, tid):
+        views.append(output)
+
+    with pytest.raises(BufferError):
+        schunk.decompress_chunk(0)
+
+    # The SChunk works as usual without filters
+    schunk.remove_prefilter()
+    schunk.remove_postfilter()
+    assert schunk.append_data(data) == 2
+    assert schunk.get_slice() == data.tobytes() * 2
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize("nthreads, parallel", [(1, False), (4, True)])
+@pytest.mark.parametrize("nitems", [1, 200 * 1000, 1000 * 1000 + 1])
+def test_schunk_fill_from(contiguous, urlpath, nthreads, parallel, nitems):
+    storage = {
+        "contiguous": contiguous,
+        "urlpath": urlpath,
+        "cparams": {"typesize": 8, "nthreads": nthreads},
+    }
+    blosc2.remove_urlpath(urlpath)
+    schunk = blosc2.SChunk(chunksize=200 * 1000 * 8, **storage)
+
+    def arange(output, offset):
+        output[:] = numpy.arange(offset, offset + len(output))
+
+    nchunks = -(-nitems // (200 * 1000))
+    if nitems < 200 * 1000 and not contiguous and urlpath is None:
+        # Not supported by C-Blosc2
+        with pytest.raises(ValueError):
+            schunk.fill_from(arange, nitems, numpy.float64)
+        return
+    assert schunk.fill_from(arange, nitems, numpy.float64, parallel=parallel) == nchunks
+    res = numpy.frombuffer(schunk.get_slice(), dtype=numpy.float64)
+    assert numpy.array_equal(res, numpy.arange(nitems, dtype=numpy.float64))
+
+    # Items can be appended after a full last chunk
+    if nitems % (200 * 1000) == 0:
+        assert schunk.fill_from(arange, 10, numpy.float64) == nchunks + 1
+        assert numpy.frombuffer(schunk[nitems:], dtype=numpy.float64).tolist() == list(range(10))
+    blosc2.remove_urlpath(urlpath)
+
+
+def test_schunk_fill_from_memory():
+    tracemalloc = pytest.importorskip("tracemalloc")
+    nitems = 5 * 1000 * 1000
+    schunk = blosc2.SChunk(chunksize=100 * 1000 * 8, cparams={"typesize": 8})
+
+    def ones(output, offset):
+        output[:] = 1
+
+    tracemalloc.start()
+    try:
+        schunk.fill_from(ones, nitems, numpy.int64)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Just a chunk (and not the whole array) is allocated
+    assert peak < nitems * 8 // 10
+    assert schunk[nitems - 1] == numpy.int64(1).tobytes()
+
+
+def test_schunk_fill_from_prefilter():
+    schunk = blosc2.SChunk(chunksize=1000 * 4, cparams={"typesize": 4})
+
+    @schunk.prefilter(numpy.int32)
+    def negate(input, output, nchunk, nblock, tid):
+        output[:] = -input
+
+    def fives(output, offset):
+        output[:] = 5
+
+    # The prefilter is not run on the generated items, and it is restored afterwards
+    schunk.fill_from(fives, 1000, numpy.int32)
+    schunk.append_data(numpy.full(1000, 5, dtype=numpy.int32))
+    res = numpy.frombuffer(schunk.get_slice(), dtype=numpy.int32)
+    assert res.tolist() == [5] * 1000 + [-5] * 1000
+
+    def fail(output, offset):
+        raise ValueError("fill")
+
+    with pytest.raises(ValueError):
+        schunk.fill_from(fail, 1000, numpy.int32)
+    schunk.append_data(numpy.full(1000, 5, dtype=numpy.int32))
+    assert schunk[2000] == numpy.int32(-5).tobytes()
+
+    with pytest.raises(ValueError):
+        schunk.fill_from(fives, 0, numpy.int32)
+    with pytest.raises(ValueError):
+        schunk.fill_from(fives, 10, "S3")
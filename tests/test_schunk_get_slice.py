@@ -0,0 +1,124 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import os
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize(
+    "cparams, nchunks, start, stop",
+    [
+        ({"compcode": blosc2.Codec.LZ4, "clevel": 6, "typesize": 4}, 1, 10, 100),
+        ({"typesize": 4}, 3, 199_990, 200_010),
+        ({"splitmode": blosc2.SplitMode.ALWAYS_SPLIT, "nthreads": 5, "typesize": 4}, 5, 0, None),
+        ({"compcode": blosc2.Codec.LZ4HC, "typesize": 4}, 4, -300_000, -10),
+        ({"typesize": 4}, 2, 500, 100),
+    ],
+)
+def test_schunk_get_slice(contiguous, urlpath, cparams, nchunks, start, stop):
+    storage = {"contiguous": contiguous, "urlpath": urlpath, "cparams": cparams}
+    blosc2.remove_urlpath(urlpath)
+
+    data = numpy.arange(200 * 1000 * nchunks, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=200 * 1000 * 4, data=data, **storage)
+
+    res = schunk.get_slice(start, stop)
+    assert res == data[start:stop].tobytes()
+    assert schunk[start:stop] == data[start:stop].tobytes()
+
+    dst = numpy.empty(data[start:stop].shape, dtype="int32")
+    assert schunk.get_slice(start, stop, dst) is None
+    assert numpy.array_equal(dst, data[start:stop])
+
+    if urlpath is not None:
+        schunk = blosc2.open(urlpath)
+        assert schunk.get_slice(start, stop) == data[start:stop].tobytes()
+
+    blosc2.remove_urlpath(urlpath)
+
+
+def test_schunk_getitem():
+    data = numpy.arange(1000, dtype="int64")
+    schunk = blosc2.SChunk(chunksize=300 * 8, data=data, cparams={"typesize": 8})
+
+    assert schunk[0] == data[0].tobytes()
+    assert schunk[599] == data[599].tobytes()
+    assert schunk[-1] == data[-1].tobytes()
+    assert schunk[-1000] == data[-1000].tobytes()
+    with pytest.raises(IndexError):
+        schunk[1000]
+    with pytest.raises(IndexError):
+        schunk[-1001]
+    with pytest.raises(IndexError):
+        schunk[0:10:2]
+    with pytest.raises(ValueError):
+        schunk.get_slice(0, 10, bytearray(10))
+
+
+@pytest.mark.parametrize(
+    "typesize, start, nitems",
+    [
+        (1, 0, 10),
+        (4, 123_456, 1000),
+        (8, 999_990, 10),
+    ],
+)
+def test_getitem(typesize, start, nitems):
+    dtype = numpy.dtype(f"i{typesize}")
+    data = numpy.arange(1000 * 1000, dtype="i8").astype(dtype)
+    c = blosc2.compress(data, typesize=typesize)
+
+    res = blosc2.getitem(c, start, nitems)
+    assert res == data[start : start + nitems].tobytes()
+
+    dst = numpy.empty(nitems, dtype=dtype)
+    assert blosc2.getitem(c, start, nitems, dst) is None
+    assert numpy.array_equal(dst, data[start : start + nitems])
+
+    with pytest.raises(ValueError):
+        blosc2.getitem(c, data.size - 1, 2)
+
+
+def bytes_read():
+    with open("/proc/self/io") as f:
+        for line in f:
+            if line.startswith("rchar"):
+                return int(line.split()[1])
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/io"), reason="needs /proc/self/io")
+@pytest.mark.parametrize("contiguous", [True, False])
+def test_schunk_lazy_read(contiguous):
+    urlpath = "b2frame"
+    blosc2.remove_urlpath(urlpath)
+    cparams = {"typesize": 8, "blocksize": 2**16}
+    data = numpy.random.default_rng(0).integers(0, 1000, 4 * 1000 * 1000)
+    storage = {"urlpath": urlpath, "contiguous": contiguous, "cparams": cparams}
+    schunk = blosc2.SChunk(chunksize=8 * 1000 * 1000, data=data, **storage)
+    schunk = blosc2.open(urlpath)
+
+    r0 = bytes_read()
+    chunk_cbytes = len(schunk.get_chunk(1))
+    assert bytes_read() - r0 >= chunk_cbytes
+
+    # Only the chunk header and offsets, plus the blocks needed, are read
+    r0 = bytes_read()
+    assert schunk[1_500_000:1_500_010] == data[1_500_000:1_500_010].tobytes()
+    assert bytes_read() - r0 < chunk_cbytes // 10
+
+    mask = numpy.ones(8 * 1000 * 1000 // 2**16 + 1, dtype=bool)
+    mask[0] = False
+    r0 = bytes_read()
+    schunk.decompress_chunk(1, block_mask=mask)
+    assert bytes_read() - r0 < chunk_cbytes // 10
+
+    blosc2.remove_urlpath(urlpath)
@@ -0,0 +1,190 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import os
+
+import numpy
+import pytest
+
+import blosc2
+
+
+class CachedIO(blosc2.IOBackend):
+    # Serves the reads of the frames in cache from memory, and counts the calls to the backend
+    def __init__(self):
+        self.cache = blosc2.MemoryIO()
+        self.nopen = 0
+        self.nreads = 0
+        self.nwrites = 0
+
+    def open(self, urlpath, mode):
+        self.nopen += 1
+        if mode == "rb" and urlpath in self.cache.files:
+            return CountingFile(self, self.cache.open(urlpath, mode))
+        self.cache.remove(urlpath)
+        return CountingFile(self, super().open(urlpath, mode))
+
+
+class CountingFile:
+    def __init__(self, backend, file):
+        self.backend = backend
+        self.file = file
+
+    def readinto(self, buffer):
+        self.backend.nreads += 1
+        return self.file.readinto(buffer)
+
+    def write(self, buffer):
+        self.backend.nwrites += 1
+        return self.file.write(buffer)
+
+    def seek(self, offset, whence=0):
+        return self.file.seek(offset, whence)
+
+    def tell(self):
+        return self.file.tell()
+
+    def truncate(self, size=None):
+        return self.file.truncate(size)
+
+    def close(self):
+        self.file.close()
+
+
+@pytest.mark.parametrize("nthreads", [1, 4])
+@pytest.mark.parametrize("nchunks", [1, 5])
+def test_schunk_memory_io(nthreads, nchunks):
+    backend = blosc2.MemoryIO()
+    storage = {
+        "contiguous": True,
+        "urlpath": "memory.b2frame",
+        "cparams": {"typesize": 4, "nthreads": nthreads},
+        "dparams": {"nthreads": nthreads},
+        "io": backend,
+    }
+    data = numpy.arange(200 * 1000 * nchunks, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=200 * 1000 * 4, data=data, mode="w", **storage)
+    # C-Blosc2 still checks that the urlpath does not exist in the local filesystem
+    assert list(backend.files) == ["memory.b2frame"]
+    assert schunk.get_slice() == data.tobytes()
+
+    schunk.vlmeta["info"] = {"nchunks": nchunks}
+    schunk.update_data(0, data[200 * 1000:400 * 1000] if nchunks > 1 else data, copy=True)
+    schunk.insert_data(1, data[:200 * 1000], copy=True)
+    schunk.delete_chunk(0)
+    expected = data[:200 * 1000].tobytes() + data[200 * 1000:].tobytes()
+    assert schunk.get_slice() == expected
+
+    # The frame is all in the backend
+    schunk2 = blosc2.schunk_from_cframe(backend.files["memory.b2frame"], copy=True)
+    assert schunk2.get_slice() == expected
+    assert schunk2.vlmeta["info"] == {"nchunks": nchunks}
+
+    # Copies can go to the backend too
+    schunk3 = schunk.copy(urlpath="memory.b2frame2", io=backend, cparams={"codec": blosc2.Codec.ZSTD})
+    assert sorted(backend.files) == ["memory.b2frame", "memory.b2frame2"]
+    assert schunk3.get_slice() == expected
+
+    # mode="w" overwrites the frames
+    blosc2.SChunk(chunksize=200 * 1000 * 4, data=data[:10], mode="w", **storage)
+    schunk4 = blosc2.schunk_from_cframe(backend.files["memory.b2frame"], copy=True)
+    assert schunk4.get_slice() == data[:10].tobytes()
+
+
+@pytest.mark.parametrize("nthreads", [1, 4])
+def test_schunk_io_open(nthreads):
+    urlpath = "b2frame"
+    blosc2.remove_urlpath(urlpath)
+    backend = CachedIO()
+    storage = {
+        "contiguous": True,
+        "urlpath": urlpath,
+        "cparams": {"typesize": 8, "nthreads": nthreads},
+        "dparams": {"nthreads": nthreads},
+        "io": backend,
+    }
+    data = numpy.arange(500 * 1000, dtype="int64")
+    schunk = blosc2.SChunk(chunksize=100 * 1000 * 8, data=data, **storage)
+    assert backend.nwrites > 0
+    schunk.delete_chunk(4)
+    # The frame has been written in the local filesystem, so it can be opened with the default backend
+    assert blosc2.open(urlpath).get_slice() == data[:400 * 1000].tobytes()
+
+    with open(urlpath, "rb") as f:
+        backend.cache.files[urlpath] = bytearray(f.read())
+    schunk = blosc2.open(urlpath, mode="r", io=backend, dparams={"nthreads": nthreads})
+    assert schunk.get_slice() == data[:400 * 1000].tobytes()
+    assert backend.nreads > 0 and urlpath in backend.cache.files
+    with pytest.raises(ValueError):
+        blosc2.open(urlpath, mode="r", mmap=True, io=backend)
+
+    # The writes go to the local file, and invalidate the cache
+    schunk = blosc2.open(urlpath, io=backend)
+    assert schunk.append_data(data[:100 * 1000]) == 5
+    assert urlpath not in backend.cache.files
+    assert blosc2.open(urlpath).get_slice() == data[:400 * 1000].tobytes() + data[:100 * 1000].tobytes()
+    blosc2.remove_urlpath(urlpath)
+
+
+class ShortFile(CountingFile):
+    # Reads and writes at most 1000 bytes per call, like pipes or sockets
+    def readinto(self, buffer):
+        with memoryview(buffer)[:1000] as view:
+            return super().readinto(view)
+
+    def write(self, buffer):
+        with memoryview(buffer)[:1000] as view:
+            return super().write(view)
+
+
+class ShortIO(CachedIO):
+    def open(self, urlpath, mode):
+        return ShortFile(self, blosc2.IOBackend.open(self, urlpath, mode))
+
+
+def test_schunk_io_short():
+    urlpath = "b2frame"
+    blosc2.remove_urlpath(urlpath)
+    backend = ShortIO()
+    data = numpy.random.default_rng(0).integers(0, 1000, 100 * 1000)
+    schunk = blosc2.SChunk(chunksize=10 * 1000 * 8, data=data, contiguous=True, urlpath=urlpath,
+                           cparams={"typesize": 8}, io=backend, mode="w")
+    schunk.vlmeta["info"] = "short writes"
+    assert blosc2.open(urlpath).get_slice() == data.tobytes()
+    schunk = blosc2.open(urlpath, mode="r", io=backend)
+    assert schunk.get_slice() == data.tobytes()
+    assert schunk.vlmeta["info"] == "short writes"
+    # Every chunk needs several calls
+    assert backend.nwrites > os.path.getsize(urlpath) // 1000 > 10 * schunk.nchunks
+    assert backend.nreads > os.path.getsize(urlpath) // 1000
+    blosc2.remove_urlpath(urlpath)
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+def test_schunk_io_errors():
+    urlpath = "b2frame"
+    blosc2.remove_urlpath(urlpath)
+    # Only contiguous frames with an urlpath are supported
+    with pytest.raises(ValueError):
+        blosc2.SChunk(contiguous=True, io=blosc2.MemoryIO())
+    with pytest.raises(ValueError):
+        blosc2.SChunk(contiguous=False, urlpath=urlpath, io=blosc2.MemoryIO())
+
+    class FailingIO(blosc2.IOBackend):
+        def open(self, urlpath, mode):
+            if "+" in mode:
+                raise OSError("Read-only backend")
+            return super().open(urlpath, mode)
+
+    data = numpy.arange(100 * 1000, dtype="int32")
+    blosc2.SChunk(chunksize=100 * 1000 * 4, data=data, contiguous=True, urlpath=urlpath)
+    # The exceptions of the backend are reported as unraisable, and the operation fails
+    schunk = blosc2.open(urlpath, io=FailingIO())
+    assert schunk.get_slice() == data.tobytes()
+    with pytest.raises(RuntimeError):
+        schunk.append_data(data)
+    assert blosc2.open(urlpath).get_slice() == data.tobytes()
+    blosc2.remove_urlpath(urlpath)
@@ -0,0 +1,80 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+@pytest.mark.parametrize("reuse_buffer", [True, False])
+@pytest.mark.parametrize("nitems", [1000 * 1000, 1000 * 1000 + 123, 0])
+def test_schunk_iterchunks(contiguous, urlpath, prefetch, reuse_buffer, nitems):
+    storage = {
+        "contiguous": contiguous,
+        "urlpath": urlpath,
+        "cparams": {"typesize": 4},
+        "dparams": {"nthreads": 2},
+    }
+    blosc2.remove_urlpath(urlpath)
+    chunk_nitems = 100 * 1000
+    data = numpy.arange(nitems, dtype="float32")
+    schunk = blosc2.SChunk(chunksize=chunk_nitems * 4, data=data, mode="w", **storage)
+    assert schunk.nchunks == -(-nitems // chunk_nitems)
+
+    chunks = list(schunk.iterchunks(numpy.float32, prefetch=prefetch, reuse_buffer=reuse_buffer))
+    assert len(chunks) == schunk.nchunks
+    buffers = {id(chunk.base.obj) for chunk in chunks}
+    if reuse_buffer:
+        assert len(buffers) <= prefetch + 1
+    else:
+        assert len(buffers) == len(chunks)
+        if nitems > 0:
+            assert numpy.array_equal(numpy.concatenate(chunks), data)
+
+    # The chunks are right while they are being processed
+    it = schunk.iterchunks(numpy.float32, prefetch=prefetch, reuse_buffer=reuse_buffer)
+    for i, chunk in enumerate(it):
+        assert chunk.dtype == numpy.float32
+        assert numpy.array_equal(chunk, data[i * chunk_nitems:(i + 1) * chunk_nitems])
+    for i, chunk in enumerate(schunk.iterchunks(prefetch=prefetch)):
+        assert isinstance(chunk, memoryview)
+        assert chunk == data[i * chunk_nitems:(i + 1) * chunk_nitems].tobytes()
+    blosc2.remove_urlpath(urlpath)
+
+
+def test_schunk_iterchunks_postfilter():
+    chunk_nitems = 10 * 1000
+    data = numpy.zeros(chunk_nitems * 8, dtype="int64")
+    schunk = blosc2.SChunk(chunksize=chunk_nitems * 8, data=data, cparams={"typesize": 8})
+
+    @schunk.postfilter(numpy.int64)
+    def plus_nchunk(input, output, nchunk, nblock, tid):
+        if nchunk == 6:
+            raise KeyError("postfilter")
+        output[:] = input + nchunk
+
+    it = schunk.iterchunks(numpy.int64, prefetch=3)
+    for i in range(6):
+        assert numpy.all(next(it) == i)
+    with pytest.raises(KeyError):
+        next(it)
+
+
+def test_schunk_iterchunks_break():
+    data = numpy.arange(1000 * 1000, dtype="int64")
+    schunk = blosc2.SChunk(chunksize=10 * 1000 * 8, data=data, cparams={"typesize": 8})
+    for i, chunk in enumerate(schunk.iterchunks(numpy.int64, prefetch=4)):
+        if i == 10:
+            break
+    # The iteration can be started again
+    assert sum(len(chunk) for chunk in schunk.iterchunks(prefetch=4)) == data.nbytes
+
+    with pytest.raises(ValueError):
+        schunk.iterchunks(prefetch=-1)
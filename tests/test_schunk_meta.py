@@ -0,0 +1,88 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import struct
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+def test_schunk_meta(contiguous, urlpath):
+    storage = {"contiguous": contiguous, "urlpath": urlpath, "cparams": {"typesize": 4}}
+    blosc2.remove_urlpath(urlpath)
+    data = numpy.arange(200 * 1000, dtype="int32")
+    metalayers = {"shape": [200, 1000], "dtype": "<i4"}
+    schunk = blosc2.SChunk(chunksize=100 * 1000 * 4, data=data, meta=metalayers, **storage)
+    assert len(schunk.meta) == 2
+    assert list(schunk.meta) == ["shape", "dtype"]
+    assert "shape" in schunk.meta and "missing" not in schunk.meta
+    assert dict(schunk.meta) == metalayers
+    with pytest.raises(KeyError):
+        schunk.meta["missing"]
+
+    # The contents can be updated in place, as long as the size does not change
+    schunk.meta["shape"] = [250, 1000]
+    assert schunk.meta["shape"] == [250, 1000]
+    with pytest.raises(ValueError):
+        schunk.meta["shape"] = [100, 200, 10]
+    if urlpath is not None:
+        schunk2 = blosc2.open(urlpath)
+        assert schunk2.meta["shape"] == [250, 1000]
+        assert schunk2.get_slice() == data.tobytes()
+    schunk2 = blosc2.schunk_from_cframe(schunk.to_cframe(), copy=True)
+    assert dict(schunk2.meta) == {"shape": [250, 1000], "dtype": "<i4"}
+
+    # No new metalayers once the frame has data
+    if contiguous or urlpath is not None:
+        with pytest.raises(ValueError):
+            schunk.meta["new"] = 1
+    else:
+        schunk.meta["new"] = 1
+        assert schunk.meta["new"] == 1
+    blosc2.remove_urlpath(urlpath)
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+def test_schunk_meta_typed(contiguous, urlpath):
+    blosc2.remove_urlpath(urlpath)
+    schunk = blosc2.SChunk(chunksize=1000 * 8, contiguous=contiguous, urlpath=urlpath)
+    schunk.meta.set_raw("nitems", numpy.zeros(10, dtype=numpy.int64))
+    schunk.meta.set_raw("header", struct.pack("<id", 3, 1.5))
+    for i in range(10):
+        schunk.append_data(numpy.arange(1000, dtype=numpy.int64))
+        nitems = schunk.meta.get_typed("nitems", numpy.int64).copy()
+        nitems[i] = 1000 - i
+        schunk.meta.set_raw("nitems", nitems)
+
+    assert schunk.meta.get_raw("header") == struct.pack("<id", 3, 1.5)
+    assert schunk.meta.get_typed("header", struct.Struct("<id")) == (3, 1.5)
+    expected = numpy.arange(1000, 990, -1)
+    assert numpy.array_equal(schunk.meta.get_typed("nitems", numpy.int64), expected)
+    if urlpath is not None:
+        schunk2 = blosc2.open(urlpath)
+        assert numpy.array_equal(schunk2.meta.get_typed("nitems", "<i8"), expected)
+        schunk2 = blosc2.open(urlpath, mode="r")
+        with pytest.raises(ValueError):
+            schunk2.meta.set_raw("nitems", expected)
+    with pytest.raises(ValueError):
+        schunk.meta.set_raw("nitems", expected[:5])
+    with pytest.raises(KeyError):
+        schunk.meta.get_typed("missing", numpy.int64)
+    blosc2.remove_urlpath(urlpath)
+
+
+def test_schunk_meta_errors():
+    with pytest.raises(ValueError):
+        blosc2.SChunk(meta={"x" * 32: 1})
+    with pytest.raises(ValueError):
+        blosc2.SChunk(meta={"meta%d" % i: i for i in range(17)})
+    schunk = blosc2.SChunk(meta={"meta%d" % i: i for i in range(16)})
+    assert [schunk.meta["meta%d" % i] for i in range(16)] == list(range(16))
@@ -0,0 +1,68 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+import pytest
+
+import blosc2
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize("protocol", [2, 4, 5])
+@pytest.mark.parametrize("nchunks", [0, 1, 5])
+def test_schunk_pickle(contiguous, urlpath, protocol, nchunks):
+    storage = {"contiguous": contiguous, "urlpath": urlpath, "cparams": {"typesize": 4}}
+    blosc2.remove_urlpath(urlpath)
+
+    data = numpy.arange(200 * 1000 * nchunks, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=200 * 1000 * 4, data=data, **storage)
+    schunk.vlmeta["name"] = "pickle"
+
+    schunk2 = pickle.loads(pickle.dumps(schunk, protocol=protocol))
+    assert isinstance(schunk2, blosc2.SChunk)
+    for i in range(nchunks):
+        assert schunk2.decompress_chunk(i) == schunk.decompress_chunk(i)
+    assert schunk2.vlmeta["name"] == "pickle"
+
+    # The unpickled SChunk is independent of the original one
+    chunk = numpy.arange(200 * 1000, dtype="int32")
+    assert schunk2.append_data(chunk) == nchunks + 1
+    assert schunk.append_data(chunk) == nchunks + 1
+
+    blosc2.remove_urlpath(urlpath)
+
+
+def test_schunk_pickle_out_of_band():
+    data = numpy.arange(200 * 1000 * 3, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=200 * 1000 * 4, data=data, contiguous=True)
+
+    buffers = []
+    pickled = pickle.dumps(schunk, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1
+    # Just the cframe travels out-of-band
+    assert len(pickled) < 200
+    assert buffers[0].raw().nbytes == len(schunk.to_cframe(copy=True))
+
+    schunk2 = pickle.loads(pickled, buffers=buffers)
+    for i in range(3):
+        assert schunk2.decompress_chunk(i) == schunk.decompress_chunk(i)
+
+
+def decompress_chunk(schunk, nchunk):
+    return schunk.decompress_chunk(nchunk)
+
+
+def test_schunk_processes():
+    data = numpy.arange(200 * 1000 * 4, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=200 * 1000 * 4, data=data, cparams={"typesize": 4})
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        chunks = list(executor.map(decompress_chunk, [schunk] * 4, range(4)))
+    assert b"".join(chunks) == data.tobytes()
@@ -0,0 +1,160 @@
+########################################################################
+#
+#       Author:  The Blosc development team - blosc@blosc.org
+#
+########################################################################
+
+import numpy
+import pytest
+
+import blosc2
+
+
+class AlternatingTuner(blosc2.Tuner):
+    # Switches between LZ4 and ZSTD on every chunk
+    def next_cparams(self, src, typesize):
+        codec = [blosc2.Codec.LZ4, blosc2.Codec.ZSTD][self._nchunks % 2]
+        self._nchunks += 1
+        return {
+            "codec": codec,
+            "clevel": 5,
+            "filters": [blosc2.Filter.NOFILTER] * 5 + [blosc2.Filter.SHUFFLE],
+            "filters_meta": [0] * 6,
+        }
+
+
+@pytest.mark.parametrize("mode", [blosc2.TuneMode.SPEED, blosc2.TuneMode.BALANCED, blosc2.TuneMode.RATIO])
+@pytest.mark.parametrize("nitems", [1000, 100 * 1000, 0])
+def test_compress2_tuner(mode, nitems):
+    data = numpy.linspace(0, 100, nitems)
+    tuner = blosc2.Tuner(mode)
+    for _ in range(3):
+        c = blosc2.compress2(data, typesize=8, tuner=tuner)
+        assert blosc2.decompress2(c) == data.tobytes()
+    assert len(tuner.history) == 3
+    assert tuner.history[-1]["cbytes"] == len(c)
+    assert tuner.history[-1]["nbytes"] == data.nbytes
+    assert tuner.history[-1]["codec"] in [blosc2.Codec.BLOSCLZ, blosc2.Codec.LZ4, blosc2.Codec.ZSTD]
+    assert tuner.history[-1]["clevel"] in [1, 5, 9]
+    # A mode is enough too
+    assert blosc2.decompress2(blosc2.compress2(data, typesize=8, tuner=mode)) == data.tobytes()
+
+
+@pytest.mark.parametrize("typesize", [1, 4, 8])
+def test_tuner_ratio(typesize):
+    # The whole data fits in the sample, so the smallest candidate is chosen
+    data = numpy.arange(10 * 1000, dtype="int32").tobytes()
+    codecs = [blosc2.Codec.BLOSCLZ, blosc2.Codec.LZ4, blosc2.Codec.ZSTD]
+    filters = [blosc2.Filter.NOFILTER, blosc2.Filter.SHUFFLE, blosc2.Filter.BITSHUFFLE]
+    tuner = blosc2.Tuner(blosc2.TuneMode.RATIO, codecs=codecs, clevels=[1, 9], filters=filters)
+    c = blosc2.compress2(data, typesize=typesize, tuner=tuner)
+    sizes = [
+        len(blosc2.compress2(data, typesize=typesize, codec=codec, clevel=clevel, filters=[filter_]))
+        for codec in codecs for clevel in [1, 9] for filter_ in filters
+    ]
+    assert len(c) == min(sizes)
+
+
+def test_tuner_retune_every(monkeypatch):
+    tuner = blosc2.Tuner(retune_every=3)
+    tries = []
+    try_candidates = tuner._try_candidates
+    monkeypatch.setattr(tuner, "_try_candidates", lambda *args: tries.append(1) or try_candidates(*args))
+    data = numpy.arange(1000, dtype="int64")
+    for _ in range(7):
+        tuner.next_cparams(data, 8)
+    assert len(tries) == 3
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+@pytest.mark.parametrize("nthreads", [1, 4])
+def test_schunk_tuner(contiguous, urlpath, nthreads):
+    blosc2.remove_urlpath(urlpath)
+    chunk_nitems = 10 * 1000
+    data = numpy.arange(chunk_nitems * 5, dtype="int32")
+    cparams = {"typesize": 4, "nthreads": nthreads, "tuner": AlternatingTuner()}
+    schunk = blosc2.SChunk(chunksize=chunk_nitems * 4, data=data, contiguous=contiguous, urlpath=urlpath,
+                           cparams=cparams, mode="w")
+    assert "tuner" in cparams
+    schunk.append_data(data[:chunk_nitems])
+    schunk.insert_data(0, data[:chunk_nitems], copy=True)
+    schunk.update_data(1, data[:chunk_nitems], copy=True)
+    history = schunk.tuner.history
+    assert [cparams["nchunk"] for cparams in history] == [0, 1, 2, 3, 4, 5, 0, 1]
+
+    if urlpath is not None:
+        schunk = blosc2.open(urlpath)
+    info = schunk.chunk_info()
+    lz4, zstd = blosc2.Codec.LZ4.value, blosc2.Codec.ZSTD.value
+    # The chunks inserted and updated are the 7th and 8th ones compressed
+    assert info["codec"].tolist() == [lz4, zstd] + [zstd, lz4] * 2 + [zstd]
+    out = numpy.empty(chunk_nitems, dtype="int32")
+    for nchunk in range(schunk.nchunks):
+        schunk.decompress_chunk(nchunk, out)
+        expected = data[:chunk_nitems] if nchunk in (0, 1, 6) else data[(nchunk - 1) * chunk_nitems:]
+        assert numpy.array_equal(out, expected[:chunk_nitems])
+
+    copy = schunk.copy(cparams={"clevel": 9, "tuner": AlternatingTuner()})
+    assert copy.chunk_info()["codec"].tolist() == [lz4, zstd] * 3 + [lz4]
+    assert copy.get_slice() == schunk.get_slice()
+    blosc2.remove_urlpath(urlpath)
+
+
+def test_schunk_tuner_prefilter():
+    chunk_nitems = 1000
+    tuner = AlternatingTuner()
+    schunk = blosc2.SChunk(chunksize=chunk_nitems * 8, cparams={"typesize": 8, "tuner": tuner})
+    data = numpy.arange(chunk_nitems * 3, dtype="int64")
+    schunk.append_data(data[:chunk_nitems])
+
+    @schunk.prefilter(numpy.int64)
+    def double(input, output, nchunk, nblock, tid):
+        output[:] = input * 2
+
+    # The data of a prefilter is not the one compressed, so the last choice is kept
+    schunk.extend(data)
+    assert schunk.chunk_info()["codec"].tolist() == [blosc2.Codec.LZ4.value] * 4
+    assert [cparams["nchunk"] for cparams in tuner.history] == [0]
+    assert tuner._nchunks == 1
+    out = numpy.frombuffer(schunk.get_slice(), dtype="int64")
+    assert numpy.array_equal(out[chunk_nitems:], data * 2)
+
+
+    # Neither is the tuner asked about the uninitialized buffers of fill_from()
+    tuner = AlternatingTuner()
+    schunk = blosc2.SChunk(chunksize=chunk_nitems * 8, cparams={"typesize": 8, "tuner": tuner})
+
+    def fill(output, offset):
+        output[:] = numpy.arange(offset, offset + len(output))
+
+    schunk.fill_from(fill, chunk_nitems * 3, numpy.int64)
+    assert tuner._nchunks == 0
+    assert numpy.array_equal(numpy.frombuffer(schunk.get_slice(), dtype="int64"), data)
+
+
+@pytest.mark.parametrize("history_size", [0, 2, None])
+def test_tuner_history_size(history_size):
+    tuner = AlternatingTuner(history_size=history_size)
+    schunk = blosc2.SChunk(chunksize=1000 * 8, cparams={"typesize": 8, "tuner": tuner})
+    schunk.extend(numpy.arange(1000 * 5, dtype="int64"))
+    nchunks = [cparams["nchunk"] for cparams in tuner.history]
+    assert nchunks == {0: [], 2: [3, 4], None: [0, 1, 2, 3, 4]}[history_size]
+
+
+def test_tuner_errors():
+    data = numpy.arange(1000, dtype="int64")
+    with pytest.raises(TypeError):
+        blosc2.compress2(data, typesize=8, tuner="ratio")
+    with pytest.raises(TypeError):
+        blosc2.SChunk(cparams={"tuner": 1})
+    with pytest.raises(ValueError):
+        blosc2.Tuner(codecs=[])
+    with pytest.raises(ValueError):
+        blosc2.Tuner(clevels=[10])
+    with pytest.raises(ValueError):
+        blosc2.Tuner(retune_every=0)
+    with pytest.raises(ValueError):
+        blosc2.Tuner(sample_size=0)
+    with pytest.raises(ValueError):
+        blosc2.Tuner(history_size=-1)
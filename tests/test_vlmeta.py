@@ -102,3 +102,68 @@ def clear(schunk):
 
     schunk.vlmeta.clear()
     assert schunk.vlmeta.__len__() == 0
+
+
+class CountingIO(blosc2.IOBackend):
+    def __init__(self):
+        self.nopen = 0
+
+    def open(self, urlpath, mode):
+        self.nopen += 1
+        return super().open(urlpath, mode)
+
+
+@pytest.mark.parametrize("contiguous", [True, False])
+@pytest.mark.parametrize("urlpath", [None, "b2frame"])
+def test_vlmeta_update(contiguous, urlpath):
+    blosc2.remove_urlpath(urlpath)
+    data = numpy.arange(100 * 1000, dtype="int32")
+    schunk = blosc2.SChunk(chunksize=50 * 1000 * 4, data=data, contiguous=contiguous, urlpath=urlpath)
+    values = {"vlmeta%d" % i: [i, "val%d" % i] for i in range(10)}
+    schunk.vlmeta["vlmeta0"] = 0
+    schunk.vlmeta.update(values, extra=b"extra")
+    assert len(schunk.vlmeta) == 11
+    assert schunk.vlmeta.getall() == dict(values, extra=b"extra")
+    if urlpath is not None:
+        assert blosc2.open(urlpath).vlmeta.getall() == dict(values, extra=b"extra")
+    schunk2 = blosc2.schunk_from_cframe(schunk.to_cframe(), copy=True)
+    assert schunk2.vlmeta.getall() == dict(values, extra=b"extra")
+    assert schunk.get_slice() == data.tobytes()
+
+    # The cached contents are not shared with the caller, and writes invalidate them
+    schunk.vlmeta["vlmeta1"].append("changed")
+    assert schunk.vlmeta["vlmeta1"] == [1, "val1"]
+    schunk.vlmeta["vlmeta1"] = "new"
+    assert schunk.vlmeta["vlmeta1"] == "new"
+    schunk.vlmeta.update({b"vlmeta1": "newer"})
+    assert schunk.vlmeta["vlmeta1"] == "newer"
+    del schunk.vlmeta["vlmeta1"]
+    with pytest.raises(KeyError):
+        schunk.vlmeta["vlmeta1"]
+    with pytest.raises(ValueError):
+        schunk.vlmeta.update({"x" * 32: 1})
+    assert "x" * 32 not in schunk.vlmeta
+    blosc2.remove_urlpath(urlpath)
+
+
+def test_vlmeta_update_writes():
+    urlpath = "b2frame"
+    blosc2.remove_urlpath(urlpath)
+    backend = CountingIO()
+    schunk = blosc2.SChunk(chunksize=1000, data=b"x" * 1000, contiguous=True, urlpath=urlpath, io=backend)
+    values = {"vlmeta%d" % i: i for i in range(16)}
+
+    nopen = backend.nopen
+    for name, content in values.items():
+        schunk.vlmeta[name] = content
+    nopen_setitem = backend.nopen - nopen
+    nopen = backend.nopen
+    schunk.vlmeta.update(values)
+    # The frame is written just once
+    assert backend.nopen - nopen == nopen_setitem // len(values)
+    assert blosc2.open(urlpath).vlmeta.getall() == values
+    # Frames have room for 16 vlmetalayers only
+    with pytest.raises(ValueError):
+        schunk.vlmeta["vlmeta16"] = 16
+    assert len(schunk.vlmeta) == 16
+    blosc2.remove_urlpath(urlpath)